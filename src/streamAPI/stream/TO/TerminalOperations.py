@@ -22,14 +22,44 @@ email: shivkj001@gmail.com
 # 12) Averaging: finds average of elements of stream.
 # 13) Reduce: Reduces stream elements using Binary function "bi_func". (output will be of type "Optional")
 # 14) GroupingBy: groups stream elements into bucket (keys in dictionary are referred as buckets.).
+# 15) Aggregating: collects stream elements using several collectors at once.
+# 16) ToBitmapSet: Collects integer stream elements into a compressed "Bitmap".
+# 17) TopK: Finds "k" largest (or smallest) elements using a bounded heap.
+# 18) BottomK: Finds "k" smallest elements.
+# 19) SummaryStatistics: finds count, sum, mean, min, max and variance in a single pass.
+# 20) Histogram: counts elements falling in each bin.
+# 21) AutoHistogram: Histogram whose bins are chosen automatically.
+# 22) ApproxDistinctCount: estimates number of distinct elements using HyperLogLog.
+# 23) Quantiles: estimates quantiles using KLL sketch.
+# 24) HeavyHitters: finds most frequent elements in bounded memory.
+# 25) ReservoirSample: uniformly samples "k" elements.
+# 26) WeightedReservoirSample: samples "k" elements with probability proportional to their weights.
+# 27) ToArray: Collects numeric stream elements into an "array.array".
+# 28) ToNumpy: Collects numeric stream elements into a numpy array.
+# 29) ToIndex: Creates an immutable multi valued hash index.
+# 30) ToSortedIndex: Creates an immutable sorted index supporting range lookups.
+# 31) ToCompositeIndex: Creates an immutable sorted index on several keys.
 
 from abc import ABC, abstractmethod
-from collections import defaultdict, deque
-from typing import Any, DefaultDict, Union
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict, deque
+from functools import partial, reduce
+from heapq import heapify, heappush, heapreplace
+from itertools import chain
+from math import ceil, expm1, floor, frexp, fsum, isinf, isnan, ldexp, log, log10, sqrt
+from random import Random
+from typing import (Any, Callable, DefaultDict, Dict, Iterable, List, NamedTuple, Sequence,
+                    Tuple, Union)
 
 from streamAPI.stream.optional import Optional, create_optional
 from streamAPI.utility.Types import BiFunction, Function, X
-from streamAPI.utility.utils import NIL, default_comp, get_functions_clazz, identity
+from streamAPI.utility.index import CompositeIndex, HashIndex, SortedIndex
+from streamAPI.utility.intset import Bitmap
+from streamAPI.utility.sketch import FrequentItem, FrequentItems, HyperLogLog, KLLSketch
+from streamAPI.utility.spill import PartitionedSpill, SpillFile
+from streamAPI.utility.utils import (NIL, as_random, default_comp, divide_in_chunk, get_functions_clazz,
+                                     identity, optional_import)
 
 
 class Collector(ABC):
@@ -44,6 +74,18 @@ class Collector(ABC):
         :return:
         """
 
+    def supply_partial(self) -> 'Collector':
+        """
+        supplies a new Collector which holds a partial result, i.e. result of
+        some of the elements, to be merged using "combine". By default, it is
+        same as "supply". Collectors whose initial state must be accounted only
+        once (like Reduce having initial point) override it.
+
+        :return:
+        """
+
+        return self.supply()
+
     @abstractmethod
     def consume(self, e):
         """
@@ -51,6 +93,50 @@ class Collector(ABC):
         :param e:
         """
 
+    def consume_many(self, es: Iterable):
+        """
+        Defines how to process a chunk of data "es". It must be equivalent
+        to consuming elements of "es" one by one, which is what default
+        implementation does. Subclasses override it with bulk operations
+        to avoid a method call per element.
+
+        Note that "es" can be any iterable, possibly an iterator which can be
+        consumed only once.
+
+        :param es:
+        """
+
+        consume = self.consume
+
+        for e in es:
+            consume(e)
+
+    def combine(self, other: 'Collector') -> 'Collector':
+        """
+        Merges state of "other" into this collector and returns this collector.
+
+        "other" must be supplied by "supply_partial" of same collector and must have
+        consumed elements which come after elements consumed by this collector; so
+        that result is same as if all elements were consumed by this collector.
+
+        It is used to merge partial results made concurrently
+        (see ParallelStream.collect_concurrent). All collectors of this module
+        support it, except those holding buckets in files ("max_buckets");
+        a custom collector supports it by overriding this method.
+
+        :param other:
+        :return: self
+        """
+
+        raise ValueError(f'{self.__class__.__name__} does not support combine.')
+
+    def combinable(self) -> bool:
+        """
+        :return: True if this collector (and collectors it is made of) supports "combine".
+        """
+
+        return type(self).combine is not Collector.combine
+
     @abstractmethod
     def finish(self):
         """
@@ -78,6 +164,10 @@ class DataHolder(Collector):
     @abstractmethod
     def consume(self, e): pass
 
+    def combine(self, other: 'DataHolder') -> Collector:
+        self.consume_many(other._data_holder)
+        return self
+
     def finish(self):
         return self._data_holder
 
@@ -95,6 +185,9 @@ class ToList(DataHolder):
     def consume(self, e):
         self._data_holder.append(e)
 
+    def consume_many(self, es: Iterable):
+        self._data_holder.extend(es)
+
 
 class ToLinkedList(DataHolder):
     """
@@ -108,6 +201,9 @@ class ToLinkedList(DataHolder):
     def consume(self, e):
         self._data_holder.append(e)
 
+    def consume_many(self, es: Iterable):
+        self._data_holder.extend(es)
+
 
 class ToSet(DataHolder):
     """
@@ -121,6 +217,223 @@ class ToSet(DataHolder):
     def consume(self, e):
         self._data_holder.add(e)
 
+    def consume_many(self, es: Iterable):
+        self._data_holder.update(es)
+
+
+class ToBitmapSet(DataHolder):
+    """
+    Puts integer elements into a compressed 'Bitmap'. It behaves like ToSet
+    but takes much less memory for integer ids and supports fast union,
+    intersection and len.
+
+    Stream([1,4,2,6,1,5,6]).collect(ToBitmapSet()) -> Bitmap holding 1, 2, 4, 5, 6
+    """
+
+    def __init__(self):
+        super().__init__(container_class=Bitmap)
+
+    def consume(self, e: int):
+        self._data_holder.add(e)
+
+    def consume_many(self, es: Iterable[int]):
+        self._data_holder.update(es)
+
+    def combine(self, other: 'ToBitmapSet') -> Collector:
+        self._data_holder |= other._data_holder
+        return self
+
+
+class ToArray(DataHolder):
+    """
+    Puts numeric elements into an 'array.array' of given "typecode"; so
+    elements are held in a contiguous typed buffer (8 bytes per float
+    instead of about 32 bytes per boxed float in a 'list').
+
+    Chunks are appended using "array.extend"; numpy arrays of matching dtype
+    are copied as bytes.
+
+    Stream(range(5)).collect(ToArray('q')) -> array('q', [0, 1, 2, 3, 4])
+    """
+
+    def __init__(self, typecode: str = 'd'):
+        """
+        :param typecode: typecode of 'array.array' like 'd' (float64), 'q' (int64).
+        """
+
+        self._typecode = typecode
+        super().__init__(container_class=partial(array, typecode))
+
+    def supply(self) -> Collector:
+        return self.__class__(self._typecode)
+
+    def consume(self, e):
+        self._data_holder.append(e)
+
+    def consume_many(self, es: Iterable):
+        data = self._data_holder
+
+        if hasattr(es, '__array_interface__'):
+            np = optional_import('numpy')
+
+            if np is not None and isinstance(es, np.ndarray) and es.dtype == np.dtype(data.typecode):
+                data.frombytes(es.tobytes())
+                return
+
+        data.extend(es)
+
+    def combine(self, other: 'ToArray') -> Collector:
+        self._data_holder.extend(other._data_holder)
+        return self
+
+
+# numpy dtype name -> 'array.array' typecode
+_TYPECODES = {'float64': 'd', 'float32': 'f',
+              'int64': 'q', 'int32': 'i', 'int16': 'h', 'int8': 'b',
+              'uint64': 'Q', 'uint32': 'I', 'uint16': 'H', 'uint8': 'B'}
+
+
+class ToNumpy(ToArray):
+    """
+    Puts numeric elements into a numpy array of given "dtype". Elements are
+    collected in an 'array.array' (which grows in amortized chunks) and the
+    numpy array is made at "finish" without copying, using "numpy.frombuffer".
+
+    "finish" hands collected buffer over to the returned numpy array, so the
+    collector is left empty; elements consumed afterwards are collected
+    afresh and do not change previously returned array.
+
+    It requires numpy.
+
+    Stream(range(5)).collect(ToNumpy('int64')) -> array([0, 1, 2, 3, 4])
+    """
+
+    def __init__(self, dtype='float64'):
+        """
+        :param dtype: numeric numpy dtype, like 'float64', 'int32'.
+        """
+
+        np = optional_import('numpy')
+
+        if np is None:
+            raise ImportError('ToNumpy requires numpy.')
+
+        self._dtype = np.dtype(dtype)
+
+        if self._dtype.name not in _TYPECODES:
+            raise ValueError(f'dtype must be one of {tuple(_TYPECODES)}, given: {dtype}')
+
+        super().__init__(_TYPECODES[self._dtype.name])
+
+    def supply(self) -> Collector:
+        return ToNumpy(self._dtype)
+
+    def finish(self):
+        np = optional_import('numpy')
+
+        data = self._data_holder
+
+        if not data:
+            return np.empty(0, dtype=self._dtype)
+
+        # an 'array' can not grow while numpy array views its buffer.
+        self._data_holder = self._cls()
+
+        return np.frombuffer(data, dtype=self._dtype)
+
+
+class ToIndex(Collector):
+    """
+    Creates an immutable HashIndex mapping key(element) to tuple of
+    value(element) of all elements having that key. Unlike ToMap, several
+    elements can have same key.
+
+    index = Stream(orders).collect(ToIndex(itemgetter('user_id')))
+    index[user_id] -> tuple of orders of user
+    """
+
+    def __init__(self, key: Function[X, Any], value: Function[X, Any] = None):
+        """
+        :param key: index key of element.
+        :param value: row stored for element, if None then element itself.
+        """
+
+        super().__init__()
+
+        self._key = key
+        self._value = value
+        self._pairs = []
+
+    def supply(self) -> Collector:
+        return self.__class__(self._key, self._value)
+
+    def consume(self, e):
+        self._pairs.append((self._key(e), e if self._value is None else self._value(e)))
+
+    def consume_many(self, es: Iterable):
+        key, value = self._key, self._value
+
+        if value is None:
+            self._pairs.extend((key(e), e) for e in es)
+        else:
+            self._pairs.extend((key(e), value(e)) for e in es)
+
+    def combine(self, other: 'ToIndex') -> Collector:
+        self._pairs.extend(other._pairs)
+        return self
+
+    def finish(self) -> HashIndex:
+        return HashIndex(self._pairs)
+
+
+class ToSortedIndex(ToIndex):
+    """
+    Creates an immutable SortedIndex, which finds elements having a key or
+    keys in a range using binary search.
+
+    index = Stream(trades).collect(ToSortedIndex(attrgetter('time')))
+    index.range(start_time, end_time) -> trades between start and end time.
+    """
+
+    def finish(self) -> SortedIndex:
+        return SortedIndex(self._pairs)
+
+
+class _CompositeKey:
+    def __init__(self, keys: Tuple[Function, ...]):
+        self._keys = keys
+
+    def __call__(self, e) -> tuple:
+        return tuple(k(e) for k in self._keys)
+
+
+class ToCompositeIndex(ToIndex):
+    """
+    Creates an immutable CompositeIndex on tuple of keys made by "keys",
+    which also finds elements whose leading keys are given.
+
+    index = Stream(cities).collect(ToCompositeIndex([itemgetter('country'), itemgetter('state')]))
+    index.prefix('IN') -> cities of country 'IN'
+    index.get(('IN', 'MH')) -> cities of state 'MH' of country 'IN'
+    """
+
+    def __init__(self, keys: Sequence[Function[X, Any]], value: Function[X, Any] = None):
+        """
+        :param keys: functions making components of index key.
+        :param value: row stored for element, if None then element itself.
+        """
+
+        keys = tuple(keys)
+        super().__init__(_CompositeKey(keys), value)
+
+        self._keys = keys
+
+    def supply(self) -> Collector:
+        return ToCompositeIndex(self._keys, self._value)
+
+    def finish(self) -> CompositeIndex:
+        return CompositeIndex(self._pairs)
+
 
 # ------------------------------------------------------------------
 
@@ -140,9 +453,22 @@ class CollectAndThen(Collector):
     def supply(self) -> Collector:
         return CollectAndThen(self._downstream.supply(), self._then)
 
+    def supply_partial(self) -> Collector:
+        return CollectAndThen(self._downstream.supply_partial(), self._then)
+
     def consume(self, e):
         self._downstream.consume(e)
 
+    def consume_many(self, es: Iterable):
+        self._downstream.consume_many(es)
+
+    def combine(self, other: 'CollectAndThen') -> Collector:
+        self._downstream.combine(other._downstream)
+        return self
+
+    def combinable(self) -> bool:
+        return self._downstream.combinable()
+
     def finish(self):
         return self._then(self._downstream.finish())
 
@@ -167,10 +493,29 @@ class ToMap(Collector):
                                           merger_on_conflict=lambda o,n:o))
     -> {1: 1, 4: 16, 2: 4, 6: 36, 5: 25}
 
+    If "max_buckets" is given, then at most that many keys are held in memory.
+    Elements of further keys are hash partitioned into temporary files
+    (so elements must be picklable) and each partition is processed once
+    keys held in memory have been given out. In this case, "finish" returns
+    an iterator of (key, value) pairs instead of a dictionary and, in case of
+    conflicting keys without "merger_on_conflict", ValueError can be thrown
+    while iterating.
+
+    Stream(range(10 ** 6)).collect(ToMap(lambda x: x, max_buckets=1000))
+    -> iterator of (key, value) pairs
     """
 
     def __init__(self, key_mapper: Function, value_mapper: Function = identity,
-                 merger_on_conflict: BiFunction = None):
+                 merger_on_conflict: BiFunction = None,
+                 *, max_buckets: int = None, partitions: int = 64):
+        """
+        :param key_mapper:
+        :param value_mapper:
+        :param merger_on_conflict:
+        :param max_buckets: maximum number of keys held in memory, None means no limit.
+        :param partitions: number of partition files used when "max_buckets" is crossed.
+        """
+
         super().__init__()
 
         self._key_mapper = key_mapper
@@ -178,9 +523,12 @@ class ToMap(Collector):
         self._merger_on_conflict = merger_on_conflict
 
         self._data_holder = {}
+        self._spill = _BucketSpill(max_buckets, partitions) if max_buckets is not None else None
 
     def supply(self) -> Collector:
-        return ToMap(self._key_mapper, self._value_mapper, self._merger_on_conflict)
+        out = ToMap(self._key_mapper, self._value_mapper, self._merger_on_conflict)
+        out._spill = self._spill.supply() if self._spill is not None else None
+        return out
 
     def consume(self, e):
         """
@@ -213,6 +561,10 @@ class ToMap(Collector):
 
         bkt = self._key_mapper(e)
 
+        if self._spill is not None and not self._spill.holds(bkt):
+            self._spill.append(bkt, e)
+            return
+
         if bkt in self._data_holder:
             if self._merger_on_conflict is None:
                 raise ValueError(f'k : {bkt} is already present.')
@@ -223,9 +575,69 @@ class ToMap(Collector):
         else:
             self._data_holder[bkt] = self._value_mapper(e)
 
-    def finish(self) -> dict:
+    def consume_many(self, es: Iterable):
+        data_holder = self._data_holder
+        key_mapper, value_mapper = self._key_mapper, self._value_mapper
+        merger = self._merger_on_conflict
+        spill = self._spill
+
+        for e in es:
+            bkt = key_mapper(e)
+
+            if spill is not None and not spill.holds(bkt):
+                spill.append(bkt, e)
+                continue
+
+            if bkt in data_holder:
+                if merger is None:
+                    raise ValueError(f'k : {bkt} is already present.')
+
+                data_holder[bkt] = merger(data_holder[bkt], value_mapper(e))
+            else:
+                data_holder[bkt] = value_mapper(e)
+
+    def combine(self, other: 'ToMap') -> Collector:
+        if self._spill is not None or other._spill is not None:
+            raise ValueError('ToMap having max_buckets does not support combine.')
+
+        data_holder = self._data_holder
+        merger = self._merger_on_conflict
+
+        for bkt, v in other._data_holder.items():
+            if bkt in data_holder:
+                if merger is None:
+                    raise ValueError(f'k : {bkt} is already present.')
+
+                data_holder[bkt] = merger(data_holder[bkt], v)
+            else:
+                data_holder[bkt] = v
+
+        return self
+
+    def combinable(self) -> bool:
+        return self._spill is None
+
+    def finish(self) -> Union[dict, Iterable[Tuple[Any, Any]]]:
+        if self._spill is not None:
+            return self._finish_spilled()
+
         return self._data_holder
 
+    def _finish_spilled(self) -> Iterable[Tuple[Any, Any]]:
+        data_holder, self._data_holder = self._data_holder, {}
+
+        yield from data_holder.items()
+        del data_holder
+
+        for partition in self._spill.drain():
+            collector = self.supply()
+            collector._spill = self._spill.child()
+
+            for chunk in divide_in_chunk(partition, _SPILL_CHUNK):
+                collector.consume_many(chunk)
+
+            yield from collector.finish()
+
 
 class Mapping(Collector):
     """
@@ -245,9 +657,22 @@ class Mapping(Collector):
     def supply(self) -> Collector:
         return Mapping(self._func, self._downstream.supply())
 
+    def supply_partial(self) -> Collector:
+        return Mapping(self._func, self._downstream.supply_partial())
+
     def consume(self, e):
         self._downstream.consume(self._func(e))
 
+    def consume_many(self, es: Iterable):
+        self._downstream.consume_many(map(self._func, es))
+
+    def combine(self, other: 'Mapping') -> Collector:
+        self._downstream.combine(other._downstream)
+        return self
+
+    def combinable(self) -> bool:
+        return self._downstream.combinable()
+
     def finish(self):
         return self._downstream.finish()
 
@@ -273,6 +698,21 @@ class MaxBy(Collector):
         elif self._comp(e, self._max) > 0:
             self._max = e
 
+    def consume_many(self, es: Iterable):
+        comp, _max = self._comp, self._max
+
+        for e in es:
+            if _max is NIL or comp(e, _max) > 0:
+                _max = e
+
+        self._max = _max
+
+    def combine(self, other: 'MaxBy') -> Collector:
+        if other._max is not NIL:
+            self.consume(other._max)
+
+        return self
+
     def finish(self) -> Optional:
         return create_optional(self._max)
 
@@ -298,6 +738,21 @@ class MinBy(Collector):
         elif self._comp(e, self._min) < 0:
             self._min = e
 
+    def consume_many(self, es: Iterable):
+        comp, _min = self._comp, self._min
+
+        for e in es:
+            if _min is NIL or comp(e, _min) < 0:
+                _min = e
+
+        self._min = _min
+
+    def combine(self, other: 'MinBy') -> Collector:
+        if other._min is not NIL:
+            self.consume(other._min)
+
+        return self
+
     def finish(self) -> Optional:
         return create_optional(self._min)
 
@@ -343,6 +798,16 @@ class Counting(Collector):
     def consume(self, e):
         self._count += 1
 
+    def consume_many(self, es: Iterable):
+        if isinstance(es, (tuple, list)):
+            self._count += len(es)
+        else:
+            self._count += sum(1 for _ in es)
+
+    def combine(self, other: 'Counting') -> Collector:
+        self._count += other._count
+        return self
+
     def finish(self) -> int:
         return self._count
 
@@ -365,6 +830,19 @@ class Summing(Collector):
     def consume(self, e):
         self._sum += e
 
+    def consume_many(self, es: Iterable):
+        # not builtin "sum", which (since Python 3.12) rounds floats differently from "+=".
+        total = self._sum
+
+        for e in es:
+            total += e
+
+        self._sum = total
+
+    def combine(self, other: 'Summing') -> Collector:
+        self._sum += other._sum
+        return self
+
     def finish(self) -> Union[int, float]:
         return self._sum
 
@@ -385,74 +863,1641 @@ class Averaging(Summing, Counting):
         Summing.consume(self, e)
         Counting.consume(self, e)
 
+    def consume_many(self, es: Iterable):
+        if not isinstance(es, (tuple, list)):
+            es = tuple(es)
+
+        Summing.consume_many(self, es)
+        Counting.consume_many(self, es)
+
+    def combine(self, other: 'Averaging') -> Collector:
+        Summing.combine(self, other)
+        Counting.combine(self, other)
+        return self
+
     def finish(self) -> float:
         return self._sum / self._count
 
 
-class Reduce(Collector):
+class Statistics(NamedTuple):
+    """
+    result of SummaryStatistics; mean, min, max, variance and stdev are None
+    for empty stream.
     """
-    Reduces stream data.
 
-    import operator as op
-    Stream(range(1,5)).collect(Reduce(bi_func=op.mul)) -> Optional[24]
+    count: int
+    sum: Union[int, float]
+    mean: Union[float, None]
+    min: Any
+    max: Any
+    variance: Union[float, None]
+    stdev: Union[float, None]
+
+
+class SummaryStatistics(Collector):
     """
+    Finds count, sum, mean, min, max and variance of numeric elements in a
+    single pass without holding elements.
 
-    def __init__(self, o=NIL, *, bi_func: BiFunction):
-        """
-        Reduces Stream data.
+    Sum is compensated (Kahan-Neumaier) and variance is found using Welford
+    updates, so both are numerically stable over long streams. Chunks given
+    to "consume_many" are summarised using builtin "sum", "fsum", "min" and
+    "max" and then merged (Chan et al.), which is also how partial results
+    of parallel workers are combined.
 
-        :param o: initial point, defaults to NIL
-        :param bi_func: reducing function
+    Stream([2, 4, 4, 4, 5, 5, 7, 9]).collect(SummaryStatistics())
+    -> Statistics(count=8, sum=40, mean=5.0, min=2, max=9, variance=4.0, stdev=2.0)
+    """
 
+    def __init__(self, ddof: int = 0):
+        """
+        :param ddof: variance is found as sum of squared deviations divided by
+                     (count - ddof); 0 for population variance, 1 for sample variance.
         """
 
         super().__init__()
 
-        self._o = o
-        self._bi_func = bi_func
+        self._ddof = ddof
 
-        self._data_holder = o
+        self._count = 0
+        self._sum = 0
+        self._compensation = 0  # lost low order bits of "_sum"
+        self._mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from mean.
+        self._min = NIL
+        self._max = NIL
 
     def supply(self) -> Collector:
-        return Reduce(self._o, bi_func=self._bi_func)
+        return SummaryStatistics(self._ddof)
 
-    def consume(self, e):
-        if self._data_holder is NIL:
-            self._data_holder = e
+    def _add_to_sum(self, x):
+        s = self._sum
+        t = s + x
+
+        if abs(s) >= abs(x):
+            self._compensation += (s - t) + x
         else:
-            self._data_holder = self._bi_func(self._data_holder, e)
+            self._compensation += (x - t) + s
 
-    def finish(self) -> Optional:
-        return create_optional(self._data_holder)
+        self._sum = t
 
+    def consume(self, e):
+        self._count += 1
+        self._add_to_sum(e)
 
-class GroupingBy(Collector):
+        delta = e - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (e - self._mean)
+
+        if self._min is NIL or e < self._min:
+            self._min = e
+
+        if self._max is NIL or e > self._max:
+            self._max = e
+
+    def consume_many(self, es: Iterable):
+        if not isinstance(es, (tuple, list)):
+            es = tuple(es)
+
+        if not es:
+            return
+
+        n = len(es)
+        total = sum(es)
+
+        if isinstance(total, float):
+            total = fsum(es)
+
+        mean = total / n
+        m2 = fsum((e - mean) ** 2 for e in es)
+
+        self._merge(n, total, mean, m2, min(es), max(es))
+
+    def _merge(self, n: int, total, mean: float, m2: float, _min, _max):
+        count = self._count + n
+        delta = mean - self._mean
+
+        self._mean += delta * n / count
+        self._m2 += m2 + delta * delta * self._count * n / count
+        self._count = count
+
+        self._add_to_sum(total)
+
+        if self._min is NIL or _min < self._min:
+            self._min = _min
+
+        if self._max is NIL or _max > self._max:
+            self._max = _max
+
+    def combine(self, other: 'SummaryStatistics') -> Collector:
+        if other._count:
+            self._merge(other._count, other._sum, other._mean, other._m2, other._min, other._max)
+            self._add_to_sum(other._compensation)
+
+        return self
+
+    def finish(self) -> Statistics:
+        count = self._count
+        total = self._sum + self._compensation
+
+        if count == 0:
+            return Statistics(0, total, None, None, None, None, None)
+
+        variance = self._m2 / (count - self._ddof) if count > self._ddof else None
+        stdev = sqrt(variance) if variance is not None else None
+
+        return Statistics(count, total, self._mean, self._min, self._max, variance, stdev)
+
+
+class HistogramData(NamedTuple):
+    """
+    result of Histogram; counts[i] is number of elements in [edges[i], edges[i + 1]),
+    last bin includes edges[-1] as well.
     """
-    Groups stream elements.
 
-    Stream(['AB','BD','AC','DE','BD','BW','AB']).collect(GroupingBy(lambda x:x[0],
-                                                                    GroupingBy(lambda x:x[1],
-                                                                                Counting())))
-    -> {'A': {'B': 2, 'C': 1}, 'B': {'D': 2, 'W': 1}, 'D': {'E': 1}}
+    edges: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    underflow: int = 0  # number of elements less than edges[0]
+    overflow: int = 0  # number of elements greater than edges[-1] (or nan)
+
+
+_VECTORIZE_MIN = 64  # numpy is used for chunks having at least this many elements.
+
+
+class Histogram(Collector):
+    """
+    Counts numeric elements falling in each bin. Only bin counts are held.
+
+    Bins are either given by their edges or as number of equal width bins
+    over "range" (equal width in logarithmic scale if "log" is True).
+
+    If numpy is installed, chunks given to "consume_many" are binned in a
+    vectorized way, otherwise each element is binned using "bisect".
+
+    Stream([1, 2, 2, 3, 7, 11]).collect(Histogram(bins=[0, 2, 4, 10]))
+    -> HistogramData(edges=(0, 2, 4, 10), counts=(1, 3, 1), underflow=0, overflow=1)
+
+    Stream(latencies).collect(Histogram(bins=20, range=(0.1, 1000), log=True))
     """
 
-    def __init__(self, group_by: Function, downstream: Collector = None):
+    def __init__(self, bins: Union[int, Sequence[float]] = 10, range: Tuple[float, float] = None,
+                 log: bool = False):
+        """
+        :param bins: number of bins or increasing sequence of bin edges.
+        :param range: (low, high) of bins, required if "bins" is a number.
+        :param log: if True, then bins have equal width in logarithmic scale.
+        """
+
         super().__init__()
 
-        self._group_by = group_by
-        self._downstream = downstream or ToList()
-        self._bucket: DefaultDict[Any, Collector] = defaultdict(self._downstream.supply)
+        if isinstance(bins, int):
+            if range is None:
+                raise ValueError("'range' is required when 'bins' is a number.")
 
-    def supply(self) -> Collector:
-        return GroupingBy(self._group_by, self._downstream.supply())
+            edges = Histogram._make_edges(bins, range[0], range[1], log)
+        else:
+            edges = tuple(bins)
 
-    def consume(self, e):
-        bkt = self._group_by(e)
-        self._bucket[bkt].consume(e)
+        if len(edges) < 2 or any(a >= b for a, b in zip(edges, edges[1:])):
+            raise ValueError('bin edges must be strictly increasing and at least two.')
+
+        self._edges = edges
+        self._counts = [0] * (len(edges) - 1)
+        self._underflow = 0
+        self._overflow = 0
+
+    @staticmethod
+    def _make_edges(bins: int, low: float, high: float, log_scale: bool) -> Tuple[float, ...]:
+        assert bins > 0, 'number of bins must be positive.'
+
+        if log_scale:
+            if low <= 0:
+                raise ValueError('range must be positive for logarithmic bins.')
+
+            low_exp, high_exp = log10(low), log10(high)
+            step = (high_exp - low_exp) / bins
+            inner = tuple(10 ** (low_exp + i * step) for i in range(1, bins))
+        else:
+            step = (high - low) / bins
+            inner = tuple(low + i * step for i in range(1, bins))
+
+        return (low,) + inner + (high,)
+
+    def supply(self) -> Collector:
+        return Histogram(self._edges)
+
+    def consume(self, e):
+        edges = self._edges
+        idx = bisect_right(edges, e) - 1
+
+        if idx < 0:
+            self._underflow += 1
+        elif idx < len(self._counts):
+            self._counts[idx] += 1
+        elif e == edges[-1]:
+            self._counts[-1] += 1
+        else:
+            self._overflow += 1
+
+    def consume_many(self, es: Iterable):
+        if not isinstance(es, (tuple, list)):
+            es = tuple(es)
+
+        np = optional_import('numpy')
+
+        if np is None or len(es) < _VECTORIZE_MIN:
+            consume = self.consume
+
+            for e in es:
+                consume(e)
+
+            return
+
+        counts, edges = self._counts, self._edges
+        arr = np.asarray(es, dtype=float)
+
+        idx = np.searchsorted(np.asarray(edges, dtype=float), arr, side='right') - 1
+        idx[arr == edges[-1]] = len(counts) - 1
+
+        self._underflow += int(np.count_nonzero(idx < 0))
+        self._overflow += int(np.count_nonzero(idx >= len(counts)))
+
+        inside = idx[(idx >= 0) & (idx < len(counts))]
+
+        for i, c in enumerate(np.bincount(inside, minlength=len(counts)).tolist()):
+            counts[i] += c
+
+    def combine(self, other: 'Histogram') -> Collector:
+        if self._edges != other._edges:
+            raise ValueError('Histograms having different bins can not be combined.')
+
+        self._counts = [a + b for a, b in zip(self._counts, other._counts)]
+        self._underflow += other._underflow
+        self._overflow += other._overflow
+
+        return self
+
+    def finish(self) -> HistogramData:
+        return HistogramData(self._edges, tuple(self._counts), self._underflow, self._overflow)
+
+
+class AutoHistogram(Collector):
+    """
+    Histogram whose bins are chosen automatically, so neither range nor
+    edges need to be known in advance.
+
+    Bins have equal width which is a power of 2, and their edges are multiples
+    of width. Width starts small and is doubled (merging pairs of adjacent bins)
+    whenever elements span more than "max_bins" bins. As bins of all histograms
+    lie on the same grid, histograms made by parallel workers are combined
+    by bringing them to the larger width.
+
+    Stream([1, 2, 2, 3, 7]).collect(AutoHistogram(max_bins=4))
+    -> HistogramData(edges=(0.0, 2.0, 4.0, 6.0, 8.0), counts=(1, 3, 0, 1), underflow=0, overflow=0)
+    """
+
+    def __init__(self, max_bins: int = 64):
+        """
+        :param max_bins: maximum number of bins; at least 2, as 0 is always an edge.
+        """
+
+        assert max_bins > 1, 'max_bins must be at least 2.'
+
+        super().__init__()
+
+        self._max_bins = max_bins
+        self._exp = None  # width of bin is 2 ** _exp
+        self._counts: Dict[int, int] = {}  # bin index -> count, i-th bin is [i * width, (i + 1) * width)
+
+    def supply(self) -> Collector:
+        return AutoHistogram(self._max_bins)
+
+    def _initial_exp(self, low: float, high: float) -> int:
+        spread = (high - low) / self._max_bins
+
+        if spread > 0:
+            return frexp(spread)[1] - 1
+
+        # all elements are same so far; width is chosen as fine as its magnitude allows.
+        return frexp(abs(low) or 1.0)[1] - 53
+
+    def _coarsen(self):
+        counts = self._counts
+
+        while max(counts) - min(counts) >= self._max_bins:
+            self._coarsen_to(self._exp + 1)
+            counts = self._counts
+
+    def _coarsen_to(self, exp: int):
+        if exp > self._exp:
+            merged = defaultdict(int)
+            shift = exp - self._exp
+
+            for idx, c in self._counts.items():
+                merged[idx >> shift] += c
+
+            self._counts = dict(merged)
+            self._exp = exp
+
+    def consume(self, e):
+        self.consume_many((e,))
+
+    def consume_many(self, es: Iterable):
+        if not isinstance(es, (tuple, list)):
+            es = tuple(es)
+
+        if not es:
+            return
+
+        low, high = min(es), max(es)
+
+        if isnan(low) or isnan(high) or isinf(low) or isinf(high):
+            raise ValueError('AutoHistogram requires finite elements.')
+
+        # width is made large enough for current bins and chunk together before
+        # binning chunk, so that a widely spread chunk does not create many bins.
+        if self._exp is None:
+            self._exp = self._initial_exp(low, high)
+        else:
+            width = ldexp(1.0, self._exp)
+            low = min(low, min(self._counts) * width)
+            high = max(high, max(self._counts) * width)
+
+            self._coarsen_to(self._initial_exp(low, high))
+
+        counts, exp = self._counts, self._exp
+        np = optional_import('numpy')
+
+        if np is not None and len(es) >= _VECTORIZE_MIN:
+            idx, c = np.unique(np.floor(np.ldexp(np.asarray(es, dtype=float), -exp)), return_counts=True)
+            chunk = zip(map(int, idx.tolist()), c.tolist())
+        else:
+            chunk = Counter(floor(ldexp(e, -exp)) for e in es).items()
+
+        for idx, c in chunk:
+            counts[idx] = counts.get(idx, 0) + c
+
+        self._coarsen()
+
+    def combine(self, other: 'AutoHistogram') -> Collector:
+        if other._exp is None:
+            return self
+
+        if self._exp is None:
+            self._exp, self._counts = other._exp, dict(other._counts)
+            return self
+
+        exp = max(self._exp, other._exp)
+        self._coarsen_to(exp)
+
+        counts = self._counts
+
+        for idx, c in other._counts.items():
+            idx >>= exp - other._exp
+            counts[idx] = counts.get(idx, 0) + c
+
+        self._coarsen()
+
+        return self
+
+    def finish(self) -> HistogramData:
+        if not self._counts:
+            return HistogramData((), ())
+
+        counts, width = self._counts, ldexp(1.0, self._exp)
+        first, last = min(counts), max(counts)
+
+        edges = tuple(i * width for i in range(first, last + 2))
+        return HistogramData(edges, tuple(counts.get(i, 0) for i in range(first, last + 1)))
+
+
+class ApproxDistinctCount(Collector):
+    """
+    Estimates number of distinct elements using HyperLogLog sketch, taking
+    2**precision bytes irrespective of number of elements (4 KB for default
+    precision). Relative standard error is about 1.04 / sqrt(2**precision),
+    i.e. 1.6% for precision 12, 0.8% for 14 and 0.4% for 16.
+
+    Elements are hashed using "hash64", so partial results made in different
+    processes can be combined.
+
+    Stream(user_ids).collect(ApproxDistinctCount()) -> about len(set(user_ids))
+    Stream(events).collect(GroupingBy(itemgetter('page'), Mapping(itemgetter('user_id'), ApproxDistinctCount())))
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        :param precision: in [4, 18]
+        """
+
+        super().__init__()
+
+        self._sketch = HyperLogLog(precision)
+
+    def supply(self) -> Collector:
+        return ApproxDistinctCount(self._sketch.precision)
+
+    def consume(self, e):
+        self._sketch.add(e)
+
+    def consume_many(self, es: Iterable):
+        self._sketch.update(es)
+
+    def combine(self, other: 'ApproxDistinctCount') -> Collector:
+        self._sketch.merge(other._sketch)
+        return self
+
+    def finish(self) -> int:
+        return len(self._sketch)
+
+
+class Quantiles(Collector):
+    """
+    Estimates quantiles of elements using a KLL sketch, which holds about
+    3 * k elements (k = 2 / accuracy) irrespective of number of elements.
+    Returned element for quantile q has rank within about "accuracy" * n of
+    q * n (with high probability), where n is number of elements.
+
+    Result is a dictionary mapping each quantile to corresponding element
+    (None for empty stream).
+
+    Stream(range(1, 10001)).collect(Quantiles([0.5, 0.9, 0.99]))
+    -> about {0.5: 5000, 0.9: 9000, 0.99: 9900}
+
+    Stream(requests).collect(GroupingBy(itemgetter('endpoint'),
+                                        Mapping(itemgetter('latency'), Quantiles([0.99]))))
+    """
+
+    def __init__(self, qs: Sequence[float] = (0.5, 0.9, 0.99), accuracy: float = 0.01, seed: int = None):
+        """
+        :param qs: quantiles, each in [0, 1]
+        :param accuracy: rank error as fraction of number of elements.
+        :param seed: seed used by sketch.
+        """
+
+        super().__init__()
+
+        if not all(0 <= q <= 1 for q in qs):
+            raise ValueError('quantiles must be in [0, 1].')
+
+        assert 0 < accuracy < 1, 'accuracy must be in (0, 1).'
+
+        self._qs = tuple(qs)
+        self._accuracy = accuracy
+        self._seed = seed
+        self._sketch = KLLSketch(max(8, ceil(2 / accuracy)), seed)
+
+    def supply(self) -> Collector:
+        return Quantiles(self._qs, self._accuracy, self._seed)
+
+    def consume(self, e):
+        self._sketch.add(e)
+
+    def consume_many(self, es: Iterable):
+        self._sketch.update(es)
+
+    def combine(self, other: 'Quantiles') -> Collector:
+        self._sketch.merge(other._sketch)
+        return self
+
+    def finish(self) -> Dict[float, Any]:
+        return dict(zip(self._qs, self._sketch.quantiles(self._qs)))
+
+
+class HeavyHitters(Collector):
+    """
+    Finds "k" most frequent elements without counting every distinct element.
+    It keeps at most 2 / epsilon counters (Misra-Gries / Space-Saving summary);
+    reported count of an element is lower than its frequency by at most
+    epsilon * n, where n is number of elements, and every element occurring
+    more than epsilon * n times is reported (if it is among "k" most frequent).
+
+    Result is a list of FrequentItem(item, count, error) in decreasing order
+    of count; true frequency of item is in [count, count + error].
+
+    Stream(requests).collect(Mapping(itemgetter('key'), HeavyHitters(10, epsilon=0.001)))
+    """
+
+    def __init__(self, k: int, epsilon: float = 0.001):
+        """
+        :param k: number of elements to report.
+        :param epsilon: error bound as fraction of number of elements.
+        """
+
+        assert 0 < epsilon < 1, 'epsilon must be in (0, 1).'
+
+        super().__init__()
+
+        self._k = k
+        self._epsilon = epsilon
+        self._summary = FrequentItems(max(k, ceil(1 / epsilon) - 1))
+
+    def supply(self) -> Collector:
+        return HeavyHitters(self._k, self._epsilon)
+
+    def consume(self, e):
+        self._summary.add(e)
+
+    def consume_many(self, es: Iterable):
+        self._summary.update(es)
+
+    def combine(self, other: 'HeavyHitters') -> Collector:
+        self._summary.merge(other._summary)
+        return self
+
+    def finish(self) -> List[FrequentItem]:
+        return self._summary.top(self._k)
+
+
+def _derived_seed(seed, rnd: Random) -> Union[int, None]:
+    """
+    seed of a supplied sampling collector. Supplied collectors must draw
+    independent random numbers (otherwise partial samples are correlated),
+    so a new seed is drawn from "rnd" if "seed" is given.
+
+    Note that collectors supplied in worker processes are supplied by copies
+    of same collector, so "seed" should be None when sampling with process
+    based ParallelStream.collect_concurrent.
+
+    :param seed:
+    :param rnd:
+    :return:
+    """
+
+    return None if seed is None else rnd.getrandbits(64)
+
+
+class ReservoirSample(Collector):
+    """
+    Samples "k" elements uniformly at random (without replacement) from a
+    stream of unknown length, holding only "k" elements.
+
+    It uses Algorithm L (Li, 1994): position of next element replacing a
+    sampled element is drawn directly, so random numbers are drawn only for
+    replaced elements, not for every element. Order of sampled elements is
+    arbitrary.
+
+    Stream(range(10 ** 6)).collect(ReservoirSample(5, seed=1)) -> 5 random elements
+    """
+
+    def __init__(self, k: int, seed: Union[int, Random] = None):
+        """
+        :param k: sample size.
+        :param seed: integer or random number generator (like testHelper.RND).
+        """
+
+        assert k > 0, 'k must be positive.'
+
+        super().__init__()
+
+        self._k = k
+        self._seed = seed
+        self._rnd = as_random(seed)
+
+        self._sample = []
+        self._n = 0  # number of elements seen
+        self._log_w = 0.0  # log of largest key among sampled elements in Algorithm L.
+        self._next = k - 1  # position of next element to be sampled once sample is full.
+
+    def supply(self) -> Collector:
+        return ReservoirSample(self._k, _derived_seed(self._seed, self._rnd))
+
+    def _random(self) -> float:
+        u = self._rnd.random()
+
+        while u == 0:  # so that its log is defined.
+            u = self._rnd.random()
+
+        return u
+
+    def _skip(self):
+        # w is kept in log scale, so that log(1 - w) is computed accurately
+        # when w is close to 1.
+        self._log_w += log(self._random()) / self._k
+        self._next += int(log(self._random()) / log(-expm1(self._log_w))) + 1
+
+    def consume(self, e):
+        self.consume_many((e,))
+
+    def consume_many(self, es: Iterable):
+        if not isinstance(es, (tuple, list)):
+            es = tuple(es)
+
+        sample, k = self._sample, self._k
+        start = self._n
+        end = start + len(es)
+
+        if len(sample) < k:
+            sample.extend(es[:k - len(sample)])
+
+            if len(sample) == k and start < k:
+                self._skip()
+
+        while self._next < end:
+            sample[self._rnd.randrange(k)] = es[self._next - start]
+            self._skip()
+
+        self._n = end
+
+    def combine(self, other: 'ReservoirSample') -> Collector:
+        if other._n == 0:
+            return self
+
+        n, other_n = self._n, other._n
+        mine, others = self._sample[:], other._sample[:]
+
+        self._rnd.shuffle(mine)
+        self._rnd.shuffle(others)
+
+        # each sampled element stands for n / len(sample) elements; elements are
+        # drawn without replacement from union of both streams.
+        sample = []
+
+        while len(sample) < self._k and (mine or others):
+            if others and (not mine or self._rnd.random() * (n + other_n) < other_n):
+                sample.append(others.pop())
+                other_n -= 1
+            else:
+                sample.append(mine.pop())
+                n -= 1
+
+        self._sample = sample
+        self._n += other._n
+
+        # continuing Algorithm L: w is distributed as k-th smallest of n uniform numbers.
+        if self._n >= self._k:
+            w = self._rnd.betavariate(self._k, self._n - self._k + 1)
+
+            self._log_w = log(min(max(w, 1e-300), 1 - 1e-16))
+            self._next = self._n + int(log(self._random()) / log(-expm1(self._log_w)))
+        else:
+            self._next = self._k - 1
+
+        return self
+
+    def finish(self) -> list:
+        return self._sample
+
+
+class WeightedReservoirSample(Collector):
+    """
+    Samples "k" elements without replacement, where probability of sampling
+    an element is proportional to its weight (Efraimidis and Spirakis, 2006).
+
+    Each element gets key log(u) / weight, where u is uniform random number,
+    and "k" elements having largest keys are held in a heap. Partial samples
+    are combined by keeping "k" largest keys of both.
+
+    Stream(items).collect(WeightedReservoirSample(10, weight=itemgetter('score'), seed=1))
+    """
+
+    def __init__(self, k: int, weight: Function[X, float], seed: Union[int, Random] = None):
+        """
+        :param k: sample size.
+        :param weight: positive weight of element.
+        :param seed: integer or random number generator (like testHelper.RND).
+        """
+
+        assert k > 0, 'k must be positive.'
+
+        super().__init__()
+
+        self._k = k
+        self._weight = weight
+        self._seed = seed
+        self._rnd = as_random(seed)
+
+        self._heap = []  # min heap of (key, position, element)
+        self._n = 0
+
+    def supply(self) -> Collector:
+        return WeightedReservoirSample(self._k, self._weight, _derived_seed(self._seed, self._rnd))
+
+    def consume(self, e):
+        self.consume_many((e,))
+
+    def consume_many(self, es: Iterable):
+        heap, k, weight, rnd = self._heap, self._k, self._weight, self._rnd
+        n = self._n
+
+        for e in es:
+            w = weight(e)
+
+            if w <= 0:
+                if w < 0:
+                    raise ValueError(f'weight must be non negative, given: {w}')
+
+                continue  # elements having zero weight are never sampled.
+
+            n += 1
+            key = log(1 - rnd.random()) / w
+
+            if len(heap) < k:
+                heappush(heap, (key, n, e))
+            elif heap[0][0] < key:
+                heapreplace(heap, (key, n, e))
+
+        self._n = n
+
+    def combine(self, other: 'WeightedReservoirSample') -> Collector:
+        shift = self._n
+        entries = ((key, n + shift, e) for key, n, e in other._heap)
+
+        self._heap = sorted(chain(self._heap, entries), reverse=True)[:self._k]
+        heapify(self._heap)
+
+        self._n += other._n
+        return self
+
+    def finish(self) -> list:
+        return [e for _, _, e in sorted(self._heap, reverse=True)]
+
+
+class Reduce(Collector):
+    """
+    Reduces stream data.
+
+    import operator as op
+    Stream(range(1,5)).collect(Reduce(bi_func=op.mul)) -> Optional[24]
+
+    Elements are folded from left starting with initial point (if given), like
+    Stream.reduce. Partial results (see "supply_partial") are folded without it
+    and initial point is applied once to their combined result, i.e.
+    bi_func(o, bi_func(bi_func(e1, e2), e3)); so "bi_func" must be associative
+    to combine partial results.
+    """
+
+    def __init__(self, o=NIL, *, bi_func: BiFunction):
+        """
+        Reduces Stream data.
+
+        :param o: initial point, defaults to NIL
+        :param bi_func: reducing function
+
+        """
+
+        super().__init__()
+
+        self._o = o
+        self._bi_func = bi_func
+
+        self._partial = False  # if True, then initial point is applied in "finish".
+        self._data_holder = o
+
+    def supply(self) -> Collector:
+        return self._supply(self._partial)
+
+    def supply_partial(self) -> Collector:
+        return self._supply(True)
+
+    def _supply(self, partial_result: bool) -> 'Reduce':
+        out = Reduce(self._o, bi_func=self._bi_func)
+
+        if partial_result:
+            out._partial = True
+            out._data_holder = NIL
+
+        return out
+
+    def consume(self, e):
+        if self._data_holder is NIL:
+            self._data_holder = e
+        else:
+            self._data_holder = self._bi_func(self._data_holder, e)
+
+    def consume_many(self, es: Iterable):
+        itr = iter(es)
+
+        if self._data_holder is NIL:
+            self._data_holder = next(itr, NIL)
+
+            if self._data_holder is NIL:
+                return
+
+        self._data_holder = reduce(self._bi_func, itr, self._data_holder)
+
+    def combine(self, other: 'Reduce') -> Collector:
+        """
+        Note that "bi_func" must be associative.
+
+        :param other:
+        :return: self
+        """
+
+        if other._data_holder is not NIL:
+            self.consume(other._data_holder)
+
+        return self
+
+    def finish(self) -> Optional:
+        if self._partial:
+            return create_optional(_with_initial_point(self._o, self._data_holder, self._bi_func))
+
+        return create_optional(self._data_holder)
+
+
+def _with_initial_point(o, v, bi_func: BiFunction):
+    """
+    :param o: initial point, NIL if not given.
+    :param v: reduced value of elements, NIL if there is no element.
+    :param bi_func:
+    :return: "v" with initial point applied.
+    """
+
+    if o is NIL:
+        return v
+
+    return o if v is NIL else bi_func(o, v)
+
+
+class _Desc:
+    """
+    reverses ordering of "rank", so that min heap of _Desc is max heap of ranks.
+    """
+
+    __slots__ = ('rank',)
+
+    def __init__(self, rank):
+        self.rank = rank
+
+    def __lt__(self, other: '_Desc') -> bool:
+        return other.rank < self.rank
+
+
+class TopK(Collector):
+    """
+    Finds "k" largest elements (smallest if "reverse" is True) according to
+    "key". Result is a list ordered from best to worst; it is same as
+    sorted(elements, key=key, reverse=not reverse)[:k] (for ties="first").
+
+    Only "k" elements are held in a heap, so memory is O(k) and each element
+    costs one call of "key" and a comparison with the worst held element.
+    When used as downstream of GroupingBy, memory is O(groups * k).
+
+    Elements having equal keys are ranked by their order in stream, "ties"
+    decides whether earlier ("first") or later ("last") element is preferred.
+    Elements themselves are never compared.
+
+    Stream([1,4,2,6,1,5,6]).collect(TopK(3)) -> [6, 6, 5]
+    Stream(['bb', 'a', 'ccc']).collect(TopK(2, key=len, reverse=True)) -> ['a', 'bb']
+
+    Stream(products).collect(GroupingBy(attrgetter('category'),
+                                        TopK(10, key=attrgetter('sales'))))
+    """
+
+    def __init__(self, k: int, key: Function[X, Any] = None, reverse: bool = False, ties: str = 'first'):
+        """
+        :param k: number of elements to find.
+        :param key: elements are compared on key(element); if None then element itself.
+        :param reverse: if True, then smallest elements are found.
+        :param ties: 'first' or 'last'
+        """
+
+        assert k >= 0, 'k must be non-negative.'
+
+        if ties not in ('first', 'last'):
+            raise ValueError(f"'ties' must be either 'first' or 'last', given: {ties}")
+
+        super().__init__()
+
+        self._k = k
+        self._key = key
+        self._reverse = reverse
+        self._ties = ties
+
+        # order of i-th element is sign * i; it is part of rank so that
+        # preferred element among ties has higher rank.
+        self._sign = 1 if (ties == 'first') == reverse else -1
+
+        self._heap = []  # min heap of (rank, element); heap[0] is worst held element.
+        self._count = 0
+
+    def supply(self) -> Collector:
+        return self.__class__(self._k, self._key, self._reverse, self._ties)
+
+    def consume(self, e):
+        self.consume_many((e,))
+
+    def consume_many(self, es: Iterable):
+        heap, k, key, sign = self._heap, self._k, self._key, self._sign
+        count, reverse = self._count, self._reverse
+
+        for e in es:
+            count += 1
+            rank = (e if key is None else key(e), sign * count)
+
+            if reverse:
+                rank = _Desc(rank)
+
+            if len(heap) < k:
+                heappush(heap, (rank, e))
+            elif k and heap[0][0] < rank:
+                heapreplace(heap, (rank, e))
+
+        self._count = count
+
+    def combine(self, other: 'TopK') -> Collector:
+        # elements of "other" come after elements of this collector.
+        shift = self._sign * self._count
+        entries = (self._shifted(rank, shift) for rank, _ in other._heap)
+
+        self._heap = sorted(chain(self._heap, zip(entries, (e for _, e in other._heap))),
+                            reverse=True)[:self._k]
+        heapify(self._heap)
+
+        self._count += other._count
+        return self
+
+    def _shifted(self, rank, shift):
+        if self._reverse:
+            k, order = rank.rank
+            return _Desc((k, order + shift))
+
+        k, order = rank
+        return k, order + shift
+
+    def finish(self) -> list:
+        return [e for _, e in sorted(self._heap, reverse=True)]
+
+
+class BottomK(TopK):
+    """
+    Finds "k" smallest elements according to "key", same as TopK(k, key, reverse=True).
+
+    Stream([1,4,2,6,1,5,6]).collect(BottomK(3)) -> [1, 1, 2]
+    """
+
+    def __init__(self, k: int, key: Function[X, Any] = None, ties: str = 'first'):
+        super().__init__(k, key, reverse=True, ties=ties)
+
+    def supply(self) -> Collector:
+        return BottomK(self._k, self._key, self._ties)
+
+
+class Aggregating(Collector):
+    """
+    Runs several collectors at once on the same elements.
+
+    Stream(range(5)).collect(Aggregating({'n': Counting(), 's': Summing()}))
+    -> {'n': 5, 's': 10}
+    """
+
+    def __init__(self, agg: Dict[Any, Collector]):
+        """
+        :param agg: maps name of aggregation to its collector.
+        """
+
+        super().__init__()
+
+        assert agg, 'at least one aggregation is required.'
+
+        self._agg = agg
+
+    def supply(self) -> Collector:
+        return Aggregating({name: c.supply() for name, c in self._agg.items()})
+
+    def supply_partial(self) -> Collector:
+        return Aggregating({name: c.supply_partial() for name, c in self._agg.items()})
+
+    def consume(self, e):
+        for c in self._agg.values():
+            c.consume(e)
+
+    def consume_many(self, es: Iterable):
+        if not isinstance(es, (tuple, list)):
+            es = tuple(es)
+
+        for c in self._agg.values():
+            c.consume_many(es)
+
+    def combine(self, other: 'Aggregating') -> Collector:
+        for name, c in self._agg.items():
+            c.combine(other._agg[name])
+
+        return self
+
+    def combinable(self) -> bool:
+        return all(c.combinable() for c in self._agg.values())
 
     def finish(self) -> dict:
+        return {name: c.finish() for name, c in self._agg.items()}
+
+
+class GroupingBy(Collector):
+    """
+    Groups stream elements.
+
+    Stream(['AB','BD','AC','DE','BD','BW','AB']).collect(GroupingBy(lambda x:x[0],
+                                                                    GroupingBy(lambda x:x[1],
+                                                                                Counting())))
+    -> {'A': {'B': 2, 'C': 1}, 'B': {'D': 2, 'W': 1}, 'D': {'E': 1}}
+
+    Several aggregations can be computed for each bucket using "agg":
+
+    Stream(range(10)).collect(GroupingBy(lambda x: x % 2, agg={'n': Counting(), 's': Summing()}))
+    -> {0: {'n': 5, 's': 20}, 1: {'n': 5, 's': 25}}
+
+    If downstream is made of known collectors (ToList, ToSet, Counting, Summing,
+    Averaging, MaxBy, MinBy, Reduce and Mapping, CollectAndThen, Aggregating or
+    GroupingBy over them), then buckets are not held as one Collector per key;
+    instead their state is held in flat dictionaries and nested GroupingBy
+    uses composite (tuple) keys. Output is same as the one made by
+    per key Collectors.
+
+    If "max_buckets" is given, then at most that many buckets are held in memory.
+    Elements of further buckets are hash partitioned into temporary files
+    (so elements must be picklable) and each partition is grouped once
+    buckets held in memory have been given out. In this case, "finish" returns
+    an iterator of (bucket, result) pairs instead of a dictionary.
+
+    Stream(sessions).collect(GroupingBy(get_session_id, Counting(), max_buckets=10 ** 6))
+    -> iterator of (session id, count) pairs
+    """
+
+    def __init__(self, group_by: Function, downstream: Collector = None,
+                 *, agg: Dict[Any, Collector] = None,
+                 max_buckets: int = None, partitions: int = 64):
+        """
+        :param group_by: finds bucket of element.
+        :param downstream: collects elements of a bucket, defaults to ToList.
+        :param agg: if given, then elements of a bucket are collected by Aggregating(agg),
+                    "downstream" must not be given along with it.
+        :param max_buckets: maximum number of buckets held in memory, None means no limit.
+        :param partitions: number of partition files used when "max_buckets" is crossed.
+        """
+
+        super().__init__()
+
+        if agg is not None:
+            assert downstream is None, "either 'downstream' or 'agg' can be given."
+            downstream = Aggregating(agg)
+
+        self._group_by = group_by
+        self._downstream = downstream or ToList()
+        self._state = _keyed_state(self._downstream)
+        self._bucket: DefaultDict[Any, Collector] = defaultdict(self._downstream.supply)
+        self._spill = _BucketSpill(max_buckets, partitions) if max_buckets is not None else None
+
+    def supply(self) -> Collector:
+        return self._supply(self._downstream.supply())
+
+    def supply_partial(self) -> Collector:
+        return self._supply(self._downstream.supply_partial())
+
+    def _supply(self, downstream: Collector) -> 'GroupingBy':
+        out = GroupingBy(self._group_by, downstream)
+        out._spill = self._spill.supply() if self._spill is not None else None
+        return out
+
+    def consume(self, e):
+        bkt = self._group_by(e)
+
+        if self._spill is not None and not self._spill.holds(bkt):
+            self._spill.append(bkt, e)
+        elif self._state is not None:
+            self._state.update(bkt, e)
+        else:
+            self._bucket[bkt].consume(e)
+
+    def consume_many(self, es: Iterable):
+        if not isinstance(es, (tuple, list)):
+            es = tuple(es)
+
+        bkts = tuple(map(self._group_by, es))
+
+        if self._spill is not None:
+            bkts, es = self._spill.split(bkts, es)
+
+        if self._state is not None:
+            self._state.update_many(bkts, es)
+            return
+
+        # elements of chunk are first grouped locally, so that each bucket
+        # receives its elements in one bulk call.
+        chunk = defaultdict(list)
+
+        for bkt, e in zip(bkts, es):
+            chunk[bkt].append(e)
+
+        bucket = self._bucket
+
+        for bkt, bkt_es in chunk.items():
+            bucket[bkt].consume_many(bkt_es)
+
+    def combine(self, other: 'GroupingBy') -> Collector:
+        if self._spill is not None or other._spill is not None:
+            raise ValueError('GroupingBy having max_buckets does not support combine.')
+
+        if self._state is not None:
+            self._state.combine(other._state)
+            return self
+
+        bucket = self._bucket
+
+        for bkt, c in other._bucket.items():
+            if bkt in bucket:
+                bucket[bkt].combine(c)
+            else:
+                bucket[bkt] = c
+
+        return self
+
+    def combinable(self) -> bool:
+        return self._spill is None and self._downstream.combinable()
+
+    def finish(self) -> Union[dict, Iterable[Tuple[Any, Any]]]:
+        if self._spill is not None:
+            return self._finish_spilled()
+
+        return self._finish_resident()
+
+    def _finish_resident(self) -> dict:
+        if self._state is not None:
+            return self._state.finish()
+
         return {k: v.finish() for k, v in self._bucket.items()}
 
+    def _finish_spilled(self) -> Iterable[Tuple[Any, Any]]:
+        resident = self._finish_resident()
+
+        self._state = _keyed_state(self._downstream)
+        self._bucket.clear()
+
+        yield from resident.items()
+        del resident
+
+        for partition in self._spill.drain():
+            collector = self.supply()
+            collector._spill = self._spill.child()
+
+            for chunk in divide_in_chunk(partition, _SPILL_CHUNK):
+                collector.consume_many(chunk)
+
+            yield from collector.finish()
+
+
+_SPILL_CHUNK = 1024  # number of spilled elements read back at once
+
+
+class _BucketSpill:
+    """
+    Keeps track of buckets held in memory by ToMap and GroupingBy. Once
+    "max_buckets" buckets are held, elements of any other bucket are
+    spilled into hash partitioned temporary files.
+    """
+
+    def __init__(self, max_buckets: int, partitions: int, salt: int = 0):
+        assert max_buckets > 0, 'max_buckets must be positive.'
+
+        self._max_buckets = max_buckets
+        self._partitions = partitions
+        self._salt = salt
+
+        self._resident = set()
+        self._spill = PartitionedSpill(partitions, salt=salt)
+
+    def supply(self) -> '_BucketSpill':
+        return _BucketSpill(self._max_buckets, self._partitions, self._salt)
+
+    def child(self) -> '_BucketSpill':
+        """
+        creates _BucketSpill for processing a partition; partition is
+        re-partitioned using a different salt, if required.
+        :return:
+        """
+
+        return _BucketSpill(self._max_buckets, self._partitions, self._salt + 1)
+
+    def holds(self, bkt) -> bool:
+        """
+        returns True if bucket "bkt" is (or can be) held in memory.
+
+        :param bkt:
+        :return:
+        """
+
+        resident = self._resident
+
+        if bkt in resident:
+            return True
+
+        if len(resident) < self._max_buckets:
+            resident.add(bkt)
+            return True
+
+        return False
+
+    def append(self, bkt, e):
+        self._spill.append(bkt, e)
+
+    def split(self, bkts: Sequence, es: Sequence) -> Tuple[list, list]:
+        """
+        spills elements whose buckets are not held in memory.
+
+        :param bkts:
+        :param es:
+        :return: buckets and elements which are held in memory.
+        """
+
+        held_bkts, held_es = [], []
+
+        for bkt, e in zip(bkts, es):
+            if self.holds(bkt):
+                held_bkts.append(bkt)
+                held_es.append(e)
+            else:
+                self._spill.append(bkt, e)
+
+        return held_bkts, held_es
+
+    def drain(self) -> Iterable[SpillFile]:
+        self._resident.clear()
+        return self._spill.drain()
+
+
+# ------------------------------------------------------------------
+# Compact state of GroupingBy buckets.
+#
+# Each "_KeyedState" holds, for every bucket, state of a known downstream
+# Collector as primitive values in flat dictionaries. "finish" returns
+# a dictionary mapping bucket to the value which downstream Collector of
+# the bucket would have returned.
+
+class _KeyedState(ABC):
+    @abstractmethod
+    def update(self, k, e):
+        """
+        consumes element "e" in bucket "k".
+        :param k:
+        :param e:
+        """
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        """
+        consumes element es[i] in bucket ks[i].
+        :param ks:
+        :param es:
+        """
+
+        update = self.update
+
+        for k, e in zip(ks, es):
+            update(k, e)
+
+    @abstractmethod
+    def combine(self, other: '_KeyedState'):
+        """
+        merges state of "other" (having consumed later elements) into this state.
+        :param other:
+        """
+
+    @abstractmethod
+    def finish(self) -> dict:
+        """
+        :return: dictionary mapping bucket to its result.
+        """
+
+
+class _ListState(_KeyedState):
+    def __init__(self):
+        self._data = {}
+
+    def update(self, k, e):
+        data = self._data
+
+        if k in data:
+            data[k].append(e)
+        else:
+            data[k] = [e]
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        data = self._data
+
+        for k, e in zip(ks, es):
+            if k in data:
+                data[k].append(e)
+            else:
+                data[k] = [e]
+
+    def combine(self, other: '_ListState'):
+        data = self._data
+
+        for k, v in other._data.items():
+            if k in data:
+                data[k].extend(v)
+            else:
+                data[k] = v
+
+    def finish(self) -> dict:
+        return self._data
+
+
+class _SetState(_ListState):
+    def update(self, k, e):
+        data = self._data
+
+        if k in data:
+            data[k].add(e)
+        else:
+            data[k] = {e}
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        data = self._data
+
+        for k, e in zip(ks, es):
+            if k in data:
+                data[k].add(e)
+            else:
+                data[k] = {e}
+
+    def combine(self, other: '_SetState'):
+        data = self._data
+
+        for k, v in other._data.items():
+            if k in data:
+                data[k].update(v)
+            else:
+                data[k] = v
+
+
+class _CountState(_KeyedState):
+    def __init__(self):
+        self._counts = Counter()
+
+    def update(self, k, e):
+        self._counts[k] += 1
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        self._counts.update(ks)
+
+    def combine(self, other: '_CountState'):
+        self._counts.update(other._counts)
+
+    def finish(self) -> dict:
+        return dict(self._counts)
+
+
+class _SumState(_KeyedState):
+    def __init__(self):
+        self._sums = {}
+
+    def update(self, k, e):
+        self._sums[k] = self._sums.get(k, 0) + e
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        sums = self._sums
+        get = sums.get
+
+        for k, e in zip(ks, es):
+            sums[k] = get(k, 0) + e
+
+    def combine(self, other: '_SumState'):
+        self.update_many(tuple(other._sums), tuple(other._sums.values()))
+
+    def finish(self) -> dict:
+        return self._sums
+
+
+class _AveragingState(_KeyedState):
+    def __init__(self):
+        self._sums = _SumState()
+        self._counts = _CountState()
+
+    def update(self, k, e):
+        self._sums.update(k, e)
+        self._counts.update(k, e)
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        self._sums.update_many(ks, es)
+        self._counts.update_many(ks, es)
+
+    def combine(self, other: '_AveragingState'):
+        self._sums.combine(other._sums)
+        self._counts.combine(other._counts)
+
+    def finish(self) -> dict:
+        counts = self._counts.finish()
+        return {k: s / counts[k] for k, s in self._sums.finish().items()}
+
+
+class _ExtremeState(_KeyedState):
+    """
+    holds max (if "sign" is 1) or min (if "sign" is -1) element of each bucket.
+    """
+
+    def __init__(self, comp: BiFunction[X, X, int], sign: int):
+        self._comp = comp
+        self._sign = sign
+        self._data = {}
+
+    def update(self, k, e):
+        data = self._data
+        old = data.get(k, NIL)
+
+        if old is NIL or self._comp(e, old) * self._sign > 0:
+            data[k] = e
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        data, comp, sign = self._data, self._comp, self._sign
+        get = data.get
+
+        for k, e in zip(ks, es):
+            old = get(k, NIL)
+
+            if old is NIL or comp(e, old) * sign > 0:
+                data[k] = e
+
+    def combine(self, other: '_ExtremeState'):
+        self.update_many(tuple(other._data), tuple(other._data.values()))
+
+    def finish(self) -> dict:
+        return {k: Optional(v) for k, v in self._data.items()}
+
+
+class _ReduceState(_KeyedState):
+    def __init__(self, o, bi_func: BiFunction, partial_result: bool = False):
+        self._o = o
+        self._bi_func = bi_func
+        self._partial = partial_result  # see Reduce
+        self._data = {}
+
+    def update(self, k, e):
+        old = self._data.get(k, NIL if self._partial else self._o)
+        self._data[k] = e if old is NIL else self._bi_func(old, e)
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        data, bi_func = self._data, self._bi_func
+        o = NIL if self._partial else self._o
+        get = data.get
+
+        for k, e in zip(ks, es):
+            old = get(k, o)
+            data[k] = e if old is NIL else bi_func(old, e)
+
+    def combine(self, other: '_ReduceState'):
+        data, bi_func = self._data, self._bi_func
+
+        for k, v in other._data.items():
+            old = data.get(k, NIL)
+            data[k] = v if old is NIL else bi_func(old, v)
+
+    def finish(self) -> dict:
+        if not self._partial:
+            return {k: create_optional(v) for k, v in self._data.items()}
+
+        o, bi_func = self._o, self._bi_func
+        return {k: create_optional(_with_initial_point(o, v, bi_func)) for k, v in self._data.items()}
+
+
+class _MappingState(_KeyedState):
+    def __init__(self, func: Function, downstream: _KeyedState):
+        self._func = func
+        self._downstream = downstream
+
+    def update(self, k, e):
+        self._downstream.update(k, self._func(e))
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        self._downstream.update_many(ks, tuple(map(self._func, es)))
+
+    def combine(self, other: '_MappingState'):
+        self._downstream.combine(other._downstream)
+
+    def finish(self) -> dict:
+        return self._downstream.finish()
+
+
+class _ThenState(_KeyedState):
+    def __init__(self, downstream: _KeyedState, then: Function):
+        self._downstream = downstream
+        self._then = then
+
+    def update(self, k, e):
+        self._downstream.update(k, e)
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        self._downstream.update_many(ks, es)
+
+    def combine(self, other: '_ThenState'):
+        self._downstream.combine(other._downstream)
+
+    def finish(self) -> dict:
+        return {k: self._then(v) for k, v in self._downstream.finish().items()}
+
+
+class _AggregatingState(_KeyedState):
+    def __init__(self, agg: Dict[Any, _KeyedState]):
+        self._agg = agg
+
+    def update(self, k, e):
+        for state in self._agg.values():
+            state.update(k, e)
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        for state in self._agg.values():
+            state.update_many(ks, es)
+
+    def combine(self, other: '_AggregatingState'):
+        for name, state in self._agg.items():
+            state.combine(other._agg[name])
+
+    def finish(self) -> dict:
+        out = {}
+
+        for name, state in self._agg.items():
+            for k, v in state.finish().items():
+                out.setdefault(k, {})[name] = v
+
+        return out
+
+
+class _GroupingState(_KeyedState):
+    """
+    State of GroupingBy nested inside GroupingBy. Instead of creating a
+    dictionary for each outer bucket, downstream state is held using
+    composite keys (outer bucket, inner bucket).
+    """
+
+    def __init__(self, group_by: Function, downstream: _KeyedState):
+        self._group_by = group_by
+        self._downstream = downstream
+
+    def update(self, k, e):
+        self._downstream.update((k, self._group_by(e)), e)
+
+    def update_many(self, ks: Sequence, es: Sequence):
+        self._downstream.update_many(tuple(zip(ks, map(self._group_by, es))), es)
+
+    def combine(self, other: '_GroupingState'):
+        self._downstream.combine(other._downstream)
+
+    def finish(self) -> dict:
+        out = {}
+
+        for (k, inner_k), v in self._downstream.finish().items():
+            if k in out:
+                out[k][inner_k] = v
+            else:
+                out[k] = {inner_k: v}
+
+        return out
+
+
+def _keyed_state(collector: Collector) -> Union[_KeyedState, None]:
+    """
+    creates compact state equivalent to using "collector" for every bucket.
+    Only built-in collectors (not their subclasses) are considered.
+
+    :param collector:
+    :return: None if there is no compact state for "collector".
+    """
+
+    factory = _KEYED_STATE_FACTORY.get(type(collector))
+    return factory(collector) if factory is not None else None
+
+
+def _all_or_none(states: dict) -> Union[dict, None]:
+    return states if all(state is not None for state in states.values()) else None
+
+
+def _mapping_state(c: Mapping):
+    downstream = _keyed_state(c._downstream)
+    return _MappingState(c._func, downstream) if downstream is not None else None
+
+
+def _then_state(c: CollectAndThen):
+    downstream = _keyed_state(c._downstream)
+    return _ThenState(downstream, c._then) if downstream is not None else None
+
+
+def _aggregating_state(c: Aggregating):
+    agg = _all_or_none({name: _keyed_state(d) for name, d in c._agg.items()})
+    return _AggregatingState(agg) if agg is not None else None
+
+
+def _grouping_state(c: GroupingBy):
+    if c._spill is not None:
+        return None
+
+    downstream = _keyed_state(c._downstream)
+    return _GroupingState(c._group_by, downstream) if downstream is not None else None
+
+
+_KEYED_STATE_FACTORY: Dict[type, Callable[[Collector], Union[_KeyedState, None]]] = {
+    ToList: lambda c: _ListState(),
+    ToSet: lambda c: _SetState(),
+    Counting: lambda c: _CountState(),
+    Summing: lambda c: _SumState(),
+    Averaging: lambda c: _AveragingState(),
+    MaxBy: lambda c: _ExtremeState(c._comp, 1),
+    MinBy: lambda c: _ExtremeState(c._comp, -1),
+    Reduce: lambda c: _ReduceState(c._o, c._bi_func, c._partial),
+    Mapping: _mapping_state,
+    CollectAndThen: _then_state,
+    Aggregating: _aggregating_state,
+    GroupingBy: _grouping_state,
+}
+
 
 if __name__ == 'streamAPI.stream.TO.TerminalOperations':
     __all__ = get_functions_clazz(__name__, __file__)
@@ -1,5 +1,6 @@
 from streamAPI.stream import TO, decos
 from streamAPI.stream.exception import PipelineClosed
+from streamAPI.stream.join import *
 from streamAPI.stream.optional import EMPTY, Optional
 from streamAPI.stream.parallelStream import *
 from streamAPI.stream.stream import *
@@ -7,6 +8,7 @@ from streamAPI.stream.streamHelper import *
 
 del decos
 del exception
+del join
 del optional
 del parallelStream
 del stream
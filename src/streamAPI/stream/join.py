@@ -0,0 +1,319 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+# This module implements joining of two iterables on keys. These functions
+# are used by Stream.join and can be used directly on any iterable as well.
+
+from itertools import chain, groupby
+from operator import gt, lt
+from typing import Dict, Iterable, List, Tuple
+
+from streamAPI.utility.Types import Function, X, Y
+from streamAPI.utility.spill import PartitionedSpill
+from streamAPI.utility.utils import NIL, get_functions_clazz
+
+JOIN_TYPES = ('inner', 'left', 'outer')
+
+_END = (None, None)  # marks that there is no run left in merge_join.
+
+# partitions are re-partitioned at most this many times, after that a partition is
+# joined in memory (it happens only when a single key has more than "max_build" rows).
+_MAX_SPILL_DEPTH = 8
+
+
+def hash_join(left: Iterable[X], right: Iterable[Y],
+              left_key: Function, right_key: Function = None,
+              how: str = 'inner',
+              max_build: int = None,
+              partitions: int = 64) -> Iterable[Tuple[X, Y]]:
+    """
+    Joins "left" and "right" on keys made by "left_key" and "right_key".
+    Yields tuples (left element, right element).
+
+    Hash table is built on the smaller side. To find it without knowing
+    sizes, both sides are read alternately until one of them is exhausted,
+    so at most as many elements of the bigger side as the size of smaller
+    side are buffered. Then other side is streamed against the hash table.
+
+    If "max_build" is given and build side has more elements than that,
+    then both sides are hash partitioned into temporary files (elements must
+    be picklable) and partitions are joined one by one.
+
+    Join types:
+    1) inner: only matching pairs.
+    2) left: all elements of "left"; element not matching any right element
+             is paired with None.
+    3) outer: all elements of both sides; element without match is paired
+              with None.
+
+    Note that order of pairs is not guaranteed.
+
+    Example:
+        users = [(1, 'A'), (2, 'B')]
+        orders = [(1, 'pen'), (1, 'ink'), (3, 'cup')]
+
+        list(hash_join(users, orders, itemgetter(0)))
+        -> [((1, 'A'), (1, 'pen')), ((1, 'A'), (1, 'ink'))]
+
+        list(hash_join(users, orders, itemgetter(0), how='outer'))
+        -> [((1, 'A'), (1, 'pen')), ((1, 'A'), (1, 'ink')), ((2, 'B'), None), (None, (3, 'cup'))]
+
+    :param left:
+    :param right:
+    :param left_key: key of left elements.
+    :param right_key: key of right elements, if None then "left_key" is used.
+    :param how: one of 'inner', 'left' and 'outer'
+    :param max_build: maximum number of build side elements held in memory,
+                      None means no limit.
+    :param partitions: number of partitions used in case "max_build" is crossed.
+    :return:
+    """
+
+    if how not in JOIN_TYPES:
+        raise ValueError(f"'how' must be one of {JOIN_TYPES}, given: {how}")
+
+    right_key = right_key or left_key
+
+    build_left, left, right = _smaller_first(left, right, max_build)
+
+    keep_left = how in ('left', 'outer')
+    keep_right = how == 'outer'
+
+    if build_left:
+        yield from _hash_join(left, right, left_key, right_key, keep_left, keep_right,
+                              _as_is, max_build, partitions, 0)
+    else:
+        yield from _hash_join(right, left, right_key, left_key, keep_right, keep_left,
+                              _swapped, max_build, partitions, 0)
+
+
+def _as_is(b, p) -> tuple: return b, p
+
+
+def _swapped(b, p) -> tuple: return p, b
+
+
+def _smaller_first(left: Iterable[X], right: Iterable[Y], limit: int = None) -> Tuple[bool, Iterable[X], Iterable[Y]]:
+    """
+    finds whether "left" has fewer elements than "right" by reading them
+    alternately. Read elements are chained back to the iterables.
+
+    If both sides have more than "limit" elements, then "right" is
+    considered smaller.
+
+    :param left:
+    :param right:
+    :param limit:
+    :return: (True if left is smaller, left, right)
+    """
+
+    left, right = iter(left), iter(right)
+    left_buffer, right_buffer = [], []
+    build_left = False
+
+    while limit is None or len(left_buffer) <= limit:
+        for e in right:
+            right_buffer.append(e)
+            break
+        else:
+            break
+
+        for e in left:
+            left_buffer.append(e)
+            break
+        else:
+            build_left = True
+            break
+
+    return build_left, chain(left_buffer, left), chain(right_buffer, right)
+
+
+def _hash_join(build: Iterable, probe: Iterable,
+               build_key: Function, probe_key: Function,
+               keep_build: bool, keep_probe: bool,
+               pair, max_build: int, partitions: int, depth: int) -> Iterable[tuple]:
+    table: Dict[object, List] = {}
+    build = iter(build)
+    size = 0
+
+    for b in build:
+        k = build_key(b)
+
+        if k in table:
+            table[k].append(b)
+        else:
+            table[k] = [b]
+
+        size += 1
+
+        if max_build is not None and size > max_build and depth < _MAX_SPILL_DEPTH:
+            break
+    else:
+        yield from _probe(table, probe, probe_key, keep_build, keep_probe, pair)
+        return
+
+    # build side is too large, so both sides are partitioned.
+    build_spill = PartitionedSpill(partitions, salt=depth)
+    probe_spill = PartitionedSpill(partitions, salt=depth)
+
+    for k, bs in table.items():
+        for b in bs:
+            build_spill.append(k, b)
+
+    del table
+
+    for b in build:
+        build_spill.append(build_key(b), b)
+
+    for p in probe:
+        probe_spill.append(probe_key(p), p)
+
+    for idx in range(partitions):
+        build_part, probe_part = build_spill[idx], probe_spill[idx]
+
+        if len(build_part) or len(probe_part):
+            yield from _hash_join(build_part, probe_part, build_key, probe_key,
+                                  keep_build, keep_probe, pair, max_build, partitions, depth + 1)
+
+        build_part.close()
+        probe_part.close()
+
+
+def _probe(table: Dict[object, List], probe: Iterable, probe_key: Function,
+           keep_build: bool, keep_probe: bool, pair) -> Iterable[tuple]:
+    matched = set()
+
+    for p in probe:
+        k = probe_key(p)
+        bs = table.get(k)
+
+        if bs is not None:
+            if keep_build:
+                matched.add(k)
+
+            for b in bs:
+                yield pair(b, p)
+        elif keep_probe:
+            yield pair(None, p)
+
+    if keep_build:
+        for k, bs in table.items():
+            if k not in matched:
+                for b in bs:
+                    yield pair(b, None)
+
+
+def merge_join(left: Iterable[X], right: Iterable[Y],
+               left_key: Function, right_key: Function = None,
+               how: str = 'inner',
+               reverse: bool = False,
+               validate: bool = False) -> Iterable[Tuple[X, Y]]:
+    """
+    Joins "left" and "right", both sorted on their keys, by advancing them
+    in lockstep. Only current run of right elements having equal key is held
+    in memory. Yields tuples (left element, right element) in order of keys.
+
+    If "validate" is True then ValueError is raised as soon as a key is found
+    out of order; otherwise unsorted input produces incorrect output.
+
+    For join types, see "hash_join".
+
+    Example:
+        users = [(1, 'A'), (2, 'B'), (4, 'D')]
+        orders = [(1, 'pen'), (1, 'ink'), (3, 'cup'), (4, 'mug')]
+
+        list(merge_join(users, orders, itemgetter(0)))
+        -> [((1, 'A'), (1, 'pen')), ((1, 'A'), (1, 'ink')), ((4, 'D'), (4, 'mug'))]
+
+        list(merge_join(users, orders, itemgetter(0), how='outer'))
+        -> [((1, 'A'), (1, 'pen')), ((1, 'A'), (1, 'ink')), ((2, 'B'), None),
+            (None, (3, 'cup')), ((4, 'D'), (4, 'mug'))]
+
+    :param left: sorted on "left_key"
+    :param right: sorted on "right_key"
+    :param left_key:
+    :param right_key: if None then "left_key" is used.
+    :param how: one of 'inner', 'left' and 'outer'
+    :param reverse: True if inputs are sorted in descending order.
+    :param validate: if True, then order of keys is checked.
+    :return:
+    """
+
+    if how not in JOIN_TYPES:
+        raise ValueError(f"'how' must be one of {JOIN_TYPES}, given: {how}")
+
+    right_key = right_key or left_key
+
+    keep_left = how in ('left', 'outer')
+    keep_right = how == 'outer'
+
+    before = gt if reverse else lt
+
+    left_runs = groupby(left, left_key)
+    right_runs = groupby(right, right_key)
+
+    if validate:
+        left_runs = _validated(left_runs, before, 'left')
+        right_runs = _validated(right_runs, before, 'right')
+
+    lk, l_run = next(left_runs, _END)
+    rk, r_run = next(right_runs, _END)
+
+    while l_run is not None and r_run is not None:
+        if before(lk, rk):
+            if keep_left:
+                yield from ((l, None) for l in l_run)
+
+            lk, l_run = next(left_runs, _END)
+        elif before(rk, lk):
+            if keep_right:
+                yield from ((None, r) for r in r_run)
+
+            rk, r_run = next(right_runs, _END)
+        else:
+            r_run = tuple(r_run)
+
+            for l in l_run:
+                for r in r_run:
+                    yield l, r
+
+            lk, l_run = next(left_runs, _END)
+            rk, r_run = next(right_runs, _END)
+
+    if keep_left:
+        while l_run is not None:
+            yield from ((l, None) for l in l_run)
+            lk, l_run = next(left_runs, _END)
+
+    if keep_right:
+        while r_run is not None:
+            yield from ((None, r) for r in r_run)
+            rk, r_run = next(right_runs, _END)
+
+
+def _validated(runs: Iterable[Tuple[object, Iterable]], before, side: str) -> Iterable[Tuple[object, Iterable]]:
+    """
+    checks that keys of runs made by "groupby" are strictly increasing
+    according to "before". Since equal consecutive keys make a single run,
+    a key not coming after the previous key is out of order.
+
+    :param runs:
+    :param before:
+    :param side:
+    :return:
+    """
+
+    previous = NIL
+
+    for k, run in runs:
+        if previous is not NIL and not before(previous, k):
+            raise ValueError(f'{side} side is not sorted: key {k!r} comes after {previous!r}.')
+
+        previous = k
+        yield k, run
+
+
+if __name__ == 'streamAPI.stream.join':
+    __all__ = get_functions_clazz(__name__, __file__) + ('JOIN_TYPES',)
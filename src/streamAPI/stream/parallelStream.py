@@ -6,15 +6,93 @@ email: shivkj001@gmail.com
 from collections import deque
 from concurrent.futures import (Executor, Future, ProcessPoolExecutor as PPE,
                                 ThreadPoolExecutor as TPE, as_completed)
-from functools import partial, wraps
+from functools import partial, reduce, wraps
 from operator import itemgetter
 from os import cpu_count
-from typing import Deque, Iterable, Tuple
+from threading import RLock
+from typing import Deque, Dict, Hashable, Iterable, Sequence, Tuple, Union
 
+from streamAPI.stream.TO.TerminalOperations import Collector, Reduce
 from streamAPI.stream.decos import check_pipeline, close_pipeline
+from streamAPI.stream.optional import Optional
 from streamAPI.stream.stream import Stream
-from streamAPI.utility.Types import Consumer, Filter, Function, T, X
-from streamAPI.utility.utils import get_functions_clazz
+from streamAPI.utility.Types import BiFunction, Consumer, Filter, Function, T, X
+from streamAPI.utility.cache import CacheSpec, CacheStats, DiskCacheSpec
+from streamAPI.utility.utils import NIL, divide_in_chunk, get_functions_clazz
+
+
+class _CachedJobs:
+    """
+    Submits a job for applying "func" on an element only if its result is
+    neither cached nor being computed for an earlier element having same
+    key; otherwise a future holding (or waiting for) that result is made
+    without going to executor.
+    """
+
+    def __init__(self, submit, func: Function[T, X], spec: CacheSpec):
+        """
+        :param submit: submits job to executor, takes function and element.
+        :param func:
+        :param spec:
+        """
+
+        self._submit = submit
+        self._func = func
+        self._key = spec.key
+        self._cache = spec.create()
+
+        self._running: Dict[Hashable, Future] = {}
+        self._lock = RLock()  # results are cached by callbacks running in other threads.
+
+    def __call__(self, g: T) -> Future:
+        k = self._key(g)
+
+        with self._lock:
+            running = self._running.get(k)
+
+            if running is not None:
+                self._cache.hits += 1
+
+                f = Future()
+                running.add_done_callback(partial(_CachedJobs._copy, f))
+                return f
+
+            value = self._cache.get(k)
+
+            if value is not NIL:
+                f = Future()
+                f.set_result(value)
+                return f
+
+            job = self._submit(self._func, g)
+            self._running[k] = job
+            job.add_done_callback(partial(self._done, k))
+
+            return job
+
+    def _done(self, k: Hashable, job: Future):
+        with self._lock:
+            self._running.pop(k, None)
+
+            if not job.cancelled() and job.exception() is None:
+                self._cache.put(k, job.result())
+
+    @staticmethod
+    def _copy(target: Future, job: Future):
+        if job.cancelled():
+            target.cancel()
+        elif job.exception() is not None:
+            target.set_exception(job.exception())
+        else:
+            target.set_result(job.result())
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return self._cache.stats()
+
+    def close(self):
+        with self._lock:
+            self._cache.close()
 
 
 class Exec(Stream[T]):
@@ -59,7 +137,8 @@ class Exec(Stream[T]):
 
         return worker if multiprocessing else 5 * worker
 
-    def _parallel_processor(self: 'ParallelStream[T]', func, timeout=None, batch_size=None) -> Stream[T]:
+    def _parallel_processor(self: 'ParallelStream[T]', func, timeout=None, batch_size=None,
+                            cache: CacheSpec = None) -> Stream[T]:
         """
         processes data points concurrently. Elements are processed in batches of size "batch_size".
 
@@ -68,6 +147,7 @@ class Exec(Stream[T]):
         :param timeout: time to wait for task to be done, if None then there is no
                         limit on execution time.
         :param batch_size: If it is None then number of worker is used.
+        :param cache: if given, results of "func" are cached in this process.
         :return:
         """
 
@@ -75,8 +155,14 @@ class Exec(Stream[T]):
 
         assert batch_size > 0, 'Batch size must be positive.'
 
+        if cache is None:
+            submit = partial(self._submit_job, func)
+        else:
+            submit = _CachedJobs(self._submit_job, func, cache)
+            self._caches.append(submit)
+
         stream = (Stream(iter(self._pointer))
-                  .map(partial(self._submit_job, func))
+                  .map(submit)
                   .peek(self._registered_jobs.append)
                   .batch(batch_size)
                   .map(as_completed)
@@ -87,7 +173,39 @@ class Exec(Stream[T]):
         else:
             result_extractor = Future.result
 
-        return stream.map(result_extractor)
+        stream = stream.map(result_extractor)
+
+        if isinstance(cache, DiskCacheSpec):
+            stream = Stream(Stream._yield_closing(stream, submit))
+
+        return stream
+
+    def _ordered_processor(self, func, itr: Iterable, timeout=None) -> Iterable:
+        """
+        applies "func" on elements of "itr" concurrently and yields results in the
+        order of elements. At most twice the number of worker jobs are submitted
+        ahead of the result being yielded.
+
+        :param func:
+        :param itr:
+        :param timeout: time to wait for task to be done, if None then there is no
+                        limit on execution time.
+        :return:
+        """
+
+        pending: Deque[Future] = deque()
+        in_flight = 2 * self._worker
+
+        for g in itr:
+            job = self._submit_job(func, g)
+            self._registered_jobs.append(job)
+            pending.append(job)
+
+            if len(pending) >= in_flight:
+                yield pending.popleft().result(timeout=timeout)
+
+        while pending:
+            yield pending.popleft().result(timeout=timeout)
 
     def _submit_job(self, func, g) -> Future:
         """
@@ -177,18 +295,24 @@ class ParallelStream(Exec[T]):
                 .flat_map())
 
     @check_pipeline
-    def map_concurrent(self, func: Function[T, X], timeout=None, batch_size=None) -> 'ParallelStream[T]':
+    def map_concurrent(self, func: Function[T, X], timeout=None, batch_size=None,
+                       cache: CacheSpec = None) -> 'ParallelStream[T]':
         """
         maps elements concurrently. Elements are processed in batches of size "batch_size".
 
+        If "cache" is given, then results of "func" are memoized in this process
+        (see "Stream.map"); element whose result is cached, or is being computed
+        for an earlier element having same key, is not sent to executor.
+
         :param func:
         :param timeout: time to wait for task to be done, if None then there is no
                         limit on execution time.
         :param batch_size: If it is None then number of worker is used.
+        :param cache: describes memoization of "func", if None then results are not cached.
         :return:
         """
 
-        self._pointer = self._parallel_processor(func, timeout=timeout, batch_size=batch_size)
+        self._pointer = self._parallel_processor(func, timeout=timeout, batch_size=batch_size, cache=cache)
         return self
 
     @check_pipeline
@@ -211,6 +335,82 @@ class ParallelStream(Exec[T]):
                          .map(itemgetter(1)))
         return self
 
+    @staticmethod
+    def _reduce_batch(bi_func: BiFunction[X, X, X], gs: Sequence[X]) -> X:
+        return reduce(bi_func, gs)
+
+    @staticmethod
+    def _scan_batch(bi_func: BiFunction[X, X, X], job: tuple) -> Sequence[X]:
+        # job is (chunk,) or (chunk, carry); NIL can not be sent as it is not same after unpickling.
+        return Stream._scan(job[0], bi_func, *job[1:])
+
+    @check_pipeline
+    def accumulate_concurrent(self, bi_func: BiFunction[X, X, X],
+                              dispatch_size: int = 1024, timeout=None) -> 'ParallelStream[X]':
+        """
+        accumulates stream elements like "accumulate", but batches of
+        "dispatch_size" elements are scanned by workers. So "bi_func" must
+        be associative.
+
+        It is done in two passes over each batch:
+        1) workers reduce batches to their totals,
+        2) this process computes carry of each batch (accumulated value of
+           all previous batches) from these totals and workers scan batches
+           starting with their carry.
+
+        So "bi_func" is called about twice per element, which pays off only
+        if "bi_func" is costly or in case of multiprocessing if batches are
+        scanned by numpy (see "accumulate" with "block"). Order of elements
+        is preserved.
+
+        Example:
+            import operator as op
+
+            ParallelStream(range(10)).accumulate_concurrent(op.add, dispatch_size=4).collect(ToList())
+            -> [0, 1, 3, 6, 10, 15, 21, 28, 36, 45]
+
+        :param bi_func:
+        :param dispatch_size: number of stream elements sent to a worker in one go.
+        :param timeout: time to wait for task to be done, if None then there is no
+                        limit on execution time.
+        :return:
+        """
+
+        assert dispatch_size > 0, 'dispatch size must be positive.'
+
+        chunks: Deque[Sequence[X]] = deque()  # chunks whose totals are yet to be used.
+
+        totals = self._ordered_processor(partial(ParallelStream._reduce_batch, bi_func),
+                                         Stream(divide_in_chunk(self._pointer, dispatch_size)).peek(chunks.append),
+                                         timeout=timeout)
+
+        scanned = self._ordered_processor(partial(ParallelStream._scan_batch, bi_func),
+                                          ParallelStream._carried(totals, chunks, bi_func),
+                                          timeout=timeout)
+
+        self._pointer = Stream(scanned).flat_map()
+        return self
+
+    @staticmethod
+    def _carried(totals: Iterable[X], chunks: Deque[Sequence[X]],
+                 bi_func: BiFunction[X, X, X]) -> Iterable[tuple]:
+        """
+        pairs each chunk with accumulated value of all chunks before it.
+
+        :param totals: reduced value of chunks in order.
+        :param chunks: chunks in order; a chunk is removed when its total is received.
+        :param bi_func:
+        :return: (chunk, carry) or (chunk,) for first chunk.
+        """
+
+        carry = NIL
+
+        for total in totals:
+            chunk = chunks.popleft()
+            yield (chunk,) if carry is NIL else (chunk, carry)
+
+            carry = total if carry is NIL else bi_func(carry, total)
+
     # terminal operation will trigger cancelling of submitted unnecessary jobs.
     count = Exec._stop_all_jobs(Stream.count)
     min = Exec._stop_all_jobs(Stream.min)
@@ -225,6 +425,127 @@ class ParallelStream(Exec[T]):
     collect = Exec._stop_all_jobs(Stream.collect)
     __iter__ = Exec._stop_all_jobs(Stream.__iter__)
 
+    @staticmethod
+    def _collect_batch(collector: Collector, gs: Iterable[T]) -> Collector:
+        """
+        collects data points "gs" using a new partial result supplied by "collector".
+
+        :param collector:
+        :param gs:
+        :return: partial result
+        """
+
+        partial_result = collector.supply_partial()
+        partial_result.consume_many(gs)
+
+        return partial_result
+
+    @staticmethod
+    def _tree_combine(partial_results: Iterable[Collector]) -> Union[Collector, None]:
+        """
+        combines partial results (given in order) pairwise like a binary tree.
+        At any moment at most log2(n) partial results are held.
+
+        :param partial_results:
+        :return: None if there is no partial result.
+        """
+
+        stack: Deque[Tuple[int, Collector]] = deque()  # (level, partial result)
+
+        for c in partial_results:
+            level = 0
+
+            while stack and stack[-1][0] == level:
+                c = stack.pop()[1].combine(c)
+                level += 1
+
+            stack.append((level, c))
+
+        if not stack:
+            return None
+
+        c = stack.pop()[1]
+
+        while stack:
+            c = stack.pop()[1].combine(c)
+
+        return c
+
+    @Exec._stop_all_jobs
+    @close_pipeline
+    @check_pipeline
+    def collect_concurrent(self, collector: Collector, dispatch_size: int = 1024, timeout=None):
+        """
+        This operation is one of the terminal operations.
+
+        Unlike "collect", where each element is consumed by "collector" in this
+        process, here batches of "dispatch_size" elements are collected by workers
+        into partial results (supplied by "collector.supply_partial"), which are then
+        merged using "Collector.combine" pairwise like a binary tree.
+        So "collector" must support "combine" (see "Collector.combinable"; collectors
+        holding buckets in files, i.e. having "max_buckets", do not) and, in case of
+        multiprocessing, "collector" and its partial results must be picklable.
+
+        Example:
+            from operator import itemgetter
+            from streamAPI.stream.TO import Counting, GroupingBy
+
+            (ParallelStream(read_logs(), multiprocessing=False)
+             .collect_concurrent(GroupingBy(itemgetter('session'), Counting())))
+
+        :param collector:
+        :param dispatch_size: number of stream elements sent to a worker in one go.
+        :param timeout: time to wait for task to be done, if None then there is no
+                        limit on execution time.
+        :return:
+        """
+
+        assert dispatch_size > 0, 'dispatch size must be positive.'
+
+        if not collector.combinable():
+            raise ValueError(f'{collector.__class__.__name__} does not support combine, '
+                             f'so it can not be used concurrently; use "collect" instead.')
+
+        partial_results = self._ordered_processor(partial(ParallelStream._collect_batch, collector),
+                                                  divide_in_chunk(self._pointer, dispatch_size),
+                                                  timeout=timeout)
+
+        c = ParallelStream._tree_combine(partial_results)
+
+        return (c if c is not None else collector.supply()).finish()
+
+    def reduce_concurrent(self, initial_point: X = NIL, *, bi_func: BiFunction[X, X, X],
+                          dispatch_size: int = 1024, timeout=None) -> Optional[X]:
+        """
+        This operation is one of the terminal operations.
+
+        Reduces elements like "reduce", but batches of "dispatch_size" elements
+        are reduced by workers and their results are reduced in this process.
+        So "bi_func" must be associative. Initial point, if given, is used only
+        once.
+
+        Example:
+            import operator as op
+
+            ParallelStream(range(1, 6)).reduce_concurrent(1, bi_func=op.mul) -> Optional[120]
+
+        :param initial_point: defaults to NIL
+        :param bi_func: reduction function
+        :param dispatch_size: number of stream elements sent to a worker in one go.
+        :param timeout: time to wait for task to be done, if None then there is no
+                        limit on execution time.
+        :return:
+        """
+
+        out = self.collect_concurrent(Reduce(bi_func=bi_func),
+                                      dispatch_size=dispatch_size,
+                                      timeout=timeout)
+
+        if initial_point is NIL:
+            return out
+
+        return Optional(bi_func(initial_point, out.get()) if out.present() else initial_point)
+
     @Exec._stop_all_jobs
     @close_pipeline
     @check_pipeline
@@ -3,17 +3,34 @@ author: Shiv
 email: shivkj001@gmail.com
 """
 
+from array import array
 from functools import reduce, wraps
+from heapq import merge
 from itertools import (accumulate, chain, cycle, dropwhile, filterfalse, islice, takewhile,
                        zip_longest)
-from typing import Any, Generic, Iterable, Tuple, Union
+from math import log
+from operator import add, mul
+from random import Random
+from typing import Any, Generic, Iterable, List, Sequence, Tuple, Union
 
 from streamAPI.stream.TO.TerminalOperations import Collector
 from streamAPI.stream.decos import check_pipeline, close_pipeline
+from streamAPI.stream.join import hash_join, merge_join
 from streamAPI.stream.optional import EMPTY, Optional
-from streamAPI.stream.streamHelper import ChainedCondition, Closable, Supplier
+from streamAPI.stream.streamHelper import ChainedCondition, Closable, Supplier, _Prefetch, _Stage, _Tee
 from streamAPI.utility.Types import BiFunction, Callable, Consumer, Filter, Function, X, Y
-from streamAPI.utility.utils import NIL, divide_in_chunk, get_chunk, get_functions_clazz, identity
+from streamAPI.utility.cache import CacheSpec, CacheStats, DiskCacheSpec
+from streamAPI.utility.intset import Bitmap, SortedIntSet
+from streamAPI.utility.sketch import ScalableBloomFilter
+from streamAPI.utility.spill import SpillFile
+from streamAPI.utility.state import StateStore
+from streamAPI.utility.utils import (NIL, as_random, divide_in_chunk, get_chunk, get_functions_clazz,
+                                     identity, optional_import)
+
+_FAN_IN = 64  # number of sorted runs merged at once while sorting with "max_in_memory".
+
+# associative functions whose prefix scan is computed by numpy ufunc of given name.
+_VECTOR_SCANS = {add: 'add', mul: 'multiply', max: 'maximum', min: 'minimum'}
 
 
 class Stream(Closable, Generic[X]):
@@ -124,6 +141,7 @@ class Stream(Closable, Generic[X]):
         super().__init__()
 
         self._pointer = iter(data)
+        self._caches: List = []  # memoized stages, in order; each has "stats" method.
 
     @classmethod
     def from_supplier(cls, func: Callable[[], X]) -> 'Stream[X]':
@@ -138,22 +156,242 @@ class Stream(Closable, Generic[X]):
 
         return cls(Supplier(func))
 
+    @classmethod
+    def merge_sorted(cls, *itrs: Iterable[X], key=None, reverse: bool = False,
+                     fan_in: int = None) -> 'Stream[X]':
+        """
+        Lazily merges already sorted iterables (or Streams) into a sorted stream
+        using a heap, so it takes O(N log k) time for k iterables having N
+        elements in total; nothing is materialized.
+
+        If "fan_in" is given and there are more iterables than that, then groups
+        of "fan_in" iterables are first merged into temporary files (elements
+        must be picklable), so that at most "fan_in" iterables are read at once.
+
+        Example:
+            Stream.merge_sorted([1, 4, 7], [2, 5], range(3, 10, 3)).collect(ToList())
+            -> [1, 2, 3, 4, 5, 6, 7, 9]
+
+        :param itrs: iterables sorted on "key" (in descending order if "reverse" is True)
+        :param key:
+        :param reverse:
+        :param fan_in: maximum number of iterables read at once, None means no limit.
+        :return: a new Stream class object.
+        """
+
+        return cls(Stream._yield_merged(itrs, key, reverse, fan_in))
+
+    @classmethod
+    def merge_sorted_files(cls, files: Iterable[str], reader: Function[str, Iterable[X]],
+                           key=None, reverse: bool = False, fan_in: int = 64) -> 'Stream[X]':
+        """
+        Merges sorted files (for example, produced by sharded jobs) into a
+        sorted stream. "reader" creates iterable of elements from file name;
+        it should be lazy (a generator) so that a file is opened only once
+        its elements are required.
+
+        At most "fan_in" files are read at once; if there are more files, then
+        groups of "fan_in" files are first merged into temporary files.
+
+        Example:
+            from streamAPI.utility import csv_itr
+
+            Stream.merge_sorted_files(shard_files, csv_itr, key=itemgetter('id'))
+
+        :param files:
+        :param reader: creates iterable of elements from a file.
+        :param key:
+        :param reverse:
+        :param fan_in: maximum number of files read at once, defaults to 64.
+        :return: a new Stream class object.
+        """
+
+        return cls.merge_sorted(*map(reader, files), key=key, reverse=reverse, fan_in=fan_in)
+
+    @staticmethod
+    def _yield_merged(itrs: Sequence[Iterable[X]], key, reverse: bool, fan_in: int = None) -> Iterable[X]:
+        """
+        Creates a generator merging sorted iterables. If there are more than
+        "fan_in" iterables, then groups of them are merged into SpillFiles
+        repeatedly until at most "fan_in" iterables are left.
+
+        :param itrs:
+        :param key:
+        :param reverse:
+        :param fan_in:
+        :return:
+        """
+
+        assert fan_in is None or fan_in > 1, 'fan_in must be greater than 1.'
+
+        itrs = list(itrs)
+
+        while fan_in is not None and len(itrs) > fan_in:
+            runs = []
+
+            for idx in range(0, len(itrs), fan_in):
+                group = itrs[idx:idx + fan_in]
+
+                run = SpillFile()
+                run.extend(merge(*group, key=key, reverse=reverse))
+                runs.append(run)
+
+                for g in group:
+                    if isinstance(g, SpillFile):
+                        g.close()
+
+            itrs = runs
+
+        yield from merge(*itrs, key=key, reverse=reverse)
+
     @check_pipeline
-    def map(self, func: Function[X, Y]) -> 'Stream[Y]':
+    def map(self, func: Function[X, Y], cache: CacheSpec = None) -> 'Stream[Y]':
         """
         maps elements of stream and produces stream of mapped element.
 
+        If "cache" is given, then results of "func" are memoized (in a cache
+        owned by this stage) as described by "cache"; so "func" must be pure.
+        Hit, miss and eviction counts are found using "cache_stats".
+
         Example:
             stream = Stream(range(5)).map(lambda x: 2*x)
             print(list(stream)) # prints [0, 2, 4, 6, 8]
 
+            stream = Stream([3, 1, 3, 3]).map(lambda x: 2*x, cache=CacheSpec(maxsize=100))
+            print(list(stream)) # prints [6, 2, 6, 6]
+            stream.cache_stats() -> (CacheStats(hits=2, misses=2, evictions=0, size=2),)
+
         :param func:
+        :param cache: describes memoization of "func", if None then results are not cached.
         :return: Stream itself
         """
 
+        if cache is not None:
+            func = cache.memoize(func)
+            self._caches.append(func)
+
         self._pointer = map(func, self._pointer)
+
+        if isinstance(cache, DiskCacheSpec):
+            self._pointer = Stream._yield_closing(self._pointer, func.cache)
+
         return self
 
+    @staticmethod
+    def _yield_closing(itr: Iterable[X], resource) -> Iterable[X]:
+        try:
+            yield from itr
+        finally:
+            resource.close()
+
+    @check_pipeline
+    def cached_map(self, func: Function[X, Y], store: str, version: str = '',
+                   key: Function[X, Any] = None, max_bytes: int = None) -> 'Stream[Y]':
+        """
+        maps elements like "map", but results of "func" are persisted in sqlite
+        file "store" against fingerprint of element (or of "key" of element)
+        and "version". So a rerun on mostly unchanged input calls "func" only
+        for new elements. "func" must be pure and its results picklable.
+
+        Changing "version" (when "func" changes) ignores results of other
+        versions; they are removed by "DiskCache.compact". If "max_bytes" is
+        given, least recently used results are evicted once stored results
+        take more than "max_bytes" bytes.
+
+        Example:
+            (Stream(read_rows())
+             .cached_map(enrich, store='enrich.db', version='v3', key=itemgetter('id'))
+             .for_each(write))
+
+        For concurrent mapping, see "ParallelStream.map_concurrent" with
+        "cache=DiskCacheSpec(...)".
+
+        :param func:
+        :param store: path of sqlite file.
+        :param version: version of "func".
+        :param key: makes cache key of an element, by default element itself is the key.
+        :param max_bytes: maximum bytes taken by stored results, None means no limit.
+        :return: Stream itself
+        """
+
+        return self.map(func, cache=DiskCacheSpec(store, version=version, key=key, max_bytes=max_bytes))
+
+    @check_pipeline
+    def map_with_state(self, key: Function[X, Any], fn: Callable[[Any, X], Tuple[Any, Y]],
+                       ttl: float = None, max_keys: int = None, path: str = None,
+                       store: StateStore = None) -> 'Stream[Y]':
+        """
+        maps elements using state kept per key. For each element "e",
+        "fn(state, e)" returns tuple (new state, output) where "state" is
+        state of "key(e)" (None if key is new or its state has expired);
+        output becomes stream element and new state is stored against "key(e)"
+        (if new state is None, then state of key is removed).
+
+        State is held in a StateStore: state expires if its key is not seen for
+        "ttl" seconds and at most "max_keys" states are held in memory; least
+        recently used states are dropped or, if "path" (a sqlite file) is
+        given, spilled to it. With "path", states are written to it once
+        stream is exhausted (or garbage collected), so a later run continues
+        with them.
+
+        Example:
+            def running_total(total, e):
+                total = (total or 0) + e[1]
+                return total, (e[0], total)
+
+            Stream([('a', 1), ('b', 5), ('a', 2)]).map_with_state(itemgetter(0), running_total).collect(ToList())
+            -> [('a', 1), ('b', 5), ('a', 3)]
+
+            # de-duplication of events seen in last hour.
+            (Stream(events)
+             .map_with_state(itemgetter('id'), lambda seen, e: (True, None if seen else e), ttl=3600)
+             .filter(lambda e: e is not None))
+
+        :param key: makes key of an element.
+        :param fn: takes state and element and returns new state and output.
+        :param ttl: seconds after last access when state expires, None means never.
+        :param max_keys: maximum number of states held in memory, None means no limit.
+        :param path: sqlite file in which states are spilled and persisted.
+        :param store: StateStore to be used instead of creating one from "ttl", "max_keys"
+                      and "path"; it is not closed by this operation.
+        :return: Stream itself
+        """
+
+        if store is None:
+            store = StateStore(ttl=ttl, max_keys=max_keys, path=path)
+            self._pointer = Stream._yield_closing(Stream._yield_with_state(self._pointer, key, fn, store), store)
+        else:
+            assert ttl is None and max_keys is None and path is None, \
+                'either "store" or "ttl", "max_keys" and "path" can be given.'
+
+            self._pointer = Stream._yield_with_state(self._pointer, key, fn, store)
+
+        return self
+
+    @staticmethod
+    def _yield_with_state(itr: Iterable[X], key: Function[X, Any], fn: Callable[[Any, X], Tuple[Any, Y]],
+                          store: StateStore) -> Iterable[Y]:
+        for e in itr:
+            k = key(e)
+            state, out = fn(store.get(k), e)
+
+            if state is None:
+                store.delete(k)
+            else:
+                store.put(k, state)
+
+            yield out
+
+    def cache_stats(self) -> Tuple[CacheStats, ...]:
+        """
+        Statistics of caches of memoized stages (see "cache" parameter of "map"
+        and "conditional"), in order of stages.
+
+        :return:
+        """
+
+        return tuple(c.stats() for c in self._caches)
+
     @check_pipeline
     def filter(self, predicate: Filter[X]) -> 'Stream[X]':
         """
@@ -193,7 +431,127 @@ class Stream(Closable, Generic[X]):
         return self
 
     @check_pipeline
-    def sort(self, key=None, reverse: bool = False) -> 'Stream[X]':
+    def filter_in(self, other: Iterable[Y], key: Function[X, Any] = None,
+                  other_key: Function[Y, Any] = None,
+                  exact: bool = True, fp_rate: float = 0.01) -> 'Stream[X]':
+        """
+        Keeps only those elements whose key is present among keys of "other"
+        elements (semi join). It is like filter(lambda e: key(e) in keys_of_other)
+        but keys of "other" are held in a compact membership structure:
+
+        1) if "exact" is True and all keys are (64 bit) integers, then a
+           sorted array of integers (8 bytes per key) searched by bisect,
+        2) if "exact" is True otherwise, then a hash set,
+        3) if "exact" is False, then a Bloom filter having false positive rate
+           "fp_rate"; so a few elements whose keys are not present may pass.
+
+        "other" is consumed when the first element of stream is required.
+
+        Example:
+            Stream(range(10)).filter_in([1, 3, 5, 30]).collect(ToList()) -> [1, 3, 5]
+
+            Stream(events).filter_in(active_users, key=itemgetter('user_id'),
+                                     other_key=itemgetter('id'), exact=False)
+
+        :param other:
+        :param key: key of stream element, if None then element itself.
+        :param other_key: key of "other" element, if None then element itself.
+        :param exact: if False, then a Bloom filter is used.
+        :param fp_rate: false positive rate of Bloom filter.
+        :return: Stream itself
+        """
+
+        self._pointer = Stream._yield_filter_in(self._pointer, other, key, other_key,
+                                                exact, fp_rate, keep=True)
+        return self
+
+    @check_pipeline
+    def filter_not_in(self, other: Iterable[Y], key: Function[X, Any] = None,
+                      other_key: Function[Y, Any] = None,
+                      exact: bool = True, fp_rate: float = 0.01) -> 'Stream[X]':
+        """
+        Keeps only those elements whose key is not present among keys of "other"
+        elements (anti join). See "filter_in" for detail; note that in case of
+        "exact" being False, a few elements whose keys are not present may be
+        dropped because of false positives of Bloom filter.
+
+        Example:
+            Stream(range(10)).filter_not_in([1, 3, 5, 30]).collect(ToList())
+            -> [0, 2, 4, 6, 7, 8, 9]
+
+        :param other:
+        :param key: key of stream element, if None then element itself.
+        :param other_key: key of "other" element, if None then element itself.
+        :param exact: if False, then a Bloom filter is used.
+        :param fp_rate: false positive rate of Bloom filter.
+        :return: Stream itself
+        """
+
+        self._pointer = Stream._yield_filter_in(self._pointer, other, key, other_key,
+                                                exact, fp_rate, keep=False)
+        return self
+
+    @staticmethod
+    def _yield_filter_in(itr: Iterable[X], other: Iterable[Y], key, other_key,
+                         exact: bool, fp_rate: float, keep: bool) -> Iterable[X]:
+        """
+        Creates generator filtering elements on membership of their keys.
+        Membership structure is built on first call to generator.
+
+        :param itr:
+        :param other:
+        :param key:
+        :param other_key:
+        :param exact:
+        :param fp_rate:
+        :param keep: if True, then elements whose keys are present are kept
+                     otherwise they are dropped.
+        :return:
+        """
+
+        keys = other if other_key is None else map(other_key, other)
+        members = Stream._membership(keys, exact, fp_rate)
+
+        predicate = members.__contains__
+
+        if key is not None:
+            def predicate(e, _contains=predicate): return _contains(key(e))
+
+        yield from (filter if keep else filterfalse)(predicate, itr)
+
+    @staticmethod
+    def _membership(keys: Iterable, exact: bool, fp_rate: float):
+        """
+        creates compact membership structure from "keys".
+
+        :param keys:
+        :param exact:
+        :param fp_rate:
+        :return: object supporting "in" operator.
+        """
+
+        if not exact:
+            members = ScalableBloomFilter(fp_rate)
+            members.update(keys)
+
+            return members
+
+        keys = iter(keys)
+        ints = array('q')
+
+        for k in keys:
+            if type(k) is not int:
+                return frozenset(chain(ints, (k,), keys))
+
+            try:
+                ints.append(k)
+            except OverflowError:
+                return frozenset(chain(ints, (k,), keys))
+
+        return SortedIntSet(ints)
+
+    @check_pipeline
+    def sort(self, key=None, reverse: bool = False, max_in_memory: int = None) -> 'Stream[X]':
         """
         Sorts element of Stream.
 
@@ -223,29 +581,55 @@ class Stream(Closable, Generic[X]):
             Stream(students).sorted(key=Student.get_age,reverse=True).collect(ToList())
             -> [[name=D,age=6], [name=C,age=4], [name=A,age=3], [name=B,age=1]]
 
+        If "max_in_memory" is given and stream has more elements than that, then
+        sorted runs of "max_in_memory" elements are written to temporary files
+        (elements must be picklable) and merged (see "merge_sorted"). Sorting
+        remains stable.
+
         :param key:
         :param reverse:
+        :param max_in_memory: maximum number of elements sorted in memory at once,
+                              None means no limit.
         :return: Stream itself
         """
 
-        self._pointer = Stream._yield_sorted(self._pointer, key, reverse)
+        self._pointer = Stream._yield_sorted(self._pointer, key, reverse, max_in_memory)
         return self
 
     @staticmethod
-    def _yield_sorted(itr: Iterable[X], key, reverse: bool) -> Iterable[X]:
+    def _yield_sorted(itr: Iterable[X], key, reverse: bool, max_in_memory: int = None) -> Iterable[X]:
         """
         Creates a generator having elements in sorted order.
 
         :param itr:
         :param key:
         :param reverse:
+        :param max_in_memory:
         :return:
         """
 
-        yield from sorted(itr, key=key, reverse=reverse)
+        if max_in_memory is None:
+            yield from sorted(itr, key=key, reverse=reverse)
+            return
+
+        runs = []
+
+        for chunk in divide_in_chunk(itr, max_in_memory):
+            chunk = sorted(chunk, key=key, reverse=reverse)
+
+            if not runs and len(chunk) < max_in_memory:
+                # every element fits in memory.
+                yield from chunk
+                return
+
+            run = SpillFile()
+            run.extend(chunk)
+            runs.append(run)
+
+        yield from Stream._yield_merged(runs, key, reverse, fan_in=_FAN_IN)
 
     @check_pipeline
-    def distinct(self) -> 'Stream[X]':
+    def distinct(self, int_keys: bool = False) -> 'Stream[X]':
         """
         uses distinct element of for further processing.
 
@@ -256,22 +640,28 @@ class Stream(Closable, Generic[X]):
         Note that, sorting is not guaranteed.
         Elements must be hashable and define equal logic(__eq__)
 
+        If all elements are integers, "int_keys" can be set to True; then
+        seen elements are held in a compressed Bitmap, which takes much less
+        memory than a 'set' (about 1 bit per element for dense ids).
+
+        :param int_keys: True if elements are integers.
         :return: Stream itself
         """
 
-        self._pointer = Stream._yield_distinct(self._pointer)
+        self._pointer = Stream._yield_distinct(self._pointer, int_keys)
         return self
 
     @staticmethod
-    def _yield_distinct(itr: Iterable[X]):
+    def _yield_distinct(itr: Iterable[X], int_keys: bool = False):
         """
         yield distinct elements from a given iterable
 
         :param itr:
+        :param int_keys:
         :return: generator of distinct elements
         """
 
-        consumer_items = set()
+        consumer_items = Bitmap() if int_keys else set()
 
         for item in itr:
             if item not in consumer_items:
@@ -294,6 +684,63 @@ class Stream(Closable, Generic[X]):
         self._pointer = islice(self._pointer, n)
         return self
 
+    @check_pipeline
+    def sample(self, fraction: float, seed: Union[int, Random] = None) -> 'Stream[X]':
+        """
+        keeps each element independently with probability "fraction"
+        (Bernoulli sampling), lazily.
+
+        Instead of drawing a random number per element, number of elements to
+        be skipped before next sampled element is drawn from geometric
+        distribution and skipped elements are discarded using "islice"; so it
+        costs one random number per sampled element.
+
+        Example:
+            Stream(range(10 ** 6)).sample(0.01, seed=1).count() -> about 10000
+
+        :param fraction: probability of keeping an element, in [0, 1].
+        :param seed: integer or random number generator (like testHelper.RND).
+        :return: Stream itself
+        """
+
+        if not 0 <= fraction <= 1:
+            raise ValueError(f'fraction must be in [0, 1], given: {fraction}')
+
+        self._pointer = Stream._yield_sample(self._pointer, fraction, seed)
+        return self
+
+    @staticmethod
+    def _yield_sample(itr: Iterable[X], fraction: float, seed) -> Iterable[X]:
+        """
+        generator of sampled elements.
+
+        :param itr:
+        :param fraction:
+        :param seed:
+        :return:
+        """
+
+        itr = iter(itr)
+
+        if fraction == 1:
+            yield from itr
+            return
+
+        if fraction == 0:
+            return
+
+        rnd = as_random(seed)
+        log_q = log(1 - fraction)
+
+        while True:
+            skip = int(log(1 - rnd.random()) / log_q)
+
+            for e in islice(itr, skip, skip + 1):
+                yield e
+                break
+            else:
+                return
+
     @check_pipeline
     def peek(self, consumer: Consumer[X]) -> 'Stream[X]':
         """
@@ -403,6 +850,80 @@ class Stream(Closable, Generic[X]):
         self._pointer = divide_in_chunk(self._pointer, n)
         return self
 
+    @check_pipeline
+    def prefetch(self, n: int = 64, batch: int = None) -> 'Stream[X]':
+        """
+        evaluates upstream operations in a background thread which keeps
+        up to "n" elements ready in a bounded queue; so slow upstream (reading
+        files, network) overlaps with downstream processing. Since it is a
+        thread, it helps when upstream waits on I/O (or releases GIL).
+
+        If "batch" is given, then upstream elements are passed through queue
+        in tuples of "batch" elements (at most "n" tuples are held); it reduces
+        locking overhead for cheap elements.
+
+        Exception raised by upstream is raised in consumer. Background thread
+        stops once stream is exhausted or garbage collected (for example,
+        after "find_first" or "limit").
+
+        Example:
+            (Stream(csv_itr(path))
+             .map(parse)
+             .prefetch(1000, batch=100)
+             .map(score)
+             .collect(ToList()))
+
+        :param n: maximum number of elements (or batches) held in queue.
+        :param batch: number of elements put in queue at once.
+        :return: Stream itself
+        """
+
+        self._pointer = iter(_Prefetch(self._pointer, n, batch))
+        return self
+
+    @check_pipeline
+    def stage(self, *funcs: Function, workers: int = 1, multiprocessing: bool = False,
+              ordered: bool = True, queue_size: int = None, batch: int = 1) -> 'Stream':
+        """
+        maps elements using "funcs" (applied one after another, so a group of
+        steps can make a single stage) in a pool of "workers" threads (or
+        processes, if "multiprocessing" is True) owned by this stage.
+
+        Stages are connected by bounded queues: at most "queue_size" batches
+        of "batch" elements are pending in a stage and when it is full, stage
+        before it waits. So chained stages run concurrently like a Unix pipe
+        and memory stays bounded.
+
+        If "ordered" is False, then results are yielded as soon as they are
+        ready instead of in order of elements.
+
+        Exceptions raised by upstream or "funcs" are raised in consumer. Workers
+        stop once stream is exhausted or garbage collected (for example, after
+        "find_first" or "limit").
+
+        Example:
+            (Stream(read_lines(path))
+             .stage(parse, workers=2)
+             .stage(enrich, workers=16, ordered=False)
+             .stage(serialize, workers=4, multiprocessing=True, batch=100)
+             .for_each(write))
+
+        Note that in case of multiprocessing, "funcs" and elements must be picklable.
+
+        :param funcs: functions applied on each element.
+        :param workers: number of workers of this stage.
+        :param multiprocessing: if True then workers are processes else threads.
+        :param ordered: if True then order of elements is preserved.
+        :param queue_size: maximum number of pending batches, by default twice
+                           the number of workers.
+        :param batch: number of elements sent to a worker in one go.
+        :return: Stream itself
+        """
+
+        self._pointer = iter(_Stage(self._pointer, funcs, workers=workers, multiprocessing=multiprocessing,
+                                    ordered=ordered, queue_size=queue_size, batch=batch))
+        return self
+
     @check_pipeline
     def enumerate(self, start=0):
         """
@@ -514,6 +1035,81 @@ class Stream(Closable, Generic[X]):
 
         return self
 
+    @check_pipeline
+    def join(self, other: Iterable[Y], left_key: Function, right_key: Function = None,
+             how: str = 'inner', max_build: int = None, partitions: int = 64) -> 'Stream[Tuple]':
+        """
+        Joins stream (left side) with "other" (right side) on keys and creates
+        stream of tuples (stream element, "other" element).
+
+        Hash table is built on the smaller side and the other side is streamed
+        against it. If "max_build" is given and build side has more elements
+        than that, both sides are spilled into hash partitioned temporary files
+        (elements must be picklable) and joined partition by partition.
+        (see streamAPI.stream.join.hash_join for more detail)
+
+        Example:
+            from operator import itemgetter
+
+            users = [(1, 'A'), (2, 'B')]
+            orders = [(1, 'pen'), (1, 'ink'), (3, 'cup')]
+
+            Stream(users).join(orders, itemgetter(0)).collect(ToList())
+            -> [((1, 'A'), (1, 'pen')), ((1, 'A'), (1, 'ink'))]
+
+            Stream(users).join(orders, itemgetter(0), how='left').collect(ToList())
+            -> [((1, 'A'), (1, 'pen')), ((1, 'A'), (1, 'ink')), ((2, 'B'), None)]
+
+        Note that order of pairs is not guaranteed.
+
+        :param other:
+        :param left_key: key of stream elements.
+        :param right_key: key of "other" elements, if None then "left_key" is used.
+        :param how: one of 'inner', 'left', 'outer'; defaults to 'inner'.
+        :param max_build: maximum number of build side elements held in memory,
+                          None means no limit.
+        :param partitions: number of partitions used in case "max_build" is crossed.
+        :return: Stream itself
+        """
+
+        self._pointer = hash_join(self._pointer, other, left_key, right_key,
+                                  how=how, max_build=max_build, partitions=partitions)
+        return self
+
+    @check_pipeline
+    def merge_join(self, other: Iterable[Y], left_key: Function, right_key: Function = None,
+                   how: str = 'inner', reverse: bool = False, validate: bool = False) -> 'Stream[Tuple]':
+        """
+        Joins stream with "other" when both are already sorted on their keys,
+        and creates stream of tuples (stream element, "other" element).
+
+        Unlike "join", nothing is materialized: both sides are advanced in
+        lockstep and only the current run of "other" elements having equal
+        key is held in memory. Tuples are produced in order of keys.
+        (see streamAPI.stream.join.merge_join for more detail)
+
+        Example:
+            from operator import itemgetter
+
+            users = [(1, 'A'), (2, 'B'), (4, 'D')]
+            orders = [(1, 'pen'), (1, 'ink'), (3, 'cup'), (4, 'mug')]
+
+            Stream(users).merge_join(orders, itemgetter(0)).collect(ToList())
+            -> [((1, 'A'), (1, 'pen')), ((1, 'A'), (1, 'ink')), ((4, 'D'), (4, 'mug'))]
+
+        :param other: sorted on "right_key"
+        :param left_key: key of stream elements, stream must be sorted on it.
+        :param right_key: key of "other" elements, if None then "left_key" is used.
+        :param how: one of 'inner', 'left', 'outer'; defaults to 'inner'.
+        :param reverse: True if both sides are sorted in descending order.
+        :param validate: if True, then ValueError is raised on finding key out of order.
+        :return: Stream itself
+        """
+
+        self._pointer = merge_join(self._pointer, other, left_key, right_key,
+                                   how=how, reverse=reverse, validate=validate)
+        return self
+
     @check_pipeline
     def cycle(self, itr: Iterable[Y], after=True) -> 'Stream[Tuple]':
         """
@@ -571,14 +1167,18 @@ class Stream(Closable, Generic[X]):
             -> [0, 0, 0, 1, 1, 1, 1, 7, 8, 9]
 
 
+        Statistics of caches of branches of "chained_condition" (see "if_then")
+        are included in "cache_stats" of this stream.
+
         :param chained_condition:
         :return: Stream itself
         """
 
+        self._caches.extend(chained_condition.memoized_branches())
         return self.map(chained_condition)
 
     @check_pipeline
-    def accumulate(self, bi_func: BiFunction[X, X, X]) -> 'Stream[X]':
+    def accumulate(self, bi_func: BiFunction[X, X, X], block: int = None) -> 'Stream[X]':
         """
         accumulates stream elements using given "bi_func"
 
@@ -591,13 +1191,120 @@ class Stream(Closable, Generic[X]):
             Stream(range(1,10)).accumulate(op.mul).collect(ToList())
             -> [1, 2, 6, 24, 120, 720, 5040, 40320, 362880]
 
+        If "block" is given, elements are scanned in blocks of "block" elements
+        and last accumulated value is carried to next block. For "bi_func" being
+        one of operator.add, operator.mul, max and min, and numpy being installed,
+        a block of only integers or only floats is scanned by numpy (cumsum,
+        cumprod, maximum.accumulate, minimum.accumulate) instead of calling
+        "bi_func" per element. Other blocks, integer blocks which may overflow
+        64 bits (and integer products) and float blocks having NaN are scanned
+        in Python; so accumulated values are same as without "block".
+
+            Stream(amounts).accumulate(op.add, block=4096)
+
         :param bi_func:
+        :param block: number of elements scanned at once.
         :return: Stream itself
         """
 
-        self._pointer = accumulate(self._pointer, bi_func)
+        if block is None:
+            self._pointer = accumulate(self._pointer, bi_func)
+        else:
+            assert block > 0, 'block must be positive.'
+            self._pointer = Stream._yield_block_accumulated(self._pointer, bi_func, block)
+
         return self
 
+    @staticmethod
+    def _yield_block_accumulated(itr: Iterable[X], bi_func: BiFunction[X, X, X], block: int) -> Iterable[X]:
+        carry = NIL
+
+        for chunk in divide_in_chunk(itr, block):
+            scanned = Stream._scan(chunk, bi_func, carry)
+            yield from scanned
+
+            carry = scanned[-1]
+
+    @staticmethod
+    def _scan(chunk: Sequence[X], bi_func: BiFunction[X, X, X], carry=NIL) -> Sequence[X]:
+        """
+        computes prefix scan of "chunk" starting with "carry" (if it is not NIL).
+
+        :param chunk:
+        :param bi_func:
+        :param carry:
+        :return: accumulated values corresponding to elements of "chunk".
+        """
+
+        ufunc_name = _VECTOR_SCANS.get(bi_func)
+        np = optional_import('numpy') if ufunc_name is not None else None
+
+        if np is not None and len(chunk) > 0:
+            arr = Stream._as_scan_array(np, chunk, bi_func, carry)
+
+            if arr is not None:
+                with np.errstate(all='ignore'):  # like Python floats, overflow silently gives inf.
+                    return getattr(np, ufunc_name).accumulate(arr).tolist()
+
+        if carry is NIL:
+            return list(accumulate(chunk, bi_func))
+
+        return list(accumulate(chunk, bi_func, initial=carry))[1:]
+
+    @staticmethod
+    def _as_scan_array(np, chunk: Sequence[X], bi_func: BiFunction[X, X, X], carry):
+        """
+        converts "chunk" into numpy array whose scan gives same values as
+        scan in Python. "carry" is folded into first element, so that
+        accumulated values are same as that of a left fold. It is possible only
+        if all elements (and folded first element) are of the same type, int or
+        float, and floats are not NaN (Python's max and min do not propagate NaN).
+
+        :param np: numpy module
+        :param chunk:
+        :param bi_func:
+        :param carry:
+        :return: array or None if "chunk" has to be scanned in Python.
+        """
+
+        types = set(map(type, chunk))
+
+        if len(types) != 1:
+            return None
+
+        tp = types.pop()
+
+        if tp is not int and tp is not float or (tp is int and bi_func is mul):
+            return None
+
+        arr = np.asarray(chunk)
+
+        if arr.ndim != 1 or arr.dtype.kind != ('i' if tp is int else 'f'):
+            return None
+
+        if carry is not NIL:
+            first = bi_func(carry, chunk[0])
+
+            if type(first) is not tp:
+                return None
+
+            try:
+                arr[0] = first
+            except OverflowError:
+                return None
+
+        if tp is float and np.isnan(arr).any():
+            return None
+
+        if tp is int and bi_func is add:
+            # sum of absolute values must fit in 64 bits.
+            info = np.iinfo(arr.dtype)
+
+            if int(arr.min()) == info.min or int(np.abs(arr).max()) * len(arr) > info.max:
+                return None
+
+        return arr
+
     @check_pipeline
     def window_function(self, func, n: Union[int, None]) -> 'Stream[X]':
         """
@@ -979,17 +1686,32 @@ class Stream(Closable, Generic[X]):
 
     @close_pipeline
     @check_pipeline
-    def collect(self, collector: Collector):
+    def collect(self, collector: Collector, chunk_size: int = None):
         """
         This operation is one of the terminal operations.
         For more detail see: streamAPI.stream.TO package.
 
+        By default, elements are given to "collector" one by one. If "chunk_size"
+        is given, elements are given in chunks of that size using "consume_many"
+        method of collector, which is faster; but then "chunk_size" elements are
+        pulled from stream before collector sees any of them, so side effects of
+        previous operations (like "peek") do not interleave with collector.
+
         :param collector:
+        :param chunk_size: None means elements are consumed one by one.
         :return:
         """
 
-        for e in self._pointer:
-            collector.consume(e)
+        if chunk_size is None:
+            consume = collector.consume
+
+            for e in self._pointer:
+                consume(e)
+        else:
+            consume_many = collector.consume_many
+
+            for chunk in divide_in_chunk(self._pointer, chunk_size):
+                consume_many(chunk)
 
         return collector.finish()
 
@@ -1019,6 +1741,57 @@ class Stream(Closable, Generic[X]):
 
         return sum(self._pointer, start)
 
+    @close_pipeline
+    @check_pipeline
+    def tee(self, n: int = 2, buffer: int = None, spill: bool = False,
+            timeout: float = None) -> Tuple['Stream[X]', ...]:
+        """
+        This operation is one of the terminal operations.
+
+        Splits stream into "n" independent streams (branches). Upstream
+        operations are evaluated only once and their elements are shared
+        among branches. Branches can be consumed by different threads.
+
+        Elements are buffered until every branch has consumed them. If
+        "buffer" is given, then at most "buffer" elements are held in memory;
+        when a branch runs that far ahead of the slowest branch, then
+        1) if "spill" is False, it waits for other branches to catch up.
+           (so branches must be consumed by different threads.)
+        2) if "spill" is True, further elements are written to a temporary
+           file until all branches have caught up again.
+
+        A branch stops holding back the buffer once it is exhausted or
+        once the Stream consuming it is garbage collected.
+
+        Example:
+            evens, squares = Stream(range(5)).tee()
+
+            evens.filter(lambda x: x % 2 == 0).collect(ToList()) -> [0, 2, 4]
+            squares.map(lambda x: x ** 2).collect(ToList()) -> [0, 1, 4, 9, 16]
+
+            # consuming branches from different threads with bounded memory.
+            from threading import Thread
+
+            writer, counter = Stream(range(10 ** 6)).map(parse).tee(buffer=1000)
+            t = Thread(target=writer.for_each, args=(write,))
+            t.start()
+            counter.count() -> 1000000
+            t.join()
+
+        :param n: number of branches
+        :param buffer: maximum number of elements held in memory, defaults to None
+                       which means no limit.
+        :param spill: if True then elements beyond "buffer" are written to a
+                      temporary file instead of waiting for slower branches.
+                      Elements must be picklable.
+        :param timeout: maximum time (in seconds) a branch waits for other branches,
+                        after which TimeoutError is raised; None means no limit.
+        :return: tuple of "n" Streams
+        """
+
+        branches = _Tee(self._pointer, n, buffer=buffer, spill=spill, timeout=timeout).branches()
+        return tuple(Stream(branch) for branch in branches)
+
     @close_pipeline
     @check_pipeline
     def __iter__(self) -> Iterable[X]:
@@ -5,13 +5,19 @@ email: shivkj001@gmail.com
 
 from abc import ABC, abstractmethod
 from collections import deque
-from typing import Callable, Deque, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from queue import Empty, Full, Queue
+from threading import Condition, Event, Lock, Semaphore, Thread
+from typing import Callable, Deque, Dict, Iterable, Sequence, Set, Tuple
 
 from streamAPI.stream.decos import check_pipeline, close_pipeline
 from streamAPI.stream.exception import PipelineNOTClosed
 from streamAPI.stream.optional import EMPTY, Optional
 from streamAPI.utility.Types import Filter, Function, X
-from streamAPI.utility.utils import always_true, get_functions_clazz
+from streamAPI.utility.cache import CacheSpec, Memoized
+from streamAPI.utility.spill import SpillFile
+from streamAPI.utility.utils import NIL, always_true, divide_in_chunk, get_functions_clazz
 
 
 class Supplier(Iterable[X]):
@@ -122,6 +128,534 @@ class Closable:
         self._closed = state
 
 
+class _Tee:
+    """
+    Shares one upstream iterator between several branches.
+
+    Elements pulled from upstream are held in a buffer until every
+    branch has consumed them. If "buffer" is not None, then at most
+    "buffer" elements are held in memory; when a branch runs that far
+    ahead of the slowest branch, it either waits for other branches
+    (consumed from other threads) to catch up or, if "spill" is True,
+    writes further elements to a temporary file until all branches have
+    caught up again.
+
+    A branch stops holding back the buffer once it is exhausted or its
+    generator is closed (for example, when the Stream consuming it is
+    garbage collected after "find_first").
+    """
+
+    def __init__(self, itr: Iterable[X], n: int, buffer: int = None,
+                 spill: bool = False, timeout: float = None):
+        """
+        :param itr: upstream iterator.
+        :param n: number of branches
+        :param buffer: maximum number of elements held in memory, None means no limit.
+        :param spill: if True then elements beyond "buffer" are written to disk
+                      otherwise leading branch waits for slower branches.
+        :param timeout: maximum time (in seconds) a branch waits for other branches,
+                        None means no limit.
+        """
+
+        assert n > 0, 'number of branches must be positive.'
+        assert buffer is None or buffer > 0, 'buffer must be positive.'
+
+        self._source = iter(itr)
+        self._buffer = buffer
+        self._spill = SpillFile() if spill and buffer is not None else None
+        self._timeout = timeout
+
+        self._lock = Condition()
+
+        self._memory: Deque[X] = deque()
+        self._head = 0  # index of first element held in memory
+
+        self._spilled_from = 0  # index of first spilled element
+        self._spilled = 0  # number of spilled elements
+        self._offsets: Dict[int, int] = {}  # branch -> offset of its next spilled record
+
+        self._positions: Dict[int, int] = {bid: 0 for bid in range(n)}
+
+        self._exhausted = False
+        self._error: BaseException = None
+
+    def branches(self) -> tuple:
+        """
+        creates an iterator for each branch.
+        :return:
+        """
+
+        return tuple(_TeeBranch(self, bid) for bid in tuple(self._positions))
+
+    def _next(self, bid: int):
+        """
+        returns next element for branch "bid" or NIL if upstream is exhausted.
+
+        :param bid:
+        :return:
+        """
+
+        with self._lock:
+            while True:
+                p = self._positions[bid]
+                in_memory = self._head + len(self._memory)
+
+                if p < in_memory:
+                    e = self._memory[p - self._head]
+                    self._advance(bid)
+                    return e
+
+                if self._spilled and p < self._spilled_from + self._spilled:
+                    e, self._offsets[bid] = self._spill.read_at(self._offsets.get(bid, 0))
+                    self._advance(bid)
+                    return e
+
+                # branch "bid" is leading, so an element has to be pulled from upstream.
+                if self._exhausted:
+                    if self._error is not None:
+                        raise self._error
+
+                    return NIL
+
+                full = self._buffer is not None and len(self._memory) >= self._buffer
+
+                if self._spilled or (full and self._spill is not None):
+                    e = self._pull()
+
+                    if e is NIL:
+                        return NIL
+
+                    if not self._spilled:
+                        self._spilled_from = in_memory
+
+                    self._spill.append(e)
+                    self._spilled += 1
+                    self._offsets[bid] = self._spill.end
+                    self._advance(bid)
+                    return e
+
+                if not full:
+                    e = self._pull()
+
+                    if e is NIL:
+                        return NIL
+
+                    self._memory.append(e)
+                    self._advance(bid)
+                    return e
+
+                if not self._lock.wait(self._timeout):
+                    raise TimeoutError(f'branch {bid} waited more than {self._timeout}s '
+                                       f'for other branches to consume the buffer.')
+
+    def _pull(self):
+        try:
+            return next(self._source)
+        except StopIteration:
+            self._exhausted = True
+            return NIL
+        except BaseException as e:
+            self._exhausted = True
+            self._error = e
+            raise
+
+    def _advance(self, bid: int):
+        self._positions[bid] += 1
+        self._trim()
+
+    def _trim(self):
+        """
+        drops elements which have been consumed by every branch.
+        """
+
+        if not self._positions:
+            self._memory.clear()
+
+            if self._spill is not None:
+                self._spill.close()
+                self._spilled = 0
+
+            return
+
+        slowest = min(self._positions.values())
+
+        while self._memory and self._head < slowest:
+            self._memory.popleft()
+            self._head += 1
+
+        if self._spilled and slowest >= self._spilled_from + self._spilled:
+            # every branch has caught up, so elements can be held in memory again.
+            self._head = slowest
+            self._spilled = 0
+            self._offsets.clear()
+            self._spill.clear()
+
+        self._lock.notify_all()
+
+    def _detach(self, bid: int):
+        with self._lock:
+            self._positions.pop(bid, None)
+            self._offsets.pop(bid, None)
+            self._trim()
+
+
+class _TeeBranch:
+    """
+    Iterator over a branch of _Tee. Branch is detached once it is exhausted,
+    raises, is closed or is garbage collected (even if it was never read),
+    so that it does not hold back the buffer.
+    """
+
+    __slots__ = ('_tee', '_bid', '__weakref__')
+
+    def __init__(self, tee: _Tee, bid: int):
+        self._tee = tee
+        self._bid = bid
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tee = self._tee
+
+        if tee is None:
+            raise StopIteration
+
+        try:
+            e = tee._next(self._bid)
+        except BaseException:
+            self.close()
+            raise
+
+        if e is NIL:
+            self.close()
+            raise StopIteration
+
+        return e
+
+    def close(self):
+        tee, self._tee = self._tee, None
+
+        if tee is not None:
+            tee._detach(self._bid)
+
+    def __del__(self):
+        self.close()
+
+
+class _Raised:
+    """
+    carries exception raised by upstream from producer thread to consumer.
+    """
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Feeder:
+    """
+    Base of stages whose background thread puts items in a queue read by
+    consumer; it stops putting once consumer sets "_stop".
+    """
+
+    _POLL = 0.1  # seconds after which a waiting producer checks for stop.
+
+    def __init__(self, queue_size: int):
+        self._queue = Queue(maxsize=queue_size)
+        self._stop = Event()
+
+    def _put(self, item) -> bool:
+        """
+        puts "item" in queue waiting for free space unless consumer has stopped.
+
+        :param item:
+        :return: False if consumer has stopped.
+        """
+
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=self._POLL)
+                return True
+            except Full:
+                pass
+
+        return False
+
+
+class _Prefetch(_Feeder):
+    """
+    Pulls elements of upstream iterator in a background thread and holds
+    them in a bounded queue, so that upstream (usually I/O) overlaps with
+    processing of elements by consumer.
+
+    Producer thread stops when upstream is exhausted or raises (exception
+    is raised in consumer) or when consumer generator is closed (for example,
+    when the Stream consuming it is garbage collected after "find_first").
+    A producer blocked inside upstream stops after that call returns.
+    """
+
+    def __init__(self, itr: Iterable[X], n: int, batch: int = None):
+        """
+        :param itr: upstream iterator
+        :param n: maximum number of items held in queue.
+        :param batch: if not None, then items of queue are tuples of at most
+                      "batch" elements.
+        """
+
+        assert n > 0, 'n must be positive.'
+        assert batch is None or batch > 0, 'batch must be positive.'
+
+        super().__init__(n)
+
+        self._source = itr
+        self._batch = batch
+
+    def __iter__(self) -> Iterable[X]:
+        producer = Thread(target=self._produce, name='stream-prefetch', daemon=True)
+        producer.start()
+
+        q, batched = self._queue, self._batch is not None
+
+        try:
+            while True:
+                item = q.get()
+
+                if item is NIL:
+                    return
+
+                if isinstance(item, _Raised):
+                    raise item.error
+
+                if batched:
+                    yield from item
+                else:
+                    yield item
+        finally:
+            self._stop.set()
+
+            # frees space for producer waiting on full queue.
+            try:
+                while True:
+                    q.get_nowait()
+            except Empty:
+                pass
+
+    def _produce(self):
+        source = self._source
+        items = source if self._batch is None else divide_in_chunk(source, self._batch)
+
+        try:
+            for item in items:
+                if not self._put(item):
+                    return
+
+            end = NIL
+        except BaseException as e:
+            end = _Raised(e)
+        finally:
+            if self._stop.is_set() and hasattr(source, 'close'):
+                source.close()
+
+        self._put(end)
+
+
+class _Ended:
+    """
+    tells consumer of unordered stage how many jobs were submitted.
+    """
+
+    __slots__ = ('jobs',)
+
+    def __init__(self, jobs: int):
+        self.jobs = jobs
+
+
+def _apply_all(funcs: Sequence[Function], gs: Sequence) -> tuple:
+    """
+    applies "funcs" one after another on each element of "gs".
+
+    :param funcs:
+    :param gs:
+    :return:
+    """
+
+    out = []
+
+    for g in gs:
+        for func in funcs:
+            g = func(g)
+
+        out.append(g)
+
+    return tuple(out)
+
+
+class _Stage(_Feeder):
+    """
+    Runs functions on upstream elements in its own pool of "workers"
+    (threads or processes). A feeder thread pulls upstream elements,
+    submits them in batches of "batch" elements and blocks once "queue_size"
+    batches are pending; so stages chained one after another run
+    concurrently and a slow stage holds back the stages before it.
+
+    If "ordered" is True then results are yielded in order of elements,
+    otherwise in order of completion.
+
+    Exceptions (raised by upstream or by functions) are raised in consumer.
+    Feeder and workers stop once consumer generator is closed.
+    """
+
+    def __init__(self, itr: Iterable, funcs: Sequence[Function], workers: int = 1,
+                 multiprocessing: bool = False, ordered: bool = True,
+                 queue_size: int = None, batch: int = 1):
+        """
+        :param itr: upstream iterator
+        :param funcs: functions applied one after another on each element.
+        :param workers: number of workers.
+        :param multiprocessing: if True then workers are processes else threads.
+        :param ordered: if True then order of elements is preserved.
+        :param queue_size: maximum number of pending batches, by default twice
+                           the number of workers.
+        :param batch: number of elements sent to a worker in one go.
+        """
+
+        assert funcs, 'at least one function is required.'
+        assert workers > 0, 'number of workers must be positive.'
+        assert batch > 0, 'batch must be positive.'
+        assert queue_size is None or queue_size > 0, 'queue size must be positive.'
+
+        self._source = itr
+        self._job = partial(_apply_all, tuple(funcs))
+        self._workers = workers
+        self._multiprocessing = multiprocessing
+        self._ordered = ordered
+        self._batch = batch
+
+        queue_size = queue_size or 2 * workers
+
+        # ordered: queue holds pending jobs in order of submission.
+        # unordered: queue holds completed jobs and "slots" bounds pending jobs.
+        super().__init__(queue_size if ordered else 0)
+
+        self._slots = None if ordered else Semaphore(queue_size)
+
+        # unordered: submitted jobs which are not done yet; cancelled once consumer stops.
+        self._pending: Set[Future] = set()
+        self._pending_lock = Lock()
+
+    def __iter__(self) -> Iterable:
+        executor = (ProcessPoolExecutor if self._multiprocessing else ThreadPoolExecutor)(self._workers)
+        feeder = Thread(target=self._feed, args=(executor,), name='stream-stage', daemon=True)
+        feeder.start()
+
+        q, finished = self._queue, False
+
+        try:
+            if self._ordered:
+                while True:
+                    item = q.get()
+
+                    if item is NIL:
+                        break
+
+                    if isinstance(item, _Raised):
+                        raise item.error
+
+                    yield from item.result()
+            else:
+                received, jobs = 0, None
+
+                while jobs is None or received < jobs:
+                    item = q.get()
+
+                    if isinstance(item, _Ended):
+                        jobs = item.jobs
+                        continue
+
+                    if isinstance(item, _Raised):
+                        raise item.error
+
+                    received += 1
+                    self._slots.release()
+
+                    yield from item.result()
+
+            finished = True
+        finally:
+            self._stop.set()
+
+            try:
+                while True:
+                    item = q.get_nowait()
+
+                    if isinstance(item, Future):
+                        item.cancel()
+            except Empty:
+                pass
+
+            with self._pending_lock:
+                pending = tuple(self._pending)
+
+            # outside of lock, as cancelling runs done callback (see "_done").
+            for job in pending:
+                job.cancel()
+
+            executor.shutdown(wait=finished)
+
+    def _feed(self, executor):
+        source = self._source
+        jobs = 0
+
+        try:
+            for gs in divide_in_chunk(source, self._batch):
+                if not self._ordered and not self._acquire():
+                    return
+
+                job = executor.submit(self._job, gs)
+                jobs += 1
+
+                if self._ordered:
+                    if not self._put(job):
+                        job.cancel()
+                        return
+                else:
+                    with self._pending_lock:
+                        stopped = self._stop.is_set()  # consumer has already cancelled pending jobs.
+
+                        if not stopped:
+                            self._pending.add(job)
+
+                    if stopped:
+                        job.cancel()
+                        return
+
+                    job.add_done_callback(self._done)
+
+            end = NIL if self._ordered else _Ended(jobs)
+        except BaseException as e:
+            end = _Raised(e)
+        finally:
+            if self._stop.is_set() and hasattr(source, 'close'):
+                source.close()
+
+        self._put(end)
+
+    def _done(self, job: Future):
+        with self._pending_lock:
+            self._pending.discard(job)
+
+        self._queue.put(job)
+
+    def _acquire(self) -> bool:
+        while not self._stop.is_set():
+            if self._slots.acquire(timeout=self._POLL):
+                return True
+
+        return False
+
+
 class ChainedCondition(Closable, AbstractCondition):
     """
     This class will help Stream in transforming elements on the basis
@@ -154,6 +688,7 @@ class ChainedCondition(Closable, AbstractCondition):
         super().__init__()
 
         self._conditions: Deque[_IfThen] = deque()
+        self._memoized: Deque[Memoized] = deque()
         self._name = name
         self._else_called = False
 
@@ -175,21 +710,29 @@ class ChainedCondition(Closable, AbstractCondition):
         return cls().if_then(if_, then).otherwise(else_)
 
     @check_pipeline
-    def if_then(self, if_: Filter, then: Function):
+    def if_then(self, if_: Filter, then: Function, cache: CacheSpec = None):
         """
         Creates _IfThen object from given "if_" and "then".
 
+        If "cache" is given, then results of "then" are memoized as described
+        by "cache" (see "memoized_branches" for statistics).
+
         :param if_:
         :param then:
+        :param cache: if None then results of "then" are not cached.
         :return:
         """
 
+        if cache is not None:
+            then = cache.memoize(then)
+            self._memoized.append(then)
+
         self._conditions.append(_IfThen(if_, then))
         return self
 
     @close_pipeline
     @check_pipeline
-    def otherwise(self, else_: Function):
+    def otherwise(self, else_: Function, cache: CacheSpec = None):
         """
         Adds "else" condition to ChainedCondition object.
         After this method, pipeline will be closed.
@@ -198,6 +741,7 @@ class ChainedCondition(Closable, AbstractCondition):
         before invoking this method.
 
         :param else_:
+        :param cache: if None then results of "else_" are not cached.
         :return:
         """
 
@@ -206,7 +750,7 @@ class ChainedCondition(Closable, AbstractCondition):
 
         self._else_called = True
 
-        return self.if_then(always_true, else_)
+        return self.if_then(always_true, else_, cache=cache)
 
     @close_pipeline
     @check_pipeline
@@ -243,6 +787,13 @@ class ChainedCondition(Closable, AbstractCondition):
         else:
             return e
 
+    def memoized_branches(self) -> Tuple[Memoized, ...]:
+        """
+        :return: memoized "then" functions, in order of conditions.
+        """
+
+        return tuple(self._memoized)
+
     def default_name(self) -> str:
         size = len(self._conditions)
 
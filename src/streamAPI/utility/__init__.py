@@ -1,3 +1,15 @@
+from streamAPI.utility.cache import *
+from streamAPI.utility.index import *
+from streamAPI.utility.intset import *
+from streamAPI.utility.sketch import *
+from streamAPI.utility.spill import *
+from streamAPI.utility.state import *
 from streamAPI.utility.utils import *
 
+del cache
+del index
+del intset
+del sketch
+del spill
+del state
 del utils
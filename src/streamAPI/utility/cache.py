@@ -0,0 +1,452 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+# This module implements bounded caches used to memoize functions applied on
+# stream elements (see "cache" parameter of Stream.map).
+
+import sqlite3
+from collections import OrderedDict
+from hashlib import blake2b
+from pickle import HIGHEST_PROTOCOL, dumps, loads
+from time import monotonic, time
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple
+
+from streamAPI.utility.Types import Function, X, Y
+from streamAPI.utility.utils import NIL, get_functions_clazz, identity
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int  # entries removed because cache was full or entry had expired.
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    Cache holding at most "maxsize" entries; least recently used entry is
+    evicted to make room for new one. If "ttl" is given, then an entry
+    expires "ttl" seconds after it was stored.
+
+    Example:
+        cache = LRUCache(maxsize=2)
+
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a') -> 1
+        cache.put('c', 3) # 'b' is evicted
+        cache.get('b') -> NIL
+    """
+
+    def __init__(self, maxsize: int = None, ttl: float = None, timer: Callable[[], float] = monotonic):
+        """
+        :param maxsize: maximum number of entries, None means no limit.
+        :param ttl: time to live (in seconds) of an entry, None means entries
+                    never expire.
+        :param timer: gives current time in seconds.
+        """
+
+        assert maxsize is None or maxsize > 0, 'maxsize must be positive.'
+        assert ttl is None or ttl > 0, 'ttl must be positive.'
+
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._timer = timer
+
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()  # key -> (value, expiry time)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, k: Hashable, default=NIL):
+        """
+        :param k:
+        :param default:
+        :return: value cached for "k" or "default" if "k" is not cached.
+        """
+
+        entry = self._data.get(k, NIL)
+
+        if entry is not NIL:
+            value, expiry = entry
+
+            if expiry is None or expiry > self._timer():
+                self._data.move_to_end(k)
+                self.hits += 1
+                return value
+
+            del self._data[k]
+            self.evictions += 1
+
+        self.misses += 1
+        return default
+
+    def put(self, k: Hashable, value: Any):
+        data = self._data
+
+        if k in data:
+            data.move_to_end(k)
+        elif self._maxsize is not None and len(data) >= self._maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+
+        data[k] = value, (None if self._ttl is None else self._timer() + self._ttl)
+
+    def __contains__(self, k: Hashable) -> bool:
+        entry = self._data.get(k, NIL)
+        return entry is not NIL and (entry[1] is None or entry[1] > self._timer())
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._data))
+
+    def __repr__(self):
+        return f'LRUCache(maxsize={self._maxsize}, ttl={self._ttl}, {self.stats()})'
+
+
+class CacheSpec:
+    """
+    Describes how results of a function are memoized:
+    1) maxsize: maximum number of cached results (least recently used result
+       is evicted), None means no limit.
+    2) ttl: seconds after which a cached result expires, None means never.
+    3) key: function making cache key of an element, by default element
+       itself is the key. Key must be hashable.
+
+    Each stage using a CacheSpec gets its own cache.
+
+    Example:
+        stream = Stream(ips).map(geo_lookup, cache=CacheSpec(maxsize=10000, ttl=3600))
+        countries = stream.collect(ToList())
+
+        stream.cache_stats() -> (CacheStats(hits=..., misses=..., evictions=..., size=...),)
+    """
+
+    __slots__ = ('maxsize', 'ttl', 'key')
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None, key: Function[X, Hashable] = None):
+        assert maxsize is None or maxsize > 0, 'maxsize must be positive.'
+        assert ttl is None or ttl > 0, 'ttl must be positive.'
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.key = key or identity
+
+    def create(self) -> LRUCache:
+        """
+        :return: a new empty cache.
+        """
+
+        return LRUCache(self.maxsize, self.ttl)
+
+    def memoize(self, func: Function[X, Y]) -> 'Memoized':
+        return Memoized(func, self.create(), self.key)
+
+    def __repr__(self):
+        return f'CacheSpec(maxsize={self.maxsize}, ttl={self.ttl})'
+
+
+class Memoized:
+    """
+    Function "func" whose results are cached in "cache" against key
+    of its argument. Objects of this class are picklable (if "func" and
+    "key" are), so each process gets its own copy of cache.
+    """
+
+    __slots__ = ('func', 'cache', 'key')
+
+    def __init__(self, func: Function[X, Y], cache: LRUCache, key: Function[X, Hashable] = identity):
+        self.func = func
+        self.cache = cache
+        self.key = key
+
+    def __call__(self, e: X) -> Y:
+        k = self.key(e)
+        value = self.cache.get(k)
+
+        if value is NIL:
+            value = self.func(e)
+            self.cache.put(k, value)
+
+        return value
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats()
+
+
+_SCHEMA = ('CREATE TABLE IF NOT EXISTS entries ('
+           'version TEXT NOT NULL, fp BLOB NOT NULL, value BLOB NOT NULL, '
+           'size INTEGER NOT NULL, used REAL NOT NULL, '
+           'PRIMARY KEY (version, fp)) WITHOUT ROWID',
+           'CREATE INDEX IF NOT EXISTS entries_used ON entries (used)')
+
+
+def fingerprint(e: Any) -> bytes:
+    """
+    returns 16 bytes digest of pickled "e". It does not change between
+    processes for values like numbers, strings, bytes and tuples of them
+    (unlike "hash" of 'str'); for other objects (sets, objects having
+    unordered state) it may change, which causes only cache misses.
+
+    :param e:
+    :return:
+    """
+
+    return blake2b(dumps(e, 4), digest_size=16).digest()
+
+
+class DiskCache:
+    """
+    Cache persisted in a sqlite file, so that results of previous runs are
+    reused. Entries are stored against (version, fingerprint of key), so
+    changing "version" (for example when function changes) makes old
+    results unreachable; they are removed by "compact".
+
+    If "max_bytes" is given, then least recently used entries (of any
+    version) are evicted once pickled values take more than "max_bytes".
+
+    Writes (and access times of hits) are buffered and written in one
+    transaction per "batch" entries (and on "flush" or "close").
+
+    Example:
+        cache = DiskCache('enrich.db', version='v2')
+
+        if 'a' not in cache:
+            cache.put('a', enrich('a'))
+
+        cache.get('a')
+        cache.close()
+    """
+
+    def __init__(self, path: str, version: str = '', max_bytes: int = None, batch: int = 256):
+        """
+        :param path: sqlite file, created if it does not exist.
+        :param version: version of function whose results are cached.
+        :param max_bytes: maximum bytes taken by pickled values, None means no limit.
+        :param batch: number of buffered writes.
+        """
+
+        assert max_bytes is None or max_bytes > 0, 'max_bytes must be positive.'
+        assert batch > 0, 'batch must be positive.'
+
+        self._path = path
+        self._version = str(version)
+        self._max_bytes = max_bytes
+        self._batch = batch
+
+        self._pending: Dict[bytes, bytes] = {}  # fingerprint -> pickled value, yet to be written.
+        self._used: Dict[bytes, float] = {}  # fingerprint -> last access time, yet to be written.
+
+        self._conn = None  # so that "__del__" works even if opening file fails.
+
+        # results are put by threads of executor in case of map_concurrent.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+        self._size, self._bytes = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) '
+                                                     'FROM entries').fetchone()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, k: Hashable, default=NIL):
+        fp = fingerprint(k)
+        blob = self._pending.get(fp)
+
+        if blob is None and self._conn is not None:
+            row = self._conn.execute('SELECT value FROM entries WHERE version = ? AND fp = ?',
+                                     (self._version, fp)).fetchone()
+
+            if row is not None:
+                blob = row[0]
+                self._used[fp] = time()
+
+                if len(self._used) >= self._batch:
+                    self.flush()
+
+        if blob is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return loads(blob)
+
+    def put(self, k: Hashable, value: Any):
+        if self._conn is None:  # closed
+            return
+
+        self._pending[fingerprint(k)] = dumps(value, HIGHEST_PROTOCOL)
+
+        if len(self._pending) >= self._batch:
+            self.flush()
+
+    def __contains__(self, k: Hashable) -> bool:
+        fp = fingerprint(k)
+
+        return fp in self._pending or (
+                self._conn is not None and
+                self._conn.execute('SELECT 1 FROM entries WHERE version = ? AND fp = ?',
+                                   (self._version, fp)).fetchone() is not None)
+
+    def flush(self):
+        """
+        writes buffered entries and access times, then evicts entries if
+        values take more than "max_bytes".
+        """
+
+        conn = self._conn
+
+        if conn is None:
+            return
+
+        now, version = time(), self._version
+
+        with conn:
+            for fp, blob in self._pending.items():
+                old = conn.execute('SELECT size FROM entries WHERE version = ? AND fp = ?',
+                                   (version, fp)).fetchone()
+
+                if old is None:
+                    self._size += 1
+                else:
+                    self._bytes -= old[0]
+
+                self._bytes += len(blob)
+
+                conn.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                             (version, fp, blob, len(blob), now))
+
+            conn.executemany('UPDATE entries SET used = ? WHERE version = ? AND fp = ?',
+                             ((used, version, fp) for fp, used in self._used.items()))
+
+            self._pending.clear()
+            self._used.clear()
+
+            if self._max_bytes is not None and self._bytes > self._max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        victims: List[tuple] = []
+        excess = self._bytes - self._max_bytes
+
+        for version, fp, size in conn.execute('SELECT version, fp, size FROM entries ORDER BY used'):
+            if excess <= 0:
+                break
+
+            victims.append((version, fp))
+            excess -= size
+            self._bytes -= size
+
+        conn.executemany('DELETE FROM entries WHERE version = ? AND fp = ?', victims)
+
+        self._size -= len(victims)
+        self.evictions += len(victims)
+
+    def compact(self, other_versions: bool = True):
+        """
+        removes entries of other versions (if "other_versions" is True) and
+        shrinks sqlite file to its contents.
+
+        :param other_versions:
+        """
+
+        self.flush()
+
+        if other_versions:
+            with self._conn:
+                self._conn.execute('DELETE FROM entries WHERE version != ?', (self._version,))
+
+            self._size, self._bytes = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) '
+                                                         'FROM entries').fetchone()
+
+        self._conn.execute('VACUUM')
+
+    def close(self):
+        """
+        flushes buffered entries and closes sqlite connection.
+        """
+
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self):
+        """
+        :return: number of entries (of all versions).
+        """
+
+        return self._size + len(self._pending)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        :return: bytes taken by pickled values (of all versions) written to file.
+        """
+
+        return self._bytes
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self))
+
+    def __del__(self):
+        if getattr(self, '_conn', None) is not None:  # "__init__" may have failed.
+            self.close()
+
+    def __repr__(self):
+        return f'DiskCache(path={self._path!r}, version={self._version!r}, {self.stats()})'
+
+
+class DiskCacheSpec(CacheSpec):
+    """
+    Describes memoization in a DiskCache at "path". Each stage using it
+    opens its own connection to the file and flushes (and closes) it once
+    stage is exhausted.
+
+    Example:
+        Stream(rows).map(enrich, cache=DiskCacheSpec('enrich.db', version='v2', key=itemgetter('id')))
+    """
+
+    __slots__ = ('path', 'version', 'max_bytes')
+
+    def __init__(self, path: str, version: str = '', key: Function[X, Hashable] = None,
+                 max_bytes: int = None):
+        """
+        :param path: sqlite file
+        :param version: version of function, results of other versions are not used.
+        :param key: function making cache key of an element, by default element itself.
+        :param max_bytes: maximum bytes taken by cached values, None means no limit.
+        """
+
+        super().__init__(maxsize=None, key=key)
+
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+
+    def create(self) -> DiskCache:
+        return DiskCache(self.path, self.version, self.max_bytes)
+
+    def __repr__(self):
+        return f'DiskCacheSpec(path={self.path!r}, version={self.version!r}, max_bytes={self.max_bytes})'
+
+
+if __name__ == 'streamAPI.utility.cache':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,243 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+# This module implements immutable lookup indexes. They are built by
+# ToIndex, ToSortedIndex and ToCompositeIndex collectors and are meant
+# to be queried many times.
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+from streamAPI.utility.utils import get_functions_clazz
+
+
+class HashIndex:
+    """
+    Immutable multi valued hash index mapping a key to tuple of rows having
+    that key (in order of their arrival).
+
+    Example:
+        index = HashIndex([(1, 'a'), (2, 'b'), (1, 'c')])
+
+        index[1] -> ('a', 'c')
+        index.get(3) -> ()
+        len(index) -> 2
+    """
+
+    __slots__ = ('_data', '_rows')
+
+    def __init__(self, pairs: Iterable[Tuple[Any, Any]] = ()):
+        """
+        :param pairs: (key, row) pairs
+        """
+
+        data: Dict[Any, list] = {}
+
+        for k, row in pairs:
+            if k in data:
+                data[k].append(row)
+            else:
+                data[k] = [row]
+
+        self._data = {k: tuple(rows) for k, rows in data.items()}
+        self._rows = sum(map(len, self._data.values()))
+
+    def __getitem__(self, k) -> tuple:
+        return self._data[k]
+
+    def get(self, k, default: tuple = ()) -> tuple:
+        return self._data.get(k, default)
+
+    def count(self, k) -> int:
+        """
+        :param k:
+        :return: number of rows having key "k".
+        """
+
+        return len(self._data.get(k, ()))
+
+    def __contains__(self, k) -> bool:
+        return k in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+    def items(self):
+        return self._data.items()
+
+    def __len__(self):
+        """
+        :return: number of distinct keys.
+        """
+
+        return len(self._data)
+
+    @property
+    def rows(self) -> int:
+        """
+        :return: number of rows.
+        """
+
+        return self._rows
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(keys={len(self)}, rows={self._rows})'
+
+
+class SortedIndex:
+    """
+    Immutable index holding rows sorted on their keys. Point and range lookups
+    are done using binary search. If all keys are integers (or all are floats),
+    then keys are held in an 'array' (8 bytes per key).
+
+    Rows having equal keys are kept in order of their arrival.
+
+    Example:
+        index = SortedIndex([(5, 'e'), (1, 'a'), (3, 'c'), (3, 'C')])
+
+        index.get(3) -> ('c', 'C')
+        index.range(2, 5) -> ('c', 'C')
+        index.range(2, 5, inclusive=(True, True)) -> ('c', 'C', 'e')
+        index.range(lo=3) -> ('c', 'C', 'e')
+    """
+
+    __slots__ = ('_keys', '_rows')
+
+    def __init__(self, pairs: Iterable[Tuple[Any, Any]] = ()):
+        """
+        :param pairs: (key, row) pairs
+        """
+
+        pairs = list(pairs)
+        order = sorted(range(len(pairs)), key=lambda i: pairs[i][0])  # stable, rows are never compared.
+
+        self._keys = SortedIndex._compact(tuple(pairs[i][0] for i in order))
+        self._rows = tuple(pairs[i][1] for i in order)
+
+    @staticmethod
+    def _compact(keys: tuple) -> Sequence:
+        if keys and all(type(k) is int for k in keys):
+            try:
+                return array('q', keys)
+            except OverflowError:
+                return keys
+
+        if keys and all(type(k) is float for k in keys):
+            return array('d', keys)
+
+        return keys
+
+    def get(self, k) -> tuple:
+        """
+        :param k:
+        :return: rows having key "k".
+        """
+
+        keys = self._keys
+
+        try:
+            return self._rows[bisect_left(keys, k):bisect_right(keys, k)]
+        except TypeError:  # "k" not comparable with 'array' keys
+            return ()
+
+    def __getitem__(self, k) -> tuple:
+        rows = self.get(k)
+
+        if not rows:
+            raise KeyError(k)
+
+        return rows
+
+    def __contains__(self, k) -> bool:
+        return len(self.get(k)) > 0
+
+    def range(self, lo=None, hi=None, inclusive: Tuple[bool, bool] = (True, False)) -> tuple:
+        """
+        finds rows whose keys lie between "lo" and "hi".
+
+        :param lo: if None, then there is no lower bound.
+        :param hi: if None, then there is no upper bound.
+        :param inclusive: whether "lo" and "hi" are included.
+        :return: rows in increasing order of keys.
+        """
+
+        keys = self._keys
+
+        start = 0 if lo is None else (bisect_left if inclusive[0] else bisect_right)(keys, lo)
+        end = len(keys) if hi is None else (bisect_right if inclusive[1] else bisect_left)(keys, hi)
+
+        return self._rows[start:end]
+
+    def count(self, lo=None, hi=None, inclusive: Tuple[bool, bool] = (True, False)) -> int:
+        """
+        :return: number of rows whose keys lie between "lo" and "hi".
+        """
+
+        return len(self.range(lo, hi, inclusive))
+
+    def keys(self) -> Sequence:
+        """
+        :return: sorted keys (having duplicates).
+        """
+
+        return self._keys
+
+    def __iter__(self):
+        return iter(zip(self._keys, self._rows))
+
+    def __len__(self):
+        """
+        :return: number of rows.
+        """
+
+        return len(self._rows)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(rows={len(self)})'
+
+
+class _Top:
+    """
+    greater than every object; used to find end of keys having a prefix.
+    """
+
+    def __lt__(self, other): return False
+
+    def __gt__(self, other): return True
+
+
+_TOP = _Top()
+
+
+class CompositeIndex(SortedIndex):
+    """
+    SortedIndex on tuple keys, which also finds rows whose keys start with
+    given prefix.
+
+    Example:
+        index = CompositeIndex([(('IN', 'Delhi'), 1), (('IN', 'Pune'), 2), (('US', 'NY'), 3)])
+
+        index.get(('IN', 'Pune')) -> (2,)
+        index.prefix('IN') -> (1, 2)
+    """
+
+    __slots__ = ()
+
+    def prefix(self, *parts) -> tuple:
+        """
+        :param parts: leading components of key.
+        :return: rows whose keys start with "parts", in increasing order of keys.
+        """
+
+        keys = self._keys
+        return self._rows[bisect_left(keys, parts):bisect_right(keys, parts + (_TOP,))]
+
+
+if __name__ == 'streamAPI.utility.index':
+    __all__ = get_functions_clazz(__name__, __file__)
@@ -0,0 +1,382 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+# This module implements memory compact sets of integers.
+
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from typing import Dict, Iterable, Union
+
+from streamAPI.utility.utils import get_functions_clazz, optional_import
+
+_ARRAY_LIMIT = 4096  # array container having more values than this is converted to bitmap container.
+_BITMAP_BYTES = 1 << 13  # 2**16 bits
+
+_SORT_RUN = 1 << 16  # without numpy, runs of this many integers are sorted and then merged.
+
+_POPCOUNT = bytes(bin(i).count('1') for i in range(256))  # used with "bytes.translate" to count bits.
+
+
+class SortedIntSet:
+    """
+    Immutable set of 64 bit signed integers held as a sorted 'array'.
+    It takes 8 bytes per integer (a Python 'set' takes about 60+ bytes
+    per integer) and membership is found using binary search.
+
+    Example:
+        s = SortedIntSet([5, 1, 3, 1])
+
+        3 in s -> True
+        4 in s -> False
+        list(s) -> [1, 3, 5]
+    """
+
+    def __init__(self, es: Iterable[int] = ()):
+        """
+        :param es: integers in range [-2**63, 2**63), otherwise OverflowError is thrown.
+                   TypeError is thrown for non integer element.
+        """
+
+        # integers are held in 'array' while sorting, not in a 'list' of Python ints.
+        data = array('q', es)
+        np = optional_import('numpy')
+
+        if np is not None:
+            np.frombuffer(data, dtype=np.int64).sort()  # sorts "data" in place.
+            self._data = SortedIntSet._unique(data)
+        else:
+            self._data = SortedIntSet._unique(SortedIntSet._merge_sorted_runs(data))
+
+    @staticmethod
+    def _merge_sorted_runs(data: array, run: int = _SORT_RUN) -> Iterable[int]:
+        """
+        sorts runs of "run" integers of "data" in place and merges them.
+
+        :param data:
+        :param run:
+        :return: sorted integers of "data".
+        """
+
+        for start in range(0, len(data), run):
+            data[start:start + run] = array('q', sorted(data[start:start + run]))
+
+        if len(data) <= run:
+            return data
+
+        view = memoryview(data)
+        return merge(*(view[start:start + run] for start in range(0, len(data), run)))
+
+    @staticmethod
+    def _unique(es: Iterable[int]) -> array:
+        """
+        :param es: sorted integers
+        :return: distinct integers of "es".
+        """
+
+        out = array('q')
+        append = out.append
+        last = None
+
+        for e in es:
+            if e != last:
+                append(e)
+                last = e
+
+        return out
+
+    def __contains__(self, e) -> bool:
+        data = self._data
+
+        try:
+            idx = bisect_left(data, e)
+        except TypeError:
+            return False
+
+        return idx < len(data) and data[idx] == e
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self) -> Iterable[int]:
+        return iter(self._data)
+
+    def nbytes(self) -> int:
+        """
+        :return: number of bytes used to hold integers.
+        """
+
+        return self._data.itemsize * len(self._data)
+
+
+class _ArrayContainer:
+    """
+    Sorted 'array' of 16 bit values, used when a chunk holds at most
+    _ARRAY_LIMIT values (2 bytes per value).
+    """
+
+    __slots__ = ('values',)
+
+    def __init__(self, values: array = None):
+        self.values = array('H') if values is None else values
+
+    def add(self, low: int) -> '_Container':
+        values = self.values
+        idx = bisect_left(values, low)
+
+        if idx < len(values) and values[idx] == low:
+            return self
+
+        if len(values) < _ARRAY_LIMIT:
+            values.insert(idx, low)
+            return self
+
+        container = _BitmapContainer.of(values)
+        return container.add(low)
+
+    def __contains__(self, low: int) -> bool:
+        values = self.values
+        idx = bisect_left(values, low)
+
+        return idx < len(values) and values[idx] == low
+
+    def __len__(self):
+        return len(self.values)
+
+    def copy(self) -> '_ArrayContainer':
+        return _ArrayContainer(array('H', self.values))
+
+    def __iter__(self) -> Iterable[int]:
+        return iter(self.values)
+
+    def nbytes(self) -> int:
+        return self.values.itemsize * len(self.values)
+
+
+class _BitmapContainer:
+    """
+    2**16 bits, used when a chunk holds more than _ARRAY_LIMIT values
+    (fixed 8 KB).
+    """
+
+    __slots__ = ('bits', 'size')
+
+    def __init__(self, bits: bytearray = None, size: int = None):
+        self.bits = bytearray(_BITMAP_BYTES) if bits is None else bits
+        self.size = sum(self.bits.translate(_POPCOUNT)) if size is None else size
+
+    @classmethod
+    def of(cls, values: Iterable[int]) -> '_BitmapContainer':
+        container = cls(size=0)
+
+        for low in values:
+            container.add(low)
+
+        return container
+
+    def add(self, low: int) -> '_Container':
+        bits, mask = self.bits, 1 << (low & 7)
+
+        if not bits[low >> 3] & mask:
+            bits[low >> 3] |= mask
+            self.size += 1
+
+        return self
+
+    def __contains__(self, low: int) -> bool:
+        return bool(self.bits[low >> 3] & (1 << (low & 7)))
+
+    def __len__(self):
+        return self.size
+
+    def copy(self) -> '_BitmapContainer':
+        return _BitmapContainer(bytearray(self.bits), self.size)
+
+    def __iter__(self) -> Iterable[int]:
+        for idx, byte in enumerate(self.bits):
+            if byte:
+                base = idx << 3
+
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield base | bit
+
+    def nbytes(self) -> int:
+        return _BITMAP_BYTES
+
+
+_Container = Union[_ArrayContainer, _BitmapContainer]
+
+
+def _as_int(c: _Container) -> int:
+    if isinstance(c, _BitmapContainer):
+        return int.from_bytes(c.bits, 'little')
+
+    return sum(1 << low for low in c.values)
+
+
+def _from_int(bits: int) -> Union[_Container, None]:
+    data = bytearray(bits.to_bytes(_BITMAP_BYTES, 'little'))
+    size = sum(data.translate(_POPCOUNT))
+
+    if size == 0:
+        return None
+
+    container = _BitmapContainer(data, size)
+
+    if size <= _ARRAY_LIMIT:
+        return _ArrayContainer(array('H', container))
+
+    return container
+
+
+def _union(a: _Container, b: _Container) -> _Container:
+    if isinstance(a, _ArrayContainer) and isinstance(b, _ArrayContainer) \
+            and len(a) + len(b) <= _ARRAY_LIMIT:
+        return _ArrayContainer(array('H', sorted(set(a.values).union(b.values))))
+
+    return _from_int(_as_int(a) | _as_int(b))
+
+
+def _intersection(a: _Container, b: _Container) -> Union[_Container, None]:
+    if isinstance(a, _ArrayContainer) or isinstance(b, _ArrayContainer):
+        small, large = (a, b) if len(a) <= len(b) else (b, a)
+        values = array('H', (low for low in small if low in large))
+
+        return _ArrayContainer(values) if values else None
+
+    return _from_int(_as_int(a) & _as_int(b))
+
+
+class Bitmap:
+    """
+    Compressed set of integers (roaring bitmap). Integers are divided into
+    chunks of 2**16 consecutive values; values of a chunk are held either
+    in a sorted 'array' of 16 bit integers (sparse chunk) or in a 8 KB
+    bitmap (dense chunk). So dense integer ids take about 1 bit each and
+    sparse ones about 2 bytes each plus per chunk overhead, compared to
+    about 60+ bytes per integer in a 'set'.
+
+    Any integer (negative or larger than 64 bits) can be added. Iteration
+    yields integers in increasing order.
+
+    Example:
+        b = Bitmap(range(0, 10 ** 6, 3))
+
+        len(b) -> 333334
+        300 in b -> True
+        301 in b -> False
+
+        len(b & Bitmap(range(0, 10 ** 6, 2))) -> 166667
+        len(b | Bitmap(range(0, 10 ** 6, 2))) -> 666667
+    """
+
+    def __init__(self, es: Iterable[int] = ()):
+        self._containers: Dict[int, _Container] = {}
+        self.update(es)
+
+    def add(self, e: int):
+        high = e >> 16
+        containers = self._containers
+        container = containers.get(high)
+
+        if container is None:
+            containers[high] = _ArrayContainer(array('H', (e & 0xFFFF,)))
+        else:
+            added = container.add(e & 0xFFFF)
+
+            if added is not container:
+                containers[high] = added
+
+    def update(self, es: Iterable[int]):
+        add = self.add
+
+        for e in es:
+            add(e)
+
+    def __contains__(self, e) -> bool:
+        if not isinstance(e, int):
+            return False
+
+        container = self._containers.get(e >> 16)
+        return container is not None and (e & 0xFFFF) in container
+
+    def __len__(self):
+        return sum(map(len, self._containers.values()))
+
+    def __iter__(self) -> Iterable[int]:
+        containers = self._containers
+
+        for high in sorted(containers):
+            base = high << 16
+            yield from (base | low for low in containers[high])
+
+    def __eq__(self, other):
+        if not isinstance(other, Bitmap):
+            return NotImplemented
+
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __or__(self, other: 'Bitmap') -> 'Bitmap':
+        out = Bitmap()
+        out._containers = {high: c.copy() for high, c in self._containers.items()}
+        out |= other
+
+        return out
+
+    def __ior__(self, other: 'Bitmap') -> 'Bitmap':
+        containers = self._containers
+
+        for high, container in other._containers.items():
+            current = containers.get(high)
+            containers[high] = container.copy() if current is None else _union(current, container)
+
+        return self
+
+    def __and__(self, other: 'Bitmap') -> 'Bitmap':
+        out = Bitmap()
+        mine, others = self._containers, other._containers
+
+        if len(others) < len(mine):
+            mine, others = others, mine
+
+        for high, container in mine.items():
+            if high in others:
+                common = _intersection(container, others[high])
+
+                if common is not None:
+                    out._containers[high] = common
+
+        return out
+
+    def union(self, *others: 'Bitmap') -> 'Bitmap':
+        out = self
+
+        for other in others:
+            out = out | other
+
+        return out
+
+    def intersection(self, *others: 'Bitmap') -> 'Bitmap':
+        out = self
+
+        for other in others:
+            out = out & other
+
+        return out
+
+    def nbytes(self) -> int:
+        """
+        :return: number of bytes used to hold integers.
+        """
+
+        return sum(c.nbytes() for c in self._containers.values())
+
+    def __repr__(self):
+        return f'Bitmap(size={len(self)})'
+
+
+if __name__ == 'streamAPI.utility.intset':
+    __all__ = get_functions_clazz(__name__, __file__)
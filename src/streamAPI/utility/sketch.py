@@ -0,0 +1,677 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+# This module implements probabilistic data structures (sketches) which
+# summarise large number of elements in small, bounded memory.
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from hashlib import blake2b
+from heapq import nlargest
+from itertools import accumulate
+from math import ceil, inf, log, sqrt
+from operator import itemgetter
+from pickle import dumps
+from random import Random
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from streamAPI.utility.utils import NIL, get_functions_clazz
+
+_MASK64 = (1 << 64) - 1
+
+
+def hash64(e: Any, seed: int = 0) -> int:
+    """
+    returns 64 bit hash of "e". Unlike builtin "hash", it does not change
+    between processes (hash of 'str' is randomised per process), so sketches
+    built in different processes can be merged.
+
+    Integers are hashed by mixing their bits (splitmix64), 'str' and 'bytes'
+    by hashing their bytes and other objects by hashing their pickled bytes.
+    Note that equal objects of different types (like 1 and 1.0) may have
+    different hashes.
+
+    :param e:
+    :param seed:
+    :return: an integer in [0, 2**64)
+    """
+
+    if type(e) is int and -_MASK64 <= e <= _MASK64:
+        z = (e + seed * 0x9E3779B97F4A7C15 + 0x9E3779B97F4A7C15) & _MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return z ^ (z >> 31)
+
+    if isinstance(e, str):
+        data = e.encode('utf-8', 'surrogatepass')
+    elif isinstance(e, (bytes, bytearray)):
+        data = bytes(e)
+    else:
+        data = dumps(e, protocol=4)
+
+    return int.from_bytes(blake2b(data, digest_size=8, salt=seed.to_bytes(8, 'little')).digest(), 'little')
+
+
+class BloomFilter:
+    """
+    Space efficient set membership structure. It never reports an added
+    element as absent, but may report an absent element as present with
+    probability of about "fp_rate" (as long as at most "capacity" elements
+    have been added).
+
+    Example:
+        bf = BloomFilter(capacity=1000, fp_rate=0.01)
+        bf.update(range(1000))
+
+        5 in bf -> True
+        5000 in bf -> False (True with probability about 0.01)
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01):
+        """
+        :param capacity: expected number of elements.
+        :param fp_rate: false positive rate at "capacity" elements.
+        """
+
+        assert capacity > 0, 'capacity must be positive.'
+        assert 0 < fp_rate < 1, 'fp_rate must be in (0, 1).'
+
+        self._capacity = capacity
+        self._fp_rate = fp_rate
+
+        self._bits = max(8, ceil(-capacity * log(fp_rate) / log(2) ** 2))
+        self._hashes = max(1, round(self._bits / capacity * log(2)))
+        self._data = bytearray((self._bits + 7) // 8)
+        self._size = 0
+
+    def _positions(self, e) -> Iterable[int]:
+        # double hashing: i-th position is h1 + i * h2
+        h = hash64(e)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        bits = self._bits
+
+        return ((h1 + i * h2) % bits for i in range(self._hashes))
+
+    def add(self, e):
+        data = self._data
+
+        for p in self._positions(e):
+            data[p >> 3] |= 1 << (p & 7)
+
+        self._size += 1
+
+    def update(self, es: Iterable):
+        for e in es:
+            self.add(e)
+
+    def __contains__(self, e) -> bool:
+        data = self._data
+        return all(data[p >> 3] & (1 << (p & 7)) for p in self._positions(e))
+
+    def union(self, other: 'BloomFilter') -> 'BloomFilter':
+        """
+        adds all elements of "other" (having same capacity and fp_rate) into
+        this filter.
+
+        :param other:
+        :return: self
+        """
+
+        if (self._bits, self._hashes) != (other._bits, other._hashes):
+            raise ValueError('BloomFilters of different size can not be merged.')
+
+        self._data = bytearray(a | b for a, b in zip(self._data, other._data))
+        self._size += other._size
+
+        return self
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def nbytes(self) -> int:
+        """
+        :return: number of bytes used to hold bits.
+        """
+
+        return len(self._data)
+
+    def __len__(self):
+        """
+        :return: number of "add" calls.
+        """
+
+        return self._size
+
+
+class ScalableBloomFilter:
+    """
+    BloomFilter which grows with number of elements, so that capacity need not
+    be known in advance. When current filter is full, a new filter with
+    "growth" times capacity and tighter false positive rate is added; so overall
+    false positive rate stays below "fp_rate".
+
+    Example:
+        bf = ScalableBloomFilter(fp_rate=0.001)
+        bf.update(range(10 ** 5))
+
+        5 in bf -> True
+    """
+
+    def __init__(self, fp_rate: float = 0.01, initial_capacity: int = 1024,
+                 growth: int = 2, tightening: float = 0.5):
+        """
+        :param fp_rate: overall false positive rate.
+        :param initial_capacity: capacity of first filter.
+        :param growth: capacity of each filter relative to previous one.
+        :param tightening: false positive rate of each filter relative to previous one.
+        """
+
+        assert 0 < fp_rate < 1, 'fp_rate must be in (0, 1).'
+        assert 0 < tightening < 1, 'tightening must be in (0, 1).'
+
+        self._fp_rate = fp_rate
+        self._growth = growth
+        self._tightening = tightening
+
+        self._filters: List[BloomFilter] = [BloomFilter(initial_capacity, fp_rate * (1 - tightening))]
+
+    def add(self, e):
+        current = self._filters[-1]
+
+        if len(current) >= current.capacity:
+            current = BloomFilter(current.capacity * self._growth,
+                                  current._fp_rate * self._tightening)
+            self._filters.append(current)
+
+        current.add(e)
+
+    def update(self, es: Iterable):
+        for e in es:
+            self.add(e)
+
+    def __contains__(self, e) -> bool:
+        return any(e in f for f in self._filters)
+
+    def nbytes(self) -> int:
+        return sum(f.nbytes() for f in self._filters)
+
+    def __len__(self):
+        return sum(map(len, self._filters))
+
+
+class HyperLogLog:
+    """
+    Estimates number of distinct elements using 2**precision registers of
+    one byte each (4 KB for precision 12). Relative standard error of estimate
+    is about 1.04 / sqrt(2**precision), i.e. 1.6% for precision 12 and 0.8% for
+    precision 14; it does not depend on number of elements.
+
+    Estimate uses improved estimator of Ertl ("New cardinality estimation
+    algorithms for HyperLogLog sketches", 2017) which corrects bias of raw
+    HyperLogLog estimate for small as well as large cardinalities without
+    empirical bias tables.
+
+    Sketches having same precision are merged using "merge", which gives same
+    sketch as if all elements were added to one sketch.
+
+    Example:
+        hll = HyperLogLog(precision=12)
+        hll.update(range(10 ** 5))
+
+        hll.estimate() -> about 100000 (within few percent)
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        :param precision: number of bits used to choose register, in [4, 18].
+        """
+
+        assert 4 <= precision <= 18, 'precision must be in [4, 18].'
+
+        self._p = precision
+        self._q = 64 - precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, e):
+        q = self._q
+        h = hash64(e)
+        rest = h & ((1 << q) - 1)
+        rank = q - rest.bit_length() + 1
+        registers, idx = self._registers, h >> q
+
+        if registers[idx] < rank:
+            registers[idx] = rank
+
+    def update(self, es: Iterable):
+        q = self._q
+        mask = (1 << q) - 1
+        registers = self._registers
+
+        for e in es:
+            h = hash64(e)
+            rank = q - (h & mask).bit_length() + 1
+            idx = h >> q
+
+            if registers[idx] < rank:
+                registers[idx] = rank
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        adds all elements of "other" (having same precision) into this sketch.
+
+        :param other:
+        :return: self
+        """
+
+        if self._p != other._p:
+            raise ValueError('HyperLogLogs of different precision can not be merged.')
+
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    def estimate(self) -> float:
+        """
+        :return: estimated number of distinct elements added.
+        """
+
+        m, q = len(self._registers), self._q
+
+        histogram = [0] * (q + 2)
+
+        for r in self._registers:
+            histogram[r] += 1
+
+        z = m * _tau(1 - histogram[q + 1] / m)
+
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+
+        z += m * _sigma(histogram[0] / m)
+
+        if z == inf:
+            return 0.0
+
+        return m * m / (2 * log(2) * z)
+
+    @property
+    def precision(self) -> int:
+        return self._p
+
+    def nbytes(self) -> int:
+        return len(self._registers)
+
+    def __len__(self):
+        """
+        :return: estimate rounded to integer.
+        """
+
+        return round(self.estimate())
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang and Liberty, "Optimal Quantile
+    Approximation in Streams", 2016). It holds a hierarchy of compactors; an
+    element at level h stands for 2**h elements. When a level is full, it is
+    sorted and every other element (starting at random offset) is promoted to
+    next level. Capacity of lower levels shrinks geometrically, so about
+    3 * k elements are held irrespective of number of elements.
+
+    Rank error of "quantile" is about 2 / k (with high probability), i.e. 1%
+    of number of elements for k = 200. Minimum and maximum elements are
+    tracked exactly (quantiles 0 and 1). Elements must be comparable.
+
+    Example:
+        kll = KLLSketch(k=200)
+        kll.update(range(10 ** 5))
+
+        kll.quantile(0.5) -> about 50000
+    """
+
+    def __init__(self, k: int = 200, seed: int = None):
+        """
+        :param k: capacity of top level, larger value gives more accurate quantiles.
+        :param seed: seed of random offsets used while compacting.
+        """
+
+        assert k >= 8, 'k must be at least 8.'
+
+        self._k = k
+        self._rnd = Random(seed)
+        self._compactors: List[list] = [[]]
+        self._size = 0  # number of elements held
+        self._max_size = self._capacity(0)
+        self._count = 0  # number of elements added
+        self._min = NIL
+        self._max = NIL
+
+    @property
+    def k(self) -> int:
+        return self._k
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._compactors) - h - 1
+        return max(2, ceil(self._k * (2 / 3) ** depth))
+
+    def _grow(self):
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self._compactors)))
+
+    def _compress(self):
+        compactors = self._compactors
+
+        for h in range(len(compactors)):
+            level = compactors[h]
+
+            if len(level) >= self._capacity(h):
+                if h + 1 == len(compactors):
+                    self._grow()
+
+                level.sort()
+                odd = level.pop() if len(level) % 2 else NIL
+                compactors[h + 1].extend(level[self._rnd.getrandbits(1)::2])
+
+                level.clear()
+
+                if odd is not NIL:
+                    level.append(odd)
+
+                self._size = sum(map(len, compactors))
+
+                if self._size < self._max_size:
+                    break
+
+    def _update_extremes(self, low, high):
+        if self._min is NIL or low < self._min:
+            self._min = low
+
+        if self._max is NIL or high > self._max:
+            self._max = high
+
+    def add(self, e):
+        self._compactors[0].append(e)
+        self._size += 1
+        self._count += 1
+
+        self._update_extremes(e, e)
+
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update(self, es: Iterable):
+        """
+        adds elements of "es" in bulk; elements are appended to lowest level
+        at once and compacted (using builtin sort) only when sketch is full.
+
+        :param es:
+        """
+
+        level = self._compactors[0]
+        before = len(level)
+
+        level.extend(es)
+
+        added = len(level) - before
+        self._size += added
+        self._count += added
+
+        if added:
+            self._update_extremes(min(level[before:]), max(level[before:]))
+
+        while self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """
+        adds all elements of "other" into this sketch.
+
+        :param other:
+        :return: self
+        """
+
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+
+        for level, other_level in zip(self._compactors, other._compactors):
+            level.extend(other_level)
+
+        self._size = sum(map(len, self._compactors))
+        self._count += other._count
+
+        if other._count:
+            self._update_extremes(other._min, other._max)
+
+        while self._size >= self._max_size:
+            self._compress()
+
+        return self
+
+    def _weighted(self) -> Tuple[list, list]:
+        """
+        :return: held elements in sorted order and their cumulative weights.
+        """
+
+        pairs = sorted((e, 1 << h) for h, level in enumerate(self._compactors) for e in level)
+        return [e for e, _ in pairs], list(accumulate(w for _, w in pairs))
+
+    def quantile(self, q: float):
+        """
+        :param q: in [0, 1]
+        :return: element whose rank is about q * number of elements; None if sketch is empty.
+        """
+
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs: Sequence[float]) -> list:
+        """
+        :param qs: each in [0, 1]
+        :return: list of elements corresponding to "qs".
+        """
+
+        if not 0 <= min(qs, default=0) <= max(qs, default=0) <= 1:
+            raise ValueError('quantiles must be in [0, 1].')
+
+        if self._count == 0:
+            return [None] * len(qs)
+
+        es, weights = self._weighted()
+        total = weights[-1]
+
+        def quantile(q):
+            if q == 0:
+                return self._min
+
+            if q == 1:
+                return self._max
+
+            return es[min(bisect_left(weights, q * total), len(es) - 1)]
+
+        return [quantile(q) for q in qs]
+
+    def rank(self, e) -> float:
+        """
+        :param e:
+        :return: approximate fraction of elements less than or equal to "e".
+        """
+
+        if self._count == 0:
+            return 0.0
+
+        es, weights = self._weighted()
+        idx = bisect_right(es, e)
+
+        return weights[idx - 1] / weights[-1] if idx else 0.0
+
+    def __len__(self):
+        """
+        :return: number of elements added.
+        """
+
+        return self._count
+
+
+class FrequentItem(NamedTuple):
+    """
+    true frequency of "item" is in [count, count + error].
+    """
+
+    item: Any
+    count: int
+    error: int
+
+
+class FrequentItems:
+    """
+    Finds frequent elements using at most 2 * capacity counters (Misra-Gries
+    summary, equivalent to Space-Saving). When there are too many counters,
+    (capacity + 1)-th largest count is subtracted from all counters and non
+    positive counters are dropped.
+
+    Count of an element underestimates its frequency by at most n / (capacity + 1),
+    where n is number of elements; so every element occurring more than that
+    many times is surely held.
+
+    Elements are counted in bulk using "Counter" and summaries are merged by
+    adding counters (Agarwal et al., "Mergeable summaries", 2012) with the same
+    error bound.
+
+    Example:
+        fi = FrequentItems(capacity=10)
+        fi.update([1] * 50 + [2] * 30 + list(range(100, 200)))
+
+        fi.top(2) -> [FrequentItem(item=1, count=49, error=1), FrequentItem(item=2, count=29, error=1)]
+    """
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity: number of counters kept after pruning.
+        """
+
+        assert capacity > 0, 'capacity must be positive.'
+
+        self._capacity = capacity
+        self._counts: Dict[Any, int] = {}
+        self._error = 0  # total amount subtracted from counters.
+        self._n = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def _prune(self):
+        counts = self._counts
+
+        if len(counts) > 2 * self._capacity:
+            t = nlargest(self._capacity + 1, counts.values())[-1]
+
+            self._counts = {e: c - t for e, c in counts.items() if c > t}
+            self._error += t
+
+    def add(self, e):
+        counts = self._counts
+        counts[e] = counts.get(e, 0) + 1
+        self._n += 1
+
+        self._prune()
+
+    def update(self, es: Iterable):
+        counts = self._counts
+
+        for e, c in Counter(es).items():
+            counts[e] = counts.get(e, 0) + c
+            self._n += c
+
+        self._prune()
+
+    def merge(self, other: 'FrequentItems') -> 'FrequentItems':
+        """
+        adds all elements of "other" (having same capacity) into this summary.
+
+        :param other:
+        :return: self
+        """
+
+        if self._capacity != other._capacity:
+            raise ValueError('FrequentItems of different capacity can not be merged.')
+
+        counts = self._counts
+
+        for e, c in other._counts.items():
+            counts[e] = counts.get(e, 0) + c
+
+        self._error += other._error
+        self._n += other._n
+
+        self._prune()
+
+        return self
+
+    def top(self, k: int) -> List[FrequentItem]:
+        """
+        :param k:
+        :return: "k" most frequent elements in decreasing order of count.
+        """
+
+        error = self._error
+        return [FrequentItem(e, c, error) for e, c in nlargest(k, self._counts.items(), key=itemgetter(1))]
+
+    @property
+    def error(self) -> int:
+        """
+        :return: maximum underestimation of counts, at most n / (capacity + 1).
+        """
+
+        return self._error
+
+    def __getitem__(self, e) -> int:
+        """
+        :param e:
+        :return: lower bound of frequency of "e".
+        """
+
+        return self._counts.get(e, 0)
+
+    def __len__(self):
+        """
+        :return: number of elements added.
+        """
+
+        return self._n
+
+
+def _sigma(x: float) -> float:
+    if x == 1:
+        return inf
+
+    y, z = 1, x
+
+    while True:
+        x *= x
+        z_old, z = z, z + x * y
+        y += y
+
+        if z == z_old:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x == 0 or x == 1:
+        return 0.0
+
+    y, z = 1.0, 1 - x
+
+    while True:
+        x = sqrt(x)
+        z_old = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+
+        if z == z_old:
+            return z / 3
+
+
+if __name__ == 'streamAPI.utility.sketch':
+    __all__ = get_functions_clazz(__name__, __file__)
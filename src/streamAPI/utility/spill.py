@@ -0,0 +1,232 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from pickle import HIGHEST_PROTOCOL, dump, load
+from tempfile import TemporaryFile
+from typing import Any, Iterable, Tuple
+
+from streamAPI.utility.utils import get_functions_clazz
+
+
+class SpillFile:
+    """
+    Append only temporary file holding pickled records. It is used by
+    operations which would otherwise hold an unbounded number of elements
+    in memory.
+
+    Records are read back either sequentially using "iter" or one at a time
+    from a byte offset using "read_at", which allows several readers to
+    consume the same file at their own pace.
+
+    Example:
+        spill = SpillFile()
+        spill.extend(range(3))
+
+        list(spill) -> [0, 1, 2]
+
+        record, offset = spill.read_at(0) -> (0, <offset of second record>)
+    """
+
+    def __init__(self, dir: str = None):
+        """
+        :param dir: directory in which temporary file is created, if None then
+                    default temporary directory is used.
+        """
+
+        self._dir = dir
+        self._file = None
+        self._size = 0
+        self._end = 0
+
+    def _handle(self):
+        if self._file is None:
+            self._file = TemporaryFile(dir=self._dir)
+
+        return self._file
+
+    def append(self, e: Any):
+        """
+        pickles "e" at the end of file.
+
+        :param e:
+        """
+
+        f = self._handle()
+        f.seek(self._end)
+
+        dump(e, f, HIGHEST_PROTOCOL)
+
+        self._end = f.tell()
+        self._size += 1
+
+    def extend(self, es: Iterable[Any]):
+        """
+        pickles all elements of "es" at the end of file.
+
+        :param es:
+        """
+
+        f = self._handle()
+        f.seek(self._end)
+
+        for e in es:
+            dump(e, f, HIGHEST_PROTOCOL)
+            self._size += 1
+
+        self._end = f.tell()
+
+    def read_at(self, offset: int) -> Tuple[Any, int]:
+        """
+        reads record starting at byte "offset".
+
+        :param offset:
+        :return: tuple of record and offset of next record.
+        """
+
+        if offset >= self._end:
+            raise EOFError(f'No record at offset: {offset}')
+
+        f = self._handle()
+        f.seek(offset)
+
+        return load(f), f.tell()
+
+    @property
+    def end(self) -> int:
+        """
+        byte offset just after the last record.
+        :return:
+        """
+
+        return self._end
+
+    def clear(self):
+        """
+        removes all records, file is kept for reuse.
+        """
+
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
+
+        self._size = 0
+        self._end = 0
+
+    def close(self):
+        """
+        closes (and thereby deletes) underlying temporary file.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        self._size = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self) -> Iterable[Any]:
+        offset = 0
+
+        while offset < self._end:
+            e, offset = self.read_at(offset)
+            yield e
+
+    def __del__(self):
+        self.close()
+
+
+class PartitionedSpill:
+    """
+    Spills records into one of "partitions" SpillFiles chosen by hash of
+    a key, so that all records having same key end up in same partition.
+    Partitions are then processed one at a time.
+
+    "salt" changes partition of keys; it is used when a partition is too
+    large and has to be partitioned again.
+
+    Example:
+        spill = PartitionedSpill(partitions=4)
+
+        for e in range(10):
+            spill.append(e % 3, e)
+
+        for partition in spill.drain():
+            print(list(partition)) # all elements having same "e % 3" are printed together.
+    """
+
+    def __init__(self, partitions: int = 64, dir: str = None, salt: int = 0):
+        """
+        :param partitions: number of partitions
+        :param dir: directory in which temporary files are created.
+        :param salt:
+        """
+
+        assert partitions > 0, 'number of partitions must be positive.'
+
+        self._files = tuple(SpillFile(dir=dir) for _ in range(partitions))
+        self._salt = salt
+
+    def partition_of(self, k) -> int:
+        """
+        :param k: key
+        :return: partition index of key "k".
+        """
+
+        return hash((self._salt, k)) % len(self._files)
+
+    def append(self, k, e: Any):
+        """
+        spills "e" into partition of key "k".
+
+        :param k:
+        :param e:
+        """
+
+        self._files[self.partition_of(k)].append(e)
+
+    def __getitem__(self, idx: int) -> SpillFile:
+        """
+        :param idx: partition index
+        :return: SpillFile of partition "idx"
+        """
+
+        return self._files[idx]
+
+    @property
+    def partitions(self) -> int:
+        """
+        :return: number of partitions.
+        """
+
+        return len(self._files)
+
+    def drain(self) -> Iterable[SpillFile]:
+        """
+        yields non empty partitions one by one. Partition is closed once
+        next partition is requested.
+
+        :return:
+        """
+
+        for f in self._files:
+            if len(f):
+                try:
+                    yield f
+                finally:
+                    f.close()
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+    def __len__(self):
+        return sum(map(len, self._files))
+
+
+if __name__ == 'streamAPI.utility.spill':
+    __all__ = get_functions_clazz(__name__, __file__)
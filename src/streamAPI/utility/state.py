@@ -0,0 +1,269 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+# This module implements keyed state used by stateful stream operations
+# (see Stream.map_with_state).
+
+import sqlite3
+from collections import OrderedDict
+from pickle import HIGHEST_PROTOCOL, dumps, loads
+from time import time
+from typing import Any, Callable, Hashable, Set
+
+from streamAPI.utility.cache import fingerprint
+from streamAPI.utility.utils import NIL, get_functions_clazz
+
+_SCHEMA = ('CREATE TABLE IF NOT EXISTS state ('
+           'fp BLOB PRIMARY KEY, value BLOB NOT NULL, touched REAL NOT NULL) WITHOUT ROWID',)
+
+_COMMIT_EVERY = 1024  # spilled states are committed in transactions of this many writes.
+
+
+class StateStore:
+    """
+    Holds state of keys. State of a key expires if key is not accessed for
+    "ttl" seconds. If more than "max_keys" states are held in memory, then
+    least recently used states are either dropped or, if "path" is given,
+    spilled into sqlite file "path" (and loaded back on access). So memory
+    stays bounded on unbounded streams.
+
+    If "path" is given, then all states are written to it on "close"; so a
+    StateStore opened later on same file continues with those states.
+
+    Note that keys held in memory are compared by equality (so 1, 1.0 and
+    True are same key), whereas spilled keys are compared by "fingerprint"
+    of pickled key (so they are different keys once spilled); keys of a
+    store should therefore be of one type.
+
+    Example:
+        store = StateStore(ttl=1800, max_keys=10 ** 5, path='sessions.db')
+
+        clicks = store.get('user-1', 0)
+        store.put('user-1', clicks + 1)
+
+        store.close()
+    """
+
+    def __init__(self, ttl: float = None, max_keys: int = None, path: str = None,
+                 timer: Callable[[], float] = time):
+        """
+        :param ttl: seconds after last access when state expires, None means never.
+        :param max_keys: maximum number of states held in memory, None means no limit.
+        :param path: sqlite file in which states are spilled and persisted.
+        :param timer: gives current time in seconds; since expiry time is persisted,
+                      it must not reset on restart.
+        """
+
+        assert ttl is None or ttl > 0, 'ttl must be positive.'
+        assert max_keys is None or max_keys > 0, 'max_keys must be positive.'
+
+        self._ttl = ttl
+        self._max_keys = max_keys
+        self._timer = timer
+
+        # key -> (state, last access time); in order of access.
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+
+        self._conn = None
+        self._writes = 0
+
+        # keys spilled by this store; file is looked up only for these keys
+        # and, if file already had states when opened, for every key.
+        self._spilled: Set[Hashable] = set()
+        self._persisted = False
+
+        if path is not None:
+            # stream consuming the store may be evaluated in another thread (see Stream.prefetch).
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+
+            with self._conn:
+                for statement in _SCHEMA:
+                    self._conn.execute(statement)
+
+            self._persisted = self._conn.execute('SELECT 1 FROM state LIMIT 1').fetchone() is not None
+
+        self.evictions = 0  # states moved out of memory (dropped or spilled).
+        self.expirations = 0
+
+    def _expired(self, touched: float, now: float) -> bool:
+        return self._ttl is not None and touched + self._ttl <= now
+
+    def get(self, k: Hashable, default=None):
+        """
+        :param k:
+        :param default:
+        :return: state of "k" or "default" if "k" has no state (or it has expired).
+        """
+
+        now = self._timer()
+        entry = self._data.get(k, NIL)
+
+        if entry is NIL:
+            entry = self._unspill(k)
+
+            if entry is NIL:
+                return default
+
+        state, touched = entry
+
+        if self._expired(touched, now):
+            del self._data[k]
+            self.expirations += 1
+            return default
+
+        self._data[k] = state, now
+        self._data.move_to_end(k)
+
+        self._shrink(now)
+
+        return state
+
+    def put(self, k: Hashable, state: Any):
+        now = self._timer()
+        data = self._data
+
+        # a spilled (older) state of "k" is never read while "k" is in memory and is
+        # replaced when "k" is spilled again.
+        data[k] = state, now
+        data.move_to_end(k)
+
+        self._shrink(now)
+
+    def delete(self, k: Hashable):
+        """
+        removes state of "k".
+
+        :param k:
+        """
+
+        self._data.pop(k, None)
+
+        if self._may_be_spilled(k):
+            self._spilled.discard(k)
+            self._conn.execute('DELETE FROM state WHERE fp = ?', (fingerprint(k),))
+            self._wrote()
+
+    def _may_be_spilled(self, k: Hashable) -> bool:
+        return self._conn is not None and (self._persisted or k in self._spilled)
+
+    def __contains__(self, k: Hashable) -> bool:
+        entry = self._data.get(k, NIL)
+
+        if entry is NIL and self._may_be_spilled(k):
+            row = self._conn.execute('SELECT touched FROM state WHERE fp = ?', (fingerprint(k),)).fetchone()
+            entry = NIL if row is None else (None, row[0])
+
+        return entry is not NIL and not self._expired(entry[1], self._timer())
+
+    def _shrink(self, now: float):
+        data = self._data
+
+        if self._ttl is not None:
+            # states are in order of access, so expired states are at front.
+            while data:
+                k, (state, touched) = next(iter(data.items()))
+
+                if not self._expired(touched, now):
+                    break
+
+                del data[k]
+                self.expirations += 1
+
+        if self._max_keys is not None:
+            while len(data) > self._max_keys:
+                k, (state, touched) = data.popitem(last=False)
+                self.evictions += 1
+
+                if self._conn is not None:
+                    self._spill(k, state, touched)
+                    self._spilled.add(k)
+
+    def _spill(self, k: Hashable, state: Any, touched: float):
+        self._conn.execute('INSERT OR REPLACE INTO state VALUES (?, ?, ?)',
+                           (fingerprint(k), dumps(state, HIGHEST_PROTOCOL), touched))
+        self._wrote()
+
+    def _unspill(self, k: Hashable):
+        """
+        moves spilled state of "k" into memory.
+
+        :param k:
+        :return: (state, last access time) or NIL if "k" is not spilled.
+        """
+
+        if not self._may_be_spilled(k):
+            return NIL
+
+        self._spilled.discard(k)
+
+        fp = fingerprint(k)
+        row = self._conn.execute('SELECT value, touched FROM state WHERE fp = ?', (fp,)).fetchone()
+
+        if row is None:
+            return NIL
+
+        self._conn.execute('DELETE FROM state WHERE fp = ?', (fp,))
+        self._wrote()
+
+        entry = self._data[k] = loads(row[0]), row[1]
+        return entry
+
+    def _wrote(self):
+        self._writes += 1
+
+        if self._writes >= _COMMIT_EVERY:
+            self._conn.commit()
+            self._writes = 0
+
+    def spilled(self) -> int:
+        """
+        :return: number of states held in sqlite file.
+        """
+
+        if self._conn is None:
+            return 0
+
+        return self._conn.execute('SELECT COUNT(*) FROM state').fetchone()[0]
+
+    def close(self):
+        """
+        writes all states (which have not expired) to sqlite file and closes it.
+        Without "path", states are dropped.
+        """
+
+        conn = self._conn
+
+        if conn is not None:
+            now = self._timer()
+
+            for k, (state, touched) in self._data.items():
+                if not self._expired(touched, now):
+                    self._spill(k, state, touched)
+
+            if self._ttl is not None:
+                conn.execute('DELETE FROM state WHERE touched <= ?', (now - self._ttl,))
+
+            conn.commit()
+            conn.close()
+
+            self._conn = None
+
+        self._data.clear()
+        self._spilled.clear()
+
+    def __len__(self):
+        """
+        :return: number of states held in memory.
+        """
+
+        return len(self._data)
+
+    def __repr__(self):
+        return (f'StateStore(ttl={self._ttl}, max_keys={self._max_keys}, size={len(self)}, '
+                f'evictions={self.evictions}, expirations={self.expirations})')
+
+
+if __name__ == 'streamAPI.utility.state':
+    __all__ = get_functions_clazz(__name__, __file__)
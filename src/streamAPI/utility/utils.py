@@ -6,9 +6,11 @@ email: shivkj001@gmail.com
 from csv import DictReader, reader as ListReader
 from datetime import date, datetime, timedelta
 from functools import partial, singledispatch
+from itertools import islice
 from operator import itemgetter
 from os import walk
 from os.path import abspath, join
+from random import Random
 from typing import Callable, Dict, Iterable, List, Tuple, Union
 
 from streamAPI.utility.Types import DateTime, Filter, Function, PathGenerator, T, X, Y
@@ -205,7 +207,7 @@ def get_chunk(itr: Iterable[T], rng: Union[range, int],
     if not rng:
         raise ValueError("Specified 'rng' argument is invalid")
 
-    return return_type(item[1] for item in zip(rng, itr))
+    return return_type(islice(itr, len(rng)))
 
 
 # -------------------------- Comparator ----------------------------------
@@ -249,6 +251,48 @@ def comparing(func: Function):
     return partial(default_comp, func=func)
 
 
+def as_random(seed: Union[int, Random, None] = None) -> Random:
+    """
+    creates random number generator from "seed". If "seed" is already a
+    random number generator (like testHelper.RND), then it is used as it is.
+
+    :param seed: None, integer (or any hashable) or instance of "random.Random"
+    :return:
+    """
+
+    return seed if isinstance(seed, Random) else Random(seed)
+
+
+_OPTIONAL_MODULES = {}  # module name -> module (or None if not installed)
+
+
+def optional_import(module_name: str):
+    """
+    imports module "module_name" if it is installed; it is used for
+    optional dependencies (like numpy) which speed up some operations.
+    Result is cached, so it is cheap to call repeatedly.
+
+    Example:
+        np = optional_import('numpy')
+
+        if np is not None:
+            ... # vectorized implementation
+
+    :param module_name:
+    :return: module or None if module is not installed.
+    """
+
+    if module_name not in _OPTIONAL_MODULES:
+        from importlib import import_module
+
+        try:
+            _OPTIONAL_MODULES[module_name] = import_module(module_name)
+        except ImportError:
+            _OPTIONAL_MODULES[module_name] = None
+
+    return _OPTIONAL_MODULES[module_name]
+
+
 # ------------ importing function defined only in this module-------------
 
 
@@ -307,6 +307,22 @@ class TOTest(TestCase):
         self.assertTrue(_mult.present())
         self.assertEqual(_mult.get(), factorial(9))
 
+    def test_16(self):
+        # elements are folded from left starting with initial point, like Stream.reduce.
+        def add_square(a, x): return a + x * x
+
+        self.assertEqual(Stream([1, 2, 3]).collect(Reduce(0, bi_func=add_square)).get(), 14)
+        self.assertEqual(Stream([1, 2, 3]).reduce(0, bi_func=add_square).get(), 14)
+
+        data = range(20)
+        out_target = {k: sum(e * e for e in data if e % 3 == k) for k in range(3)}
+
+        for chunk_size in (None, 4):
+            out = Stream(data).collect(GroupingBy(lambda e: e % 3, Reduce(0, bi_func=add_square)),
+                                       chunk_size=chunk_size)
+
+            self.assertDictEqual({k: v.get() for k, v in out.items()}, out_target)
+
 
 if __name__ == '__main__':
     main()
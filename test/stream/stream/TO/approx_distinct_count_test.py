@@ -0,0 +1,55 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import ApproxDistinctCount, GroupingBy
+from streamAPI.testHelper import random
+
+
+class ApproxDistinctCountTest(TestCase):
+    def test_1(self):
+        rnd = random()
+
+        for size in (0, 1, 10, 1000, 50000):
+            data = [rnd.randrange(10 ** 9) for _ in range(size)]
+            distinct = len(set(data))
+
+            with self.subTest(size=size):
+                out = Stream(data).collect(ApproxDistinctCount())
+                # error is about 1.6% for default precision; 5 standard errors are allowed.
+                self.assertLessEqual(abs(out - distinct), 0.08 * distinct + 1)
+
+    def test_2(self):
+        data = [str(i % 20000) for i in range(100000)]
+
+        out = Stream(data).collect(ApproxDistinctCount(precision=14))
+        self.assertLessEqual(abs(out - 20000), 0.04 * 20000)
+
+    def test_3(self):
+        data = random().int_range(0, 10 ** 6, size=20000)
+
+        out = (ParallelStream(data)
+               .collect_concurrent(ApproxDistinctCount(), dispatch_size=1000))
+
+        # merging sketches gives same sketch as adding all elements to one sketch.
+        self.assertEqual(out, Stream(data).collect(ApproxDistinctCount()))
+
+        with self.assertRaises(ValueError):
+            ApproxDistinctCount(10).combine(ApproxDistinctCount(12))
+
+    def test_4(self):
+        data = random().int_range(0, 10 ** 6, size=20000)
+
+        out = Stream(data).collect(GroupingBy(lambda x: x % 3, ApproxDistinctCount()))
+
+        for k, count in out.items():
+            distinct = len({e for e in data if e % 3 == k})
+            self.assertLessEqual(abs(count - distinct), 0.08 * distinct)
+
+
+if __name__ == '__main__':
+    main()
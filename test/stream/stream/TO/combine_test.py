@@ -0,0 +1,85 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import operator as op
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import (Aggregating, Averaging, BottomK, CollectAndThen, Counting,
+                                 GroupingBy, Joining, Mapping, MaxBy, MinBy, Reduce, Summing,
+                                 ToBitmapSet, ToLinkedList, ToList, ToMap, ToSet, TopK)
+from streamAPI.testHelper import random
+from streamAPI.utility import comparing
+
+
+def mod_7(x): return x % 7
+
+
+def mod_3(x): return x % 3
+
+
+def square(x): return x * x
+
+
+def _collectors():
+    return (ToList(), ToLinkedList(), ToSet(), ToBitmapSet(), Counting(), Summing(), Averaging(),
+            MaxBy(comparing(mod_7)), MinBy(comparing(mod_7)), Reduce(bi_func=op.add),
+            Reduce(0, bi_func=op.add), CollectAndThen(ToSet(), len), Mapping(square, Summing()),
+            ToMap(mod_7, square, merger_on_conflict=op.add),
+            Aggregating({'n': Counting(), 'max': MaxBy()}),
+            GroupingBy(mod_7), GroupingBy(mod_7, Averaging()),
+            TopK(5, key=mod_7), BottomK(5, key=mod_7, ties='last'), GroupingBy(mod_7, TopK(3)),
+            GroupingBy(mod_7, Reduce(bi_func=op.add)), GroupingBy(mod_7, MaxBy(comparing(mod_3))),
+            GroupingBy(mod_7, GroupingBy(mod_3, Mapping(square, ToList()))),
+            GroupingBy(mod_7, agg={'s': ToSet(), 'n': CollectAndThen(Counting(), str)}),
+            GroupingBy(mod_7, Mapping(str, Joining(','))))
+
+
+class CombineTest(TestCase):
+    def test_1(self):
+        data = random().int_range(1, 100, size=1000)
+
+        for collector in _collectors():
+            out_target = Stream(data).collect(collector.supply())
+
+            for parts in (2, 3, 10):
+                with self.subTest(collector=collector.__class__.__name__, parts=parts):
+                    size = len(data) // parts + 1
+                    partial_results = []
+
+                    for i in range(0, len(data), size):
+                        c = collector.supply()
+                        c.consume_many(data[i:i + size])
+                        partial_results.append(c)
+
+                    out = partial_results[0]
+
+                    for c in partial_results[1:]:
+                        out = out.combine(c)
+
+                    self.assertEqual(out.finish(), out_target)
+
+    def test_2(self):
+        c1, c2 = ToMap(mod_7), ToMap(mod_7)
+        c1.consume(1)
+        c2.consume(8)
+
+        with self.assertRaises(ValueError):
+            c1.combine(c2)
+
+    def test_3(self):
+        c1, c2 = MaxBy(), MaxBy()
+        c2.consume(5)
+
+        self.assertEqual(c1.combine(c2).finish().get(), 5)
+        self.assertEqual(c2.combine(MaxBy()).finish().get(), 5)
+
+    def test_4(self):
+        with self.assertRaises(ValueError):
+            GroupingBy(mod_7, max_buckets=3).combine(GroupingBy(mod_7, max_buckets=3))
+
+
+if __name__ == '__main__':
+    main()
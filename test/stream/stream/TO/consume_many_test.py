@@ -0,0 +1,115 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import operator as op
+from functools import reduce
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import (Averaging, BottomK, CollectAndThen, Collector, Counting,
+                                 GroupingBy, Joining, Mapping, MaxBy, MinBy, Reduce, Summing,
+                                 ToBitmapSet, ToLinkedList, ToList, ToMap, ToSet, TopK)
+from streamAPI.testHelper import random
+from streamAPI.utility import comparing
+
+
+def _collectors():
+    def mod_7(x): return x % 7
+
+    def square(x): return x * x
+
+    return (ToList(), ToLinkedList(), ToSet(), ToBitmapSet(), Counting(), Summing(), Averaging(),
+            MaxBy(), MinBy(), MaxBy(comparing(mod_7)), MinBy(comparing(mod_7)),
+            Reduce(bi_func=op.add), Reduce(10, bi_func=op.add),
+            CollectAndThen(ToSet(), len), Mapping(square, Summing()),
+            ToMap(mod_7, square, merger_on_conflict=op.add),
+            GroupingBy(mod_7), GroupingBy(mod_7, Counting()),
+            TopK(5, key=mod_7), BottomK(5, key=mod_7, ties='last'), GroupingBy(mod_7, TopK(3)),
+            GroupingBy(mod_7, GroupingBy(lambda x: x % 3, Mapping(square, ToList()))))
+
+
+class ConsumeManyTest(TestCase):
+    def test_1(self):
+        rnd = random()
+        data = rnd.int_range(1, 100, size=1000)
+
+        for collector in _collectors():
+            # consuming one by one
+            one_by_one = collector.supply()
+
+            for e in data:
+                one_by_one.consume(e)
+
+            for chunk_size in (1, 3, 64, 2000):
+                with self.subTest(collector=collector.__class__.__name__, chunk_size=chunk_size):
+                    out = Stream(data).collect(collector.supply(), chunk_size=chunk_size)
+                    self.assertEqual(out, one_by_one.finish())
+
+    def test_2(self):
+        for collector in _collectors():
+            if isinstance(collector, Averaging):
+                continue  # average of no element is not defined.
+
+            with self.subTest(collector=collector.__class__.__name__):
+                bulk = collector.supply()
+                bulk.consume_many(iter(()))
+
+                self.assertEqual(bulk.finish(), collector.supply().finish())
+
+    def test_3(self):
+        data = tuple('ABCDE')
+
+        collector = Joining(',')
+        collector.consume_many(iter(data[:2]))
+        collector.consume_many(data[2:])
+
+        self.assertEqual(collector.finish(), 'A,B,C,D,E')
+
+    def test_4(self):
+        class Doubling(Collector):
+            """defines only "consume", so default "consume_many" is used."""
+
+            def __init__(self):
+                self._data = []
+
+            def supply(self):
+                return Doubling()
+
+            def consume(self, e):
+                self._data.append(2 * e)
+
+            def finish(self):
+                return self._data
+
+        self.assertListEqual(Stream(range(5)).collect(Doubling(), chunk_size=2), [0, 2, 4, 6, 8])
+
+    def test_5(self):
+        collector = Reduce(bi_func=op.mul)
+        collector.consume_many(())
+        collector.consume_many(iter(range(1, 4)))
+        collector.consume_many([4, 5])
+
+        self.assertEqual(collector.finish().get(), 120)
+
+    def test_6(self):
+        # same rounding as consuming one by one.
+        data = [1e16, 1.0, -1e16] * 10 + [0.1] * 10
+
+        for chunk_size in (None, 3, 100):
+            with self.subTest(chunk_size=chunk_size):
+                out = Stream(data).collect(Summing(), chunk_size=chunk_size)
+                self.assertEqual(out, reduce(op.add, data, 0))
+
+    def test_7(self):
+        seen = []
+
+        out = Stream(range(5)).peek(seen.append).collect(Mapping(lambda e: len(seen)))
+
+        # by default, collector sees an element before next element is pulled.
+        self.assertListEqual(out, [1, 2, 3, 4, 5])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import operator as op
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import (Aggregating, Averaging, CollectAndThen, Counting, GroupingBy,
+                                 Mapping, MaxBy, MinBy, Reduce, Summing, ToList, ToSet)
+from streamAPI.testHelper import random
+from streamAPI.utility import comparing
+
+
+class PlainGroupingBy(GroupingBy):
+    """GroupingBy holding one Collector per bucket."""
+
+    def __init__(self, group_by, downstream=None, *, agg=None):
+        super().__init__(group_by, downstream, agg=agg)
+        self._state = None
+
+    def supply(self):
+        return PlainGroupingBy(self._group_by, self._downstream.supply())
+
+
+def mod_10(x): return x % 10
+
+
+def mod_3(x): return x % 3
+
+
+def square(x): return x * x
+
+
+class GroupingTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(1, 1000, size=2000)
+
+    def _check(self, make):
+        for chunk_size in (1, 100, 5000):
+            with self.subTest(chunk_size=chunk_size):
+                out = Stream(self.data).collect(make(GroupingBy), chunk_size=chunk_size)
+                out_target = Stream(self.data).collect(make(PlainGroupingBy), chunk_size=chunk_size)
+
+                self.assertEqual(out, out_target)
+                # bucket order is also preserved.
+                self.assertListEqual(list(out), list(out_target))
+
+    def test_1(self):
+        for downstream in (ToList, ToSet, Counting, Summing, Averaging, MaxBy, MinBy):
+            with self.subTest(downstream=downstream.__name__):
+                self._check(lambda g: g(mod_10, downstream()))
+
+    def test_2(self):
+        self._check(lambda g: g(mod_10, MaxBy(comparing(mod_3))))
+        self._check(lambda g: g(mod_10, MinBy(comparing(mod_3))))
+        self._check(lambda g: g(mod_10, Reduce(bi_func=op.mul)))
+        self._check(lambda g: g(mod_10, Reduce(5, bi_func=op.add)))
+
+    def test_3(self):
+        self._check(lambda g: g(mod_10, Mapping(square, Summing())))
+        self._check(lambda g: g(mod_10, CollectAndThen(ToSet(), len)))
+        self._check(lambda g: g(mod_10, CollectAndThen(Mapping(square, ToList()), sorted)))
+
+    def test_4(self):
+        self._check(lambda g: g(mod_10, g(mod_3, Counting())))
+        self._check(lambda g: g(mod_10, g(mod_3, g(lambda x: x % 7, Mapping(square, Averaging())))))
+
+    def test_5(self):
+        self._check(lambda g: g(mod_10, agg={'n': Counting(), 's': Summing(), 'max': MaxBy()}))
+        self._check(lambda g: g(mod_10, g(mod_3, agg={'n': Counting(), 'l': ToList()})))
+
+    def test_6(self):
+        out = Stream(range(10)).collect(GroupingBy(lambda x: x % 2, agg={'n': Counting(), 's': Summing()}))
+        self.assertDictEqual(out, {0: {'n': 5, 's': 20}, 1: {'n': 5, 's': 25}})
+
+        out = Stream(range(5)).collect(Aggregating({'n': Counting(), 's': Summing()}))
+        self.assertDictEqual(out, {'n': 5, 's': 10})
+
+    def test_7(self):
+        class Doubling(Summing):
+            def consume(self, e):
+                super().consume(2 * e)
+
+            def consume_many(self, es):
+                for e in es:
+                    self.consume(e)
+
+            def supply(self):
+                return Doubling()
+
+        # subclasses of built-in collectors are not held in compact state.
+        out = Stream(range(10)).collect(GroupingBy(mod_3, Doubling()))
+        self.assertDictEqual(out, {0: 36, 1: 24, 2: 30})
+
+
+if __name__ == '__main__':
+    main()
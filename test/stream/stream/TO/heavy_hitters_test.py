@@ -0,0 +1,72 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from collections import Counter
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import HeavyHitters
+from streamAPI.testHelper import random
+
+
+def zipf_like(rnd, size):
+    # element i occurs with probability proportional to 1 / i.
+    return [int(1 / rnd.uniform(0.0001, 1)) for _ in range(size)]
+
+
+class HeavyHittersTest(TestCase):
+    def assertHeavyHitters(self, out, data, k, epsilon):
+        frequency = Counter(data)
+
+        for item, count, error in out:
+            self.assertLessEqual(count, frequency[item])
+            self.assertLessEqual(frequency[item], count + error)
+            self.assertLessEqual(error, epsilon * len(data))
+
+        reported = {item for item, _, _ in out}
+        counts = [c for _, c, _ in out]
+
+        self.assertListEqual(counts, sorted(counts, reverse=True))
+
+        # an element whose count surely exceeds smallest reported count must be reported.
+        for item, f in frequency.items():
+            if f - epsilon * len(data) > counts[-1]:
+                self.assertIn(item, reported)
+
+    def test_1(self):
+        data = zipf_like(random(), 50000)
+
+        for epsilon in (0.01, 0.001):
+            with self.subTest(epsilon=epsilon):
+                out = Stream(data).collect(HeavyHitters(10, epsilon))
+
+                self.assertEqual(len(out), 10)
+                self.assertHeavyHitters(out, data, 10, epsilon)
+
+                one_by_one = HeavyHitters(10, epsilon)
+
+                for e in data:
+                    one_by_one.consume(e)
+
+                self.assertHeavyHitters(one_by_one.finish(), data, 10, epsilon)
+
+    def test_2(self):
+        data = zipf_like(random(), 50000)
+
+        out = (ParallelStream(data)
+               .collect_concurrent(HeavyHitters(5, 0.01), dispatch_size=1000))
+
+        self.assertHeavyHitters(out, data, 5, 0.01)
+        self.assertListEqual([item for item, _, _ in out], [e for e, _ in Counter(data).most_common(5)])
+
+    def test_3(self):
+        data = ['a'] * 5 + ['b'] * 3 + ['c']
+
+        out = Stream(data).collect(HeavyHitters(2, epsilon=0.1))
+        self.assertListEqual([(e, c) for e, c, _ in out], [('a', 5), ('b', 3)])
+
+
+if __name__ == '__main__':
+    main()
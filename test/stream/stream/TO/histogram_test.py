@@ -0,0 +1,125 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from bisect import bisect_right
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import AutoHistogram, GroupingBy, Histogram
+from streamAPI.testHelper import random
+
+
+def naive_histogram(data, edges):
+    counts = [0] * (len(edges) - 1)
+    underflow = overflow = 0
+
+    for e in data:
+        if e < edges[0]:
+            underflow += 1
+        elif e > edges[-1]:
+            overflow += 1
+        elif e == edges[-1]:
+            counts[-1] += 1
+        else:
+            counts[bisect_right(edges, e) - 1] += 1
+
+    return tuple(counts), underflow, overflow
+
+
+class HistogramTest(TestCase):
+    def test_1(self):
+        rnd = random()
+        data = [rnd.uniform(-10, 110) for _ in range(5000)] + [0, 100, 50]
+
+        out = Stream(data).collect(Histogram(bins=10, range=(0, 100)))
+
+        self.assertEqual(len(out.edges), 11)
+        self.assertEqual((out.counts, out.underflow, out.overflow), naive_histogram(data, out.edges))
+
+    def test_2(self):
+        data = [1, 2, 2, 3, 7, 11, -1, 10]
+
+        out = Stream(data).collect(Histogram(bins=[0, 2, 4, 10]))
+
+        self.assertTupleEqual(out.counts, (1, 3, 2))
+        self.assertEqual(out.underflow, 1)
+        self.assertEqual(out.overflow, 1)
+
+    def test_3(self):
+        data = [0.5, 1, 5, 10, 50, 100, 999, 1000, 1001]
+
+        out = Stream(data).collect(Histogram(bins=3, range=(1, 1000), log=True))
+
+        self.assertTupleEqual(out.edges, (1, 10, 100, 1000))
+        self.assertTupleEqual(out.counts, (2, 2, 3))
+        self.assertEqual(out.underflow, 1)
+        self.assertEqual(out.overflow, 1)
+
+    def test_4(self):
+        rnd = random()
+        data = [rnd.uniform(0, 100) for _ in range(3000)]
+
+        out = (ParallelStream(data)
+               .collect_concurrent(Histogram(bins=7, range=(0, 100)), dispatch_size=100))
+
+        self.assertEqual(out, Stream(data).collect(Histogram(bins=7, range=(0, 100))))
+
+        with self.assertRaises(ValueError):
+            Histogram(bins=2, range=(0, 1)).combine(Histogram(bins=3, range=(0, 1)))
+
+        with self.assertRaises(ValueError):
+            Histogram(bins=[0, 2, 1])
+
+    def test_5(self):
+        data = random().int_range(1, 1000, size=3000)
+
+        out = Stream(data).collect(GroupingBy(lambda x: x % 3, Histogram(bins=4, range=(0, 1000))))
+
+        for k, hist in out.items():
+            expected = naive_histogram([e for e in data if e % 3 == k], hist.edges)
+            self.assertEqual((hist.counts, hist.underflow, hist.overflow), expected)
+
+
+class AutoHistogramTest(TestCase):
+    def assertValid(self, out, data, max_bins):
+        self.assertLessEqual(len(out.counts), max_bins)
+        self.assertLessEqual(out.edges[0], min(data))
+        self.assertGreater(out.edges[-1], max(data))
+        self.assertEqual((out.counts, 0, 0), naive_histogram(data, out.edges))
+
+    def test_1(self):
+        rnd = random()
+
+        for max_bins in (2, 4, 64):
+            for data in ([rnd.uniform(-1000, 1000) for _ in range(3000)],
+                         [rnd.expovariate(1) for _ in range(3000)],
+                         [5] * 10,
+                         [1e-3, 1e9, 5, -3]):
+                with self.subTest(max_bins=max_bins, size=len(data)):
+                    self.assertValid(Stream(data).collect(AutoHistogram(max_bins)), data, max_bins)
+
+                    one_by_one = AutoHistogram(max_bins)
+
+                    for e in data:
+                        one_by_one.consume(e)
+
+                    self.assertValid(one_by_one.finish(), data, max_bins)
+
+    def test_2(self):
+        rnd = random()
+        data = [rnd.gauss(0, 10) for _ in range(3000)] + [rnd.gauss(1000, 1) for _ in range(10)]
+
+        out = (ParallelStream(data)
+               .collect_concurrent(AutoHistogram(16), dispatch_size=100))
+
+        self.assertValid(out, data, 16)
+
+    def test_3(self):
+        out = Stream([]).collect(AutoHistogram())
+        self.assertTupleEqual(out.counts, ())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from bisect import bisect_right
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import GroupingBy, Quantiles
+from streamAPI.testHelper import random
+
+QS = (0, 0.01, 0.25, 0.5, 0.9, 0.99, 1)
+
+
+class QuantilesTest(TestCase):
+    def assertRanks(self, out, data, error):
+        data = sorted(data)
+
+        for q, v in out.items():
+            rank = bisect_right(data, v) / len(data)
+            self.assertLessEqual(abs(rank - q), error, msg=f'q: {q}')
+
+    def test_1(self):
+        rnd = random()
+
+        for size in (1, 100, 50000):
+            data = [rnd.gauss(0, 1) for _ in range(size)]
+
+            with self.subTest(size=size):
+                self.assertRanks(Stream(data).collect(Quantiles(QS, seed=1)), data, 0.02 + 1 / size)
+
+    def test_2(self):
+        data = list(range(10000))
+
+        out = Stream(data).collect(Quantiles([0, 1]))
+        self.assertDictEqual(out, {0: 0, 1: 9999})
+
+        c = Quantiles(QS, accuracy=0.01, seed=1)
+
+        for e in data:
+            c.consume(e)
+
+        self.assertRanks(c.finish(), data, 0.02)
+
+    def test_3(self):
+        rnd = random()
+        data = [rnd.expovariate(1) for _ in range(30000)]
+
+        out = (ParallelStream(data)
+               .collect_concurrent(Quantiles(QS, seed=1), dispatch_size=1000))
+
+        self.assertRanks(out, data, 0.02)
+
+    def test_4(self):
+        data = random().int_range(0, 10 ** 6, size=20000)
+
+        out = Stream(data).collect(GroupingBy(lambda x: x % 3, Quantiles([0.5, 0.9], seed=1)))
+
+        for k, qs in out.items():
+            self.assertRanks(qs, [e for e in data if e % 3 == k], 0.02)
+
+    def test_5(self):
+        self.assertDictEqual(Stream([]).collect(Quantiles([0.5])), {0.5: None})
+
+        with self.assertRaises(ValueError):
+            Quantiles([1.5])
+
+
+if __name__ == '__main__':
+    main()
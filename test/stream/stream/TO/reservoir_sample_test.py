@@ -0,0 +1,96 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from collections import Counter
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import ReservoirSample, WeightedReservoirSample
+from streamAPI.testHelper import random
+
+
+def increment(x): return x + 1
+
+
+class ReservoirSampleTest(TestCase):
+    def assertUniform(self, counts, size, expected, tolerance):
+        self.assertEqual(len(counts), size)
+
+        for c in counts.values():
+            self.assertLessEqual(abs(c - expected), tolerance)
+
+    def test_1(self):
+        counts = Counter()
+
+        for seed in range(2000):
+            out = Stream(range(20)).collect(ReservoirSample(5, seed=seed))
+
+            self.assertEqual(len(out), 5)
+            self.assertEqual(len(set(out)), 5)
+
+            counts.update(out)
+
+        self.assertUniform(counts, 20, 500, 100)
+
+    def test_2(self):
+        counts = Counter()
+
+        for seed in range(2000):
+            c = ReservoirSample(5, seed=seed)
+
+            for e in range(20):
+                c.consume(e)
+
+            counts.update(c.finish())
+
+        self.assertUniform(counts, 20, 500, 100)
+
+    def test_3(self):
+        counts = Counter()
+
+        for seed in range(2000):
+            a, b = ReservoirSample(5, seed=seed), ReservoirSample(5, seed=seed + 10 ** 6)
+            a.consume_many(range(7))
+            b.consume_many(range(7, 20))
+
+            a.combine(b).consume_many(range(20, 30))
+            counts.update(a.finish())
+
+        self.assertUniform(counts, 30, 2000 * 5 / 30, 80)
+
+    def test_4(self):
+        self.assertListEqual(sorted(Stream(range(3)).collect(ReservoirSample(5))), [0, 1, 2])
+        self.assertEqual(Stream(range(3)).collect(ReservoirSample(2, seed=random())),
+                         Stream(range(3)).collect(ReservoirSample(2, seed=random())))
+
+        out = ParallelStream(range(10000)).collect_concurrent(ReservoirSample(10), dispatch_size=100)
+        self.assertEqual(len(set(out)), 10)
+
+
+class WeightedReservoirSampleTest(TestCase):
+    def test_1(self):
+        weights = {'a': 1, 'b': 2, 'c': 7, 'd': 0}
+        counts = Counter()
+
+        for seed in range(3000):
+            counts.update(Stream(weights).collect(WeightedReservoirSample(1, weights.get, seed=seed)))
+
+        self.assertNotIn('d', counts)
+        self.assertLessEqual(abs(counts['a'] - 300), 60)
+        self.assertLessEqual(abs(counts['b'] - 600), 80)
+        self.assertLessEqual(abs(counts['c'] - 2100), 100)
+
+    def test_2(self):
+        out = (ParallelStream(range(1000))
+               .collect_concurrent(WeightedReservoirSample(20, increment), dispatch_size=100))
+
+        self.assertEqual(len(set(out)), 20)
+
+        with self.assertRaises(ValueError):
+            Stream([1, -1]).collect(WeightedReservoirSample(1, lambda x: x))
+
+
+if __name__ == '__main__':
+    main()
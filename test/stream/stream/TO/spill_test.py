@@ -0,0 +1,80 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import operator as op
+from collections import Counter, defaultdict
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import Counting, GroupingBy, Mapping, Summing, ToList, ToMap
+from streamAPI.testHelper import random
+from streamAPI.utility import identity
+
+
+def mod_100(x): return x % 100
+
+
+class SpillTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(0, 10000, size=5000)
+
+    def test_1(self):
+        out = Stream(self.data).collect(GroupingBy(identity, Counting(), max_buckets=50, partitions=8))
+
+        self.assertNotIsInstance(out, dict)
+        self.assertDictEqual(dict(out), Counter(self.data))
+
+    def test_2(self):
+        for max_buckets in (1, 10, 1000, 100000):
+            with self.subTest(max_buckets=max_buckets):
+                out = Stream(self.data).collect(GroupingBy(mod_100, max_buckets=max_buckets, partitions=4))
+
+                out_target = defaultdict(list)
+
+                for e in self.data:
+                    out_target[mod_100(e)].append(e)
+
+                # order of elements inside bucket is preserved.
+                self.assertDictEqual(dict(out), out_target)
+
+    def test_3(self):
+        # downstream need not be picklable, only elements are spilled.
+        collector = GroupingBy(mod_100, Mapping(lambda x: x * x, Summing()), max_buckets=5, partitions=3)
+        out = dict(Stream(self.data).collect(collector, chunk_size=7))
+
+        out_target = Stream(self.data).collect(GroupingBy(mod_100, Mapping(lambda x: x * x, Summing())))
+
+        self.assertDictEqual(out, out_target)
+
+    def test_4(self):
+        collector = GroupingBy(mod_100, GroupingBy(lambda x: x % 7, ToList()), max_buckets=20)
+        out = dict(Stream(self.data).collect(collector))
+
+        out_target = Stream(self.data).collect(GroupingBy(mod_100, GroupingBy(lambda x: x % 7, ToList())))
+
+        self.assertDictEqual(out, out_target)
+
+    def test_5(self):
+        out = Stream(self.data).collect(ToMap(mod_100, merger_on_conflict=op.add, max_buckets=10, partitions=4))
+        out_target = Stream(self.data).collect(ToMap(mod_100, merger_on_conflict=op.add))
+
+        self.assertDictEqual(dict(out), out_target)
+
+    def test_6(self):
+        out = Stream(range(1000)).collect(ToMap(identity, lambda x: x * x, max_buckets=10))
+        self.assertDictEqual(dict(out), {e: e * e for e in range(1000)})
+
+    def test_7(self):
+        data = list(range(100)) + [99]
+
+        out = Stream(data).collect(ToMap(identity, max_buckets=10, partitions=2))
+
+        # duplicate key in spilled partition is found while iterating.
+        with self.assertRaises(ValueError):
+            dict(out)
+
+
+if __name__ == '__main__':
+    main()
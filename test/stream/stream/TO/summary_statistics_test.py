@@ -0,0 +1,92 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import statistics
+from math import fsum
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import GroupingBy, SummaryStatistics
+from streamAPI.testHelper import random
+
+
+def mod_10(x): return x % 10
+
+
+class SummaryStatisticsTest(TestCase):
+    def assertStatistics(self, out, data, ddof=0):
+        variance = statistics.pvariance if ddof == 0 else statistics.variance
+
+        self.assertEqual(out.count, len(data))
+        self.assertAlmostEqual(out.sum, fsum(data))
+        self.assertAlmostEqual(out.mean, statistics.mean(data))
+        self.assertEqual(out.min, min(data))
+        self.assertEqual(out.max, max(data))
+        self.assertAlmostEqual(out.variance, variance(data))
+        self.assertAlmostEqual(out.stdev, variance(data) ** 0.5)
+
+    def test_1(self):
+        rnd = random()
+        data = [rnd.uniform(-100, 100) for _ in range(5000)]
+
+        for ddof in (0, 1):
+            with self.subTest(ddof=ddof):
+                self.assertStatistics(Stream(data).collect(SummaryStatistics(ddof)), data, ddof)
+
+                one_by_one = SummaryStatistics(ddof)
+
+                for e in data:
+                    one_by_one.consume(e)
+
+                self.assertStatistics(one_by_one.finish(), data, ddof)
+
+    def test_2(self):
+        data = random().int_range(1, 100, size=1000)
+
+        out = Stream(data).collect(SummaryStatistics())
+
+        self.assertEqual(out.sum, sum(data))
+        self.assertIsInstance(out.sum, int)
+
+        # large offset does not lose precision of variance.
+        shifted = [e + 10 ** 9 + 0.5 for e in data]
+        out = Stream(shifted).collect(SummaryStatistics(), chunk_size=1024)
+
+        self.assertAlmostEqual(out.variance, statistics.pvariance(data))
+
+        # consuming one by one (Welford updates).
+        out = Stream(shifted).collect(SummaryStatistics())
+
+        self.assertAlmostEqual(out.variance, statistics.pvariance(data), delta=1e-4)
+
+    def test_3(self):
+        rnd = random()
+        data = [rnd.uniform(0, 1) for _ in range(3000)]
+
+        out = (ParallelStream(data)
+               .collect_concurrent(SummaryStatistics(), dispatch_size=128))
+
+        self.assertStatistics(out, data)
+
+    def test_4(self):
+        data = random().int_range(1, 1000, size=3000)
+
+        out = Stream(data).collect(GroupingBy(mod_10, SummaryStatistics()))
+
+        for k, stats in out.items():
+            self.assertStatistics(stats, [e for e in data if mod_10(e) == k])
+
+    def test_5(self):
+        out = Stream([]).collect(SummaryStatistics())
+
+        self.assertEqual(out.count, 0)
+        self.assertIsNone(out.mean)
+        self.assertIsNone(out.variance)
+
+        self.assertIsNone(Stream([3]).collect(SummaryStatistics(ddof=1)).variance)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from array import array
+from unittest import TestCase, main, skipIf
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import GroupingBy, ToArray, ToNumpy
+from streamAPI.testHelper import random
+from streamAPI.utility import optional_import
+
+np = optional_import('numpy')
+
+
+class ToArrayTest(TestCase):
+    def test_1(self):
+        data = random().int_range(-1000, 1000, size=5000)
+
+        out = Stream(data).collect(ToArray('q'))
+
+        self.assertIsInstance(out, array)
+        self.assertListEqual(out.tolist(), data)
+
+        c = ToArray('q')
+
+        for e in data:
+            c.consume(e)
+
+        self.assertEqual(c.finish(), out)
+
+    def test_2(self):
+        rnd = random()
+        data = [rnd.uniform(0, 1) for _ in range(5000)]
+
+        out = (ParallelStream(data)
+               .collect_concurrent(ToArray(), dispatch_size=100))
+
+        self.assertListEqual(out.tolist(), data)
+
+    def test_3(self):
+        out = Stream(range(10)).collect(GroupingBy(lambda x: x % 2, ToArray('i')))
+        self.assertDictEqual(out, {0: array('i', [0, 2, 4, 6, 8]), 1: array('i', [1, 3, 5, 7, 9])})
+
+        with self.assertRaises(TypeError):
+            Stream(['a']).collect(ToArray('d'))
+
+
+@skipIf(np is None, 'numpy is not installed.')
+class ToNumpyTest(TestCase):
+    def test_1(self):
+        rnd = random()
+        data = [rnd.uniform(0, 1) for _ in range(5000)]
+
+        out = Stream(data).collect(ToNumpy())
+
+        self.assertEqual(out.dtype, np.float64)
+        self.assertListEqual(out.tolist(), data)
+
+    def test_2(self):
+        c = ToNumpy('int32')
+        c.consume_many(np.arange(5, dtype=np.int32))
+        c.consume_many(range(5, 8))
+        c.consume(8)
+
+        self.assertListEqual(c.finish().tolist(), list(range(9)))
+        self.assertEqual(len(Stream([]).collect(ToNumpy())), 0)
+
+        with self.assertRaises(ValueError):
+            ToNumpy('complex128')
+
+    def test_3(self):
+        c = ToNumpy('int64')
+        c.consume_many(range(3))
+
+        out = c.finish()
+
+        # buffer of "out" is detached from collector.
+        other = c.supply()
+        other.consume_many([20, 30])
+
+        c.consume(10)
+        c.combine(other)
+
+        self.assertListEqual(out.tolist(), [0, 1, 2])
+        self.assertListEqual(c.finish().tolist(), [10, 20, 30])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from operator import itemgetter
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import ToCompositeIndex, ToIndex, ToSortedIndex
+from streamAPI.testHelper import random
+from streamAPI.utility.index import CompositeIndex, HashIndex, SortedIndex
+
+
+def mod_10(x): return x % 10
+
+
+def mod_3(x): return x % 3
+
+
+class ToIndexTest(TestCase):
+    def test_1(self):
+        data = random().int_range(0, 1000, size=3000)
+
+        index = Stream(data).collect(ToIndex(mod_10))
+
+        self.assertIsInstance(index, HashIndex)
+
+        for k in range(10):
+            self.assertTupleEqual(index[k], tuple(e for e in data if mod_10(e) == k))
+
+    def test_2(self):
+        data = random().int_range(0, 1000, size=3000)
+
+        index = (ParallelStream(data)
+                 .collect_concurrent(ToSortedIndex(mod_10, str), dispatch_size=100))
+
+        self.assertIsInstance(index, SortedIndex)
+        self.assertTupleEqual(index.range(3, 5), tuple(str(e) for e in sorted(data, key=mod_10)
+                                                        if 3 <= mod_10(e) < 5))
+
+    def test_3(self):
+        data = [{'country': 'IN', 'city': 'Pune', 'n': 1}, {'country': 'US', 'city': 'NY', 'n': 2},
+                {'country': 'IN', 'city': 'Delhi', 'n': 3}]
+
+        index = Stream(data).collect(ToCompositeIndex([itemgetter('country'), itemgetter('city')],
+                                                      itemgetter('n')))
+
+        self.assertIsInstance(index, CompositeIndex)
+        self.assertTupleEqual(index.prefix('IN'), (3, 1))
+        self.assertTupleEqual(index.get(('US', 'NY')), (2,))
+
+    def test_4(self):
+        data = list(range(100))
+
+        index = (ParallelStream(data)
+                 .collect_concurrent(ToCompositeIndex([mod_3, mod_10]), dispatch_size=10))
+
+        self.assertTupleEqual(index.prefix(1, 4), tuple(e for e in data if mod_3(e) == 1 and mod_10(e) == 4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import BottomK, GroupingBy, TopK
+from streamAPI.testHelper import random
+
+
+def mod_10(x): return x % 10
+
+
+def mod_7(x): return x % 7
+
+
+class TopKTest(TestCase):
+    def test_1(self):
+        data = random().int_range(1, 1000, size=5000)
+
+        for k in (0, 1, 10, 6000):
+            with self.subTest(k=k):
+                self.assertListEqual(Stream(data).collect(TopK(k)), sorted(data, reverse=True)[:k])
+                self.assertListEqual(Stream(data).collect(BottomK(k)), sorted(data)[:k])
+
+    def test_2(self):
+        # ties are broken by order of elements in stream.
+        data = list(enumerate(random().int_range(1, 10, size=1000)))
+
+        def key(e): return e[1]
+
+        out = Stream(data).collect(TopK(50, key=key))
+        self.assertListEqual(out, sorted(data, key=key, reverse=True)[:50])
+
+        out = Stream(data).collect(BottomK(50, key=key))
+        self.assertListEqual(out, sorted(data, key=key)[:50])
+
+        out = Stream(data).collect(TopK(50, key=key, ties='last'))
+        self.assertListEqual(out, sorted(reversed(data), key=key, reverse=True)[:50])
+
+        out = Stream(data).collect(BottomK(50, key=key, ties='last'))
+        self.assertListEqual(out, sorted(reversed(data), key=key)[:50])
+
+    def test_3(self):
+        data = random().int_range(1, 1000, size=5000)
+
+        out = Stream(data).collect(GroupingBy(mod_10, TopK(3, key=mod_7)))
+
+        out_target = {}
+
+        for e in data:
+            out_target.setdefault(mod_10(e), []).append(e)
+
+        out_target = {k: sorted(v, key=mod_7, reverse=True)[:3] for k, v in out_target.items()}
+
+        self.assertDictEqual(out, out_target)
+
+    def test_4(self):
+        # elements themselves are not compared.
+        data = [{'v': 1}, {'v': 3}, {'v': 3}, {'v': 2}]
+
+        out = Stream(data).collect(TopK(2, key=lambda e: e['v']))
+        self.assertListEqual(out, [{'v': 3}, {'v': 3}])
+
+        with self.assertRaises(ValueError):
+            TopK(2, ties='any')
+
+
+if __name__ == '__main__':
+    main()
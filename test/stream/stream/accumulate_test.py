@@ -7,8 +7,12 @@ import operator as op
 from itertools import accumulate
 from unittest import TestCase, main
 
-from streamAPI.stream import Stream
+from streamAPI.stream import ParallelStream, Stream
 from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+
+
+def concat(a, b): return a + b
 
 
 class AccumulateTest(TestCase):
@@ -52,6 +56,100 @@ class AccumulateTest(TestCase):
 
         self.assertEqual(out, sum(sum(j ** 2 for j in range(i)) for i in range(1, size + 1)))
 
+    def test_accumulate_block1(self):
+        rnd = random()
+
+        data = rnd.float_range(-100, 100, size=1000)
+
+        for func in (op.add, op.mul, max, min):
+            for block in (1, 7, 1000, 5000):
+                out = Stream(data).accumulate(func, block=block).collect(ToList())
+
+                # results are exactly same as that of a left fold.
+                self.assertListEqual(out, list(accumulate(data, func)))
+
+    def test_accumulate_block2(self):
+        rnd = random()
+
+        data = rnd.int_range(-10 ** 6, 10 ** 6, size=1000)
+
+        for func in (op.add, op.mul, max, min):
+            out = Stream(data).accumulate(func, block=64).collect(ToList())
+
+            self.assertListEqual(out, list(accumulate(data, func)))
+            self.assertTrue(all(type(e) is int for e in out))
+
+    def test_accumulate_block3(self):
+        # sum crosses 64 bits
+        data = [2 ** 62, 2 ** 62, 2 ** 62, -1, 5]
+
+        for block in (1, 2, 3, 10):
+            out = Stream(data).accumulate(op.add, block=block).collect(ToList())
+            self.assertListEqual(out, list(accumulate(data, op.add)))
+
+        data = [2 ** 70, 1, 2]
+
+        out = Stream(data).accumulate(op.add, block=2).collect(ToList())
+        self.assertListEqual(out, list(accumulate(data, op.add)))
+
+    def test_accumulate_block4(self):
+        data = ['a', 'b', 'c', 'd', 'e']
+
+        out = Stream(data).accumulate(op.add, block=2).collect(ToList())
+        self.assertListEqual(out, list(accumulate(data, op.add)))
+
+        out = Stream(data).accumulate(concat, block=3).collect(ToList())
+        self.assertListEqual(out, list(accumulate(data, op.add)))
+
+        self.assertListEqual(Stream([]).accumulate(op.add, block=3).collect(ToList()), [])
+
+    def test_accumulate_block5(self):
+        nan = float('nan')
+
+        # Python's max and min do not propagate NaN.
+        for func in (max, min):
+            for data in ([1.0, nan, 2.0, 3.0], [nan, 1.0, 2.0], [1.0, 2.0, nan, 0.5, 4.0]):
+                for block in (2, 3, 4):
+                    out = Stream(data).accumulate(func, block=block).collect(ToList())
+                    self.assertEqual(repr(out), repr(list(accumulate(data, func))))
+
+    def test_accumulate_block6(self):
+        # mixed int and float chunks are not cast to floats.
+        data = [2 ** 60 + 1, 0.5, 1, 2 ** 60 + 3, 0.25]
+
+        for func in (max, min, op.add):
+            for block in (2, 3, 5):
+                out = Stream(data).accumulate(func, block=block).collect(ToList())
+                expected = list(accumulate(data, func))
+
+                self.assertListEqual(out, expected)
+                self.assertListEqual([type(e) for e in out], [type(e) for e in expected])
+
+    def test_accumulate_concurrent1(self):
+        rnd = random()
+
+        data = rnd.int_range(-1000, 1000, size=5000)
+
+        for multiprocessing in (False, True):
+            for func in (op.add, max):
+                out = (ParallelStream(data, worker=3, multiprocessing=multiprocessing)
+                       .accumulate_concurrent(func, dispatch_size=97)
+                       .collect(ToList()))
+
+                self.assertListEqual(out, list(accumulate(data, func)))
+
+    def test_accumulate_concurrent2(self):
+        data = ['a', 'b', 'c', 'd', 'e']
+
+        out = (ParallelStream(data, worker=2)
+               .accumulate_concurrent(concat, dispatch_size=2)
+               .collect(ToList()))
+
+        self.assertListEqual(out, list(accumulate(data, op.add)))
+
+        out = ParallelStream([], worker=2).accumulate_concurrent(concat).collect(ToList())
+        self.assertListEqual(out, [])
+
 
 if __name__ == '__main__':
     main()
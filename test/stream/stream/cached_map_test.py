@@ -0,0 +1,114 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import os
+from operator import itemgetter
+from tempfile import TemporaryDirectory
+from threading import Lock
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+from streamAPI.utility.cache import DiskCache, DiskCacheSpec
+
+
+def enrich(row): return row[0], row[1] * 2
+
+
+class Counted:
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+        self._lock = Lock()
+
+    def __call__(self, e):
+        with self._lock:
+            self.calls += 1
+
+        return self.func(e)
+
+
+class CachedMapTest(TestCase):
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.store = os.path.join(self.dir.name, 'enrich.db')
+
+        rnd = random()
+
+        self.rows = [(i, v) for i, v in enumerate(rnd.int_range(0, 1000, size=1000))]
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_1(self):
+        func = Counted(enrich)
+
+        out = Stream(self.rows).cached_map(func, store=self.store, version='v1').collect(ToList())
+
+        self.assertListEqual(out, [enrich(row) for row in self.rows])
+        self.assertEqual(func.calls, len(self.rows))
+
+        # rerun with 5% changed rows computes only changed rows.
+        changed = [(i, v + 1) if i % 20 == 0 else (i, v) for i, v in self.rows]
+
+        stream = Stream(changed).cached_map(func, store=self.store, version='v1')
+        out = stream.collect(ToList())
+
+        self.assertListEqual(out, [enrich(row) for row in changed])
+        self.assertEqual(func.calls, len(self.rows) + len(self.rows) // 20)
+
+        stats, = stream.cache_stats()
+
+        self.assertEqual(stats.hits, len(self.rows) - len(self.rows) // 20)
+
+        # new version of function does not use old results.
+        func = Counted(enrich)
+
+        Stream(self.rows[:10]).cached_map(func, store=self.store, version='v2').done()
+
+        self.assertEqual(func.calls, 10)
+
+    def test_2(self):
+        func = Counted(enrich)
+
+        Stream(self.rows).cached_map(func, store=self.store, key=itemgetter(0)).done()
+
+        # rows are looked up by their id.
+        out = (Stream((i, None) for i in range(10))
+               .cached_map(func, store=self.store, key=itemgetter(0))
+               .collect(ToList()))
+
+        self.assertListEqual(out, [enrich(row) for row in self.rows[:10]])
+        self.assertEqual(func.calls, len(self.rows))
+
+    def test_3(self):
+        Stream(self.rows).cached_map(enrich, store=self.store, max_bytes=5000).done()
+
+        cache = DiskCache(self.store)
+
+        self.assertLessEqual(cache.nbytes, 5000)
+        self.assertGreater(len(cache), 0)
+        cache.close()
+
+    def test_4(self):
+        spec = DiskCacheSpec(self.store, version='v1')
+
+        Stream(self.rows[:500]).cached_map(enrich, store=self.store, version='v1').done()
+
+        func = Counted(enrich)
+
+        stream = (ParallelStream(self.rows, worker=4, multiprocessing=False)
+                  .map_concurrent(func, cache=spec))
+
+        out = stream.collect(ToList())
+
+        self.assertListEqual(sorted(out), [enrich(row) for row in self.rows])
+        self.assertEqual(func.calls, 500)
+        self.assertEqual(stream.cache_stats()[0].hits, 500)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import ToBitmapSet, ToList
+from streamAPI.testHelper import random
+from streamAPI.utility.intset import Bitmap
+
+
+class DistinctTest(TestCase):
+    def test_1(self):
+        data = random().int_range(-10 ** 5, 10 ** 5, size=10 ** 4)
+
+        out = Stream(data).distinct(int_keys=True).collect(ToList())
+        self.assertListEqual(out, Stream(data).distinct().collect(ToList()))
+
+    def test_2(self):
+        data = random().int_range(0, 10 ** 5, size=10 ** 4)
+
+        out = Stream(data).collect(ToBitmapSet())
+
+        self.assertIsInstance(out, Bitmap)
+        self.assertListEqual(list(out), sorted(set(data)))
+
+
+if __name__ == '__main__':
+    main()
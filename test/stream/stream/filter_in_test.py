@@ -0,0 +1,72 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from operator import itemgetter
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+
+
+class FilterInTest(TestCase):
+    def test_1(self):
+        rnd = random()
+        es = [rnd.randrange(1000) for _ in range(2000)]
+        other = [rnd.randrange(1000) for _ in range(300)]
+
+        out = Stream(es).filter_in(other).collect(ToList())
+        self.assertListEqual(out, [e for e in es if e in set(other)])
+
+        out = Stream(es).filter_not_in(other).collect(ToList())
+        self.assertListEqual(out, [e for e in es if e not in set(other)])
+
+    def test_2(self):
+        users = [{'id': 'u1'}, {'id': 'u3'}]
+        events = [('u1', 'a'), ('u2', 'b'), ('u3', 'c'), ('u1', 'd')]
+
+        out = (Stream(events)
+               .filter_in(users, key=itemgetter(0), other_key=itemgetter('id'))
+               .collect(ToList()))
+
+        self.assertListEqual(out, [('u1', 'a'), ('u3', 'c'), ('u1', 'd')])
+
+    def test_3(self):
+        # keys of mixed types and integers out of 64 bit range.
+        other = [1, 'a', 2 ** 70]
+        es = [1, 2, 'a', 'b', 2 ** 70, 1.0]
+
+        out = Stream(es).filter_in(other).collect(ToList())
+        self.assertListEqual(out, [1, 'a', 2 ** 70, 1.0])
+
+    def test_4(self):
+        rnd = random()
+        other = [rnd.randrange(10 ** 6) for _ in range(1000)]
+        es = list(range(10 ** 4))
+
+        out = Stream(es).filter_in(other, exact=False, fp_rate=0.01).collect(ToList())
+        expected = [e for e in es if e in set(other)]
+
+        self.assertTrue(set(expected) <= set(out))
+        self.assertLess(len(out) - len(expected), 300)
+
+        out = Stream(es).filter_not_in(other, exact=False).collect(ToList())
+        self.assertTrue(set(out) <= set(es) - set(other))
+
+    def test_5(self):
+        consumed = []
+
+        def other():
+            consumed.append(True)
+            yield from range(3)
+
+        stream = Stream(range(10)).filter_in(other())
+        self.assertListEqual(consumed, [])
+
+        self.assertListEqual(stream.collect(ToList()), [0, 1, 2])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from collections import Counter
+from operator import itemgetter
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream, hash_join
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+
+
+def naive_join(left, right, left_key, right_key, how):
+    out = []
+    matched_right = set()
+
+    for l in left:
+        matches = [(idx, r) for idx, r in enumerate(right) if left_key(l) == right_key(r)]
+
+        for idx, r in matches:
+            matched_right.add(idx)
+            out.append((l, r))
+
+        if not matches and how in ('left', 'outer'):
+            out.append((l, None))
+
+    if how == 'outer':
+        out.extend((None, r) for idx, r in enumerate(right) if idx not in matched_right)
+
+    return out
+
+
+class JoinTest(TestCase):
+    def setUp(self):
+        rnd = random()
+
+        self.left = [(rnd.randrange(0, 50), i) for i in range(300)]
+        self.right = [(rnd.randrange(20, 80), -i) for i in range(100)]
+
+    def _check(self, left, right, **kwargs):
+        for how in ('inner', 'left', 'outer'):
+            with self.subTest(how=how, **kwargs):
+                out = Stream(left).join(right, itemgetter(0), how=how, **kwargs).collect(ToList())
+                out_target = naive_join(left, right, itemgetter(0), itemgetter(0), how)
+
+                self.assertEqual(Counter(out), Counter(out_target))
+
+    def test_1(self):
+        # right side is smaller
+        self._check(self.left, self.right)
+
+    def test_2(self):
+        # left side is smaller
+        self._check(self.right, self.left)
+
+    def test_3(self):
+        # build side does not fit in memory
+        self._check(self.left, self.right, max_build=10, partitions=4)
+        self._check(self.right, self.left, max_build=10, partitions=4)
+        self._check(self.left, self.left, max_build=1, partitions=2)
+
+    def test_4(self):
+        self._check([], self.right)
+        self._check(self.left, [])
+        self._check([], [])
+
+    def test_5(self):
+        users = [(1, 'A'), (2, 'B')]
+        orders = [('pen', 1), ('ink', 1), ('cup', 3)]
+
+        out = list(hash_join(users, iter(orders), itemgetter(0), itemgetter(1), how='outer'))
+
+        self.assertEqual(Counter(out), Counter([((1, 'A'), ('pen', 1)),
+                                                ((1, 'A'), ('ink', 1)),
+                                                ((2, 'B'), None),
+                                                (None, ('cup', 3))]))
+
+    def test_6(self):
+        with self.assertRaises(ValueError):
+            list(hash_join([], [], itemgetter(0), how='cross'))
+
+    def test_7(self):
+        # a single key having more rows than "max_build".
+        left = [(1, i) for i in range(50)]
+        right = [(1, -i) for i in range(40)]
+
+        self._check(left, right, max_build=5, partitions=2)
+
+
+if __name__ == '__main__':
+    main()
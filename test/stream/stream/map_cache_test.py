@@ -0,0 +1,128 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from threading import Lock
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import ToList
+from streamAPI.stream.streamHelper import ChainedCondition
+from streamAPI.testHelper import random
+from streamAPI.utility.cache import CacheSpec, CacheStats
+
+
+def square(x): return x * x
+
+
+class Counted:
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+        self._lock = Lock()
+
+    def __call__(self, e):
+        with self._lock:
+            self.calls += 1
+
+        return self.func(e)
+
+
+class MapCacheTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(0, 50, size=2000)
+
+    def test_1(self):
+        func = Counted(square)
+
+        stream = Stream(self.data).map(func, cache=CacheSpec(maxsize=100))
+
+        self.assertListEqual(stream.collect(ToList()), [square(e) for e in self.data])
+        self.assertEqual(func.calls, len(set(self.data)))
+        self.assertEqual(stream.cache_stats(),
+                         (CacheStats(hits=len(self.data) - func.calls, misses=func.calls,
+                                     evictions=0, size=func.calls),))
+
+    def test_2(self):
+        func = Counted(square)
+
+        stream = Stream(self.data).map(func, cache=CacheSpec(maxsize=10))
+        out = stream.collect(ToList())
+
+        self.assertListEqual(out, [square(e) for e in self.data])
+
+        stats, = stream.cache_stats()
+
+        self.assertEqual(stats.misses, func.calls)
+        self.assertEqual(stats.evictions, func.calls - 10)
+        self.assertEqual(stats.size, 10)
+
+    def test_3(self):
+        # each stage has its own cache.
+        stream = (Stream(self.data)
+                  .map(square, cache=CacheSpec())
+                  .map(str)
+                  .map(str)
+                  .map(len, cache=CacheSpec(maxsize=20)))
+
+        stream.collect(ToList())
+
+        first, second = stream.cache_stats()
+
+        self.assertEqual(first.size, len(set(self.data)))
+        self.assertEqual(first.evictions, 0)
+        self.assertEqual(second.size, 20)
+        self.assertEqual(second.hits + second.misses, len(self.data))
+
+    def test_4(self):
+        then, else_ = Counted(square), Counted(str)
+
+        condition = (ChainedCondition()
+                     .if_then(lambda x: x < 25, then, cache=CacheSpec())
+                     .otherwise(else_, cache=CacheSpec()))
+
+        stream = Stream(self.data).conditional(condition)
+
+        self.assertListEqual(stream.collect(ToList()),
+                             [square(e) if e < 25 else str(e) for e in self.data])
+
+        self.assertEqual(then.calls, len({e for e in self.data if e < 25}))
+        self.assertEqual(else_.calls, len({e for e in self.data if e >= 25}))
+
+        then_stats, else_stats = stream.cache_stats()
+
+        self.assertEqual(then_stats.misses, then.calls)
+        self.assertEqual(else_stats.misses, else_.calls)
+        self.assertEqual(then_stats.hits + else_stats.hits, len(self.data) - then.calls - else_.calls)
+
+    def test_5(self):
+        func = Counted(square)
+
+        stream = (ParallelStream(self.data, worker=4, multiprocessing=False)
+                  .map_concurrent(func, cache=CacheSpec()))
+
+        out = stream.collect(ToList())
+
+        self.assertListEqual(sorted(out), sorted(square(e) for e in self.data))
+
+        # cache hits and elements waiting for a running job are not sent to executor.
+        self.assertEqual(func.calls, len(set(self.data)))
+
+        stats, = stream.cache_stats()
+
+        self.assertEqual(stats.misses, func.calls)
+        self.assertEqual(stats.hits, len(self.data) - func.calls)
+
+    def test_6(self):
+        stream = (ParallelStream(self.data, worker=2)
+                  .map_concurrent(square, cache=CacheSpec(maxsize=20)))
+
+        out = stream.collect(ToList())
+
+        self.assertListEqual(sorted(out), sorted(square(e) for e in self.data))
+        self.assertEqual(stream.cache_stats()[0].size, 20)
+
+
+if __name__ == '__main__':
+    main()
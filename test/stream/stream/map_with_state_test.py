@@ -0,0 +1,130 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import os
+from collections import defaultdict
+from operator import itemgetter
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+from streamAPI.utility.state import StateStore
+
+
+def running_total(total, e):
+    total = (total or 0) + e[1]
+    return total, (e[0], total)
+
+
+def first_seen(seen, e):
+    return True, None if seen else e
+
+
+class MapWithStateTest(TestCase):
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'state.db')
+
+        rnd = random()
+
+        self.data = list(zip(rnd.int_range(0, 50, size=2000), rnd.int_range(0, 100, size=2000)))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def expected_totals(self, data, totals=None):
+        totals = totals if totals is not None else defaultdict(int)
+        out = []
+
+        for k, v in data:
+            totals[k] += v
+            out.append((k, totals[k]))
+
+        return out
+
+    def test_1(self):
+        out = Stream(self.data).map_with_state(itemgetter(0), running_total).collect(ToList())
+
+        self.assertListEqual(out, self.expected_totals(self.data))
+
+    def test_2(self):
+        # spilled states are used again, so totals are same as with unbounded state.
+        out = (Stream(self.data)
+               .map_with_state(itemgetter(0), running_total, max_keys=5, path=self.path)
+               .collect(ToList()))
+
+        self.assertListEqual(out, self.expected_totals(self.data))
+
+    def test_3(self):
+        first, second = self.data[:1000], self.data[1000:]
+
+        Stream(first).map_with_state(itemgetter(0), running_total, path=self.path).done()
+
+        # next run continues with persisted totals.
+        out = (Stream(second)
+               .map_with_state(itemgetter(0), running_total, max_keys=10, path=self.path)
+               .collect(ToList()))
+
+        totals = defaultdict(int)
+        self.expected_totals(first, totals)
+
+        self.assertListEqual(out, self.expected_totals(second, totals))
+
+    def test_4(self):
+        out = (Stream(self.data)
+               .map_with_state(itemgetter(0), first_seen)
+               .filter(lambda e: e is not None)
+               .map(itemgetter(0))
+               .collect(ToList()))
+
+        self.assertListEqual(out, list(dict.fromkeys(k for k, _ in self.data)))
+
+    def test_5(self):
+        store = StateStore(max_keys=20)
+
+        out = Stream(self.data).map_with_state(itemgetter(0), running_total, store=store).collect(ToList())
+
+        self.assertEqual(len(out), len(self.data))
+        self.assertEqual(len(store), 20)
+        self.assertGreater(store.evictions, 0)
+
+        with self.assertRaises(AssertionError):
+            Stream(self.data).map_with_state(itemgetter(0), running_total, ttl=1, store=store)
+
+    def test_5_1(self):
+        # upstream of "prefetch" is evaluated in another thread.
+        out = (Stream(self.data)
+               .map_with_state(itemgetter(0), running_total, max_keys=5, path=self.path)
+               .prefetch(4)
+               .collect(ToList()))
+
+        self.assertListEqual(out, self.expected_totals(self.data))
+
+        out = (Stream(self.data)
+               .map_with_state(itemgetter(0), running_total, max_keys=5, path=self.path)
+               .stage(itemgetter(1), workers=2)
+               .collect(ToList()))
+
+        # second run continues with totals persisted by first run.
+        totals = defaultdict(int)
+        self.expected_totals(self.data, totals)
+
+        self.assertListEqual(out, [total for _, total in self.expected_totals(self.data, totals)])
+
+    def test_6(self):
+        def reset_on_zero(total, e):
+            total = (total or 0) + e
+
+            return (None if total == 0 else total), total
+
+        out = Stream([1, -1, 2, 3]).map_with_state(lambda e: 'k', reset_on_zero).collect(ToList())
+
+        self.assertListEqual(out, [1, 0, 2, 5])
+
+
+if __name__ == '__main__':
+    main()
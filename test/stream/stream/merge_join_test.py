@@ -0,0 +1,80 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from collections import Counter
+from operator import itemgetter
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream, hash_join, merge_join
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+
+
+class MergeJoinTest(TestCase):
+    def setUp(self):
+        rnd = random()
+
+        self.left = sorted((rnd.randrange(0, 50), i) for i in range(300))
+        self.right = sorted((rnd.randrange(20, 80), -i) for i in range(100))
+
+    def test_1(self):
+        for how in ('inner', 'left', 'outer'):
+            with self.subTest(how=how):
+                out = (Stream(self.left)
+                       .merge_join(self.right, itemgetter(0), how=how, validate=True)
+                       .collect(ToList()))
+
+                out_target = hash_join(self.left, self.right, itemgetter(0), how=how)
+
+                self.assertEqual(Counter(out), Counter(out_target))
+
+                # pairs are produced in order of keys.
+                keys = [(l or r)[0] for l, r in out]
+                self.assertListEqual(keys, sorted(keys))
+
+    def test_2(self):
+        left, right = self.left[::-1], self.right[::-1]
+
+        for how in ('inner', 'left', 'outer'):
+            with self.subTest(how=how):
+                out = list(merge_join(left, right, itemgetter(0), how=how, reverse=True, validate=True))
+                out_target = hash_join(left, right, itemgetter(0), how=how)
+
+                self.assertEqual(Counter(out), Counter(out_target))
+
+    def test_3(self):
+        users = [(1, 'A'), (2, 'B'), (4, 'D')]
+        orders = [('pen', 1), ('ink', 1), ('cup', 3), ('mug', 4)]
+
+        out = list(merge_join(iter(users), iter(orders), itemgetter(0), itemgetter(1), how='outer'))
+
+        self.assertListEqual(out, [((1, 'A'), ('pen', 1)),
+                                   ((1, 'A'), ('ink', 1)),
+                                   ((2, 'B'), None),
+                                   (None, ('cup', 3)),
+                                   ((4, 'D'), ('mug', 4))])
+
+    def test_4(self):
+        with self.assertRaises(ValueError):
+            list(merge_join([1, 3, 2], [1, 2, 3], int, validate=True))
+
+        with self.assertRaises(ValueError):
+            list(merge_join([1, 2, 3], [1, 2, 2, 1], int, how='outer', validate=True))
+
+    def test_5(self):
+        self.assertListEqual(list(merge_join([], [1, 2], int, how='outer')), [(None, 1), (None, 2)])
+        self.assertListEqual(list(merge_join([1, 2], [], int, how='left')), [(1, None), (2, None)])
+        self.assertListEqual(list(merge_join([1, 2], [], int)), [])
+
+    def test_6(self):
+        # infinite streams can be joined as nothing is materialized.
+        from itertools import count
+
+        out = Stream(count(0, 2)).merge_join(count(0, 3), int).limit(4).collect(ToList())
+        self.assertListEqual(out, [(0, 0), (6, 6), (12, 12), (18, 18)])
+
+
+if __name__ == '__main__':
+    main()
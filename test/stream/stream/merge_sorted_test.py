@@ -0,0 +1,80 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from operator import itemgetter
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+
+
+class MergeSortedTest(TestCase):
+    def setUp(self):
+        rnd = random()
+        self.shards = [sorted(rnd.int_range(0, 1000, size=rnd.randrange(0, 50))) for _ in range(30)]
+
+    def test_1(self):
+        out = Stream.merge_sorted(*self.shards).collect(ToList())
+        self.assertListEqual(out, sorted(e for shard in self.shards for e in shard))
+
+    def test_2(self):
+        shards = [shard[::-1] for shard in self.shards]
+
+        for fan_in in (None, 2, 7, 100):
+            with self.subTest(fan_in=fan_in):
+                out = Stream.merge_sorted(*shards, reverse=True, fan_in=fan_in).collect(ToList())
+                self.assertListEqual(out, sorted((e for shard in shards for e in shard), reverse=True))
+
+    def test_3(self):
+        # merge is stable, elements of earlier iterable come first.
+        a = [(1, 'a'), (2, 'a')]
+        b = [(1, 'b'), (2, 'b')]
+
+        out = Stream.merge_sorted(a, Stream(b), key=itemgetter(0), fan_in=2).collect(ToList())
+        self.assertListEqual(out, [(1, 'a'), (1, 'b'), (2, 'a'), (2, 'b')])
+
+    def test_4(self):
+        def reader(file):
+            with open(file) as f:
+                yield from map(int, f)
+
+        with TemporaryDirectory() as dir_name:
+            files = []
+
+            for idx, shard in enumerate(self.shards):
+                file = join(dir_name, f'{idx}.txt')
+
+                with open(file, 'w') as f:
+                    f.writelines(f'{e}\n' for e in shard)
+
+                files.append(file)
+
+            out = Stream.merge_sorted_files(files, reader, fan_in=4).collect(ToList())
+
+        self.assertListEqual(out, sorted(e for shard in self.shards for e in shard))
+
+    def test_5(self):
+        rnd = random()
+        data = [(rnd.randrange(0, 20), i) for i in range(1000)]
+
+        for max_in_memory in (1, 7, 100, 999, 1000, 5000):
+            for reverse in (False, True):
+                with self.subTest(max_in_memory=max_in_memory, reverse=reverse):
+                    out = (Stream(data)
+                           .sort(key=itemgetter(0), reverse=reverse, max_in_memory=max_in_memory)
+                           .collect(ToList()))
+
+                    self.assertListEqual(out, sorted(data, key=itemgetter(0), reverse=reverse))
+
+    def test_6(self):
+        self.assertListEqual(Stream.merge_sorted().collect(ToList()), [])
+        self.assertListEqual(Stream([]).sort(max_in_memory=3).collect(ToList()), [])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import operator as op
+from collections import Counter
+from unittest import TestCase, main
+
+from streamAPI.stream import ParallelStream, Stream
+from streamAPI.stream.TO import Aggregating, Collector, Counting, GroupingBy, Mapping, Reduce, Summing, ToList, ToMap
+from streamAPI.stream.optional import EMPTY, Optional
+from streamAPI.testHelper import random
+from streamAPI.utility import identity
+
+
+def mod_10(x): return x % 10
+
+
+class ParallelCollectTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(0, 1000, size=5000)
+
+    def test_1(self):
+        out = (ParallelStream(self.data, worker=4, multiprocessing=False)
+               .collect_concurrent(ToList(), dispatch_size=37))
+
+        # order of elements is preserved.
+        self.assertListEqual(out, self.data)
+
+    def test_2(self):
+        collector = GroupingBy(mod_10, GroupingBy(identity, Counting()))
+
+        out = (ParallelStream(self.data, worker=3, multiprocessing=False)
+               .collect_concurrent(collector, dispatch_size=100))
+
+        self.assertDictEqual(out, Stream(self.data).collect(collector.supply()))
+
+    def test_3(self):
+        out = (ParallelStream(self.data, worker=2)
+               .collect_concurrent(GroupingBy(mod_10, Counting()), dispatch_size=500))
+
+        self.assertDictEqual(out, Counter(map(mod_10, self.data)))
+
+    def test_4(self):
+        out = ParallelStream((), multiprocessing=False).collect_concurrent(Summing())
+        self.assertEqual(out, 0)
+
+    def test_5(self):
+        stream = ParallelStream(range(1, 11), worker=2, multiprocessing=False)
+        self.assertEqual(stream.reduce_concurrent(bi_func=op.mul, dispatch_size=3), Optional(3628800))
+
+        stream = ParallelStream(range(10), worker=2, multiprocessing=False)
+        self.assertEqual(stream.reduce_concurrent(100, bi_func=op.add, dispatch_size=3), Optional(145))
+
+        stream = ParallelStream((), multiprocessing=False)
+        self.assertIs(stream.reduce_concurrent(bi_func=op.add), EMPTY)
+
+        stream = ParallelStream((), multiprocessing=False)
+        self.assertEqual(stream.reduce_concurrent(7, bi_func=op.add), Optional(7))
+
+    def test_6(self):
+        stream = ParallelStream(range(10), multiprocessing=False)
+        stream.collect_concurrent(ToList())
+
+        self.assertTrue(stream.closed)
+
+    def test_7(self):
+        class Custom(Collector):
+            def supply(self): return Custom()
+
+            def consume(self, e): pass
+
+            def finish(self): return None
+
+        for collector in (GroupingBy(mod_10, max_buckets=3),
+                          Mapping(identity, ToMap(mod_10, max_buckets=3)),
+                          GroupingBy(mod_10, Custom())):
+            with self.assertRaises(ValueError):
+                ParallelStream(self.data, multiprocessing=False).collect_concurrent(collector)
+
+        self.assertTrue(GroupingBy(mod_10, Aggregating({'n': Counting()})).combinable())
+
+    def test_8(self):
+        # initial point is applied once, not once per partial result.
+        for collector in (Reduce(100, bi_func=op.add), GroupingBy(mod_10, Reduce(100, bi_func=op.add)),
+                          GroupingBy(mod_10, Mapping(identity, Reduce(100, bi_func=op.add)))):
+            out = (ParallelStream(self.data, worker=3, multiprocessing=False)
+                   .collect_concurrent(collector, dispatch_size=37))
+
+            self.assertEqual(out, Stream(self.data).collect(collector.supply()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from threading import Event, current_thread, main_thread
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+
+
+class PrefetchTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(0, 1000, size=1000)
+
+    def test_1(self):
+        for n, batch in ((1, None), (16, None), (1, 7), (4, 1000), (3, 2000)):
+            out = Stream(self.data).map(lambda x: x + 1).prefetch(n, batch=batch).collect(ToList())
+
+            self.assertListEqual(out, [e + 1 for e in self.data])
+
+    def test_2(self):
+        threads = set()
+
+        def record(e):
+            threads.add(current_thread())
+            return e
+
+        out = Stream(self.data).map(record).prefetch(8).collect(ToList())
+
+        self.assertListEqual(out, self.data)
+
+        # upstream is evaluated in background thread.
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads.pop(), main_thread())
+
+    def test_3(self):
+        def fail(e):
+            if e == 500:
+                raise ValueError(e)
+
+            return e
+
+        with self.assertRaises(ValueError):
+            Stream(range(1000)).map(fail).prefetch(4, batch=10).collect(ToList())
+
+        out = []
+
+        with self.assertRaises(ValueError):
+            Stream(range(1000)).map(fail).prefetch(4).for_each(out.append)
+
+        # elements before failure are processed.
+        self.assertListEqual(out, list(range(500)))
+
+    def test_4(self):
+        closed = Event()
+
+        def source():
+            try:
+                i = 0
+
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                closed.set()
+
+        self.assertListEqual(Stream(source()).prefetch(4).limit(3).collect(ToList()), [0, 1, 2])
+        self.assertTrue(closed.wait(5))
+
+        closed.clear()
+
+        self.assertEqual(Stream(source()).prefetch(4, batch=10).find_first().get(), 0)
+        self.assertTrue(closed.wait(5))
+
+    def test_5(self):
+        self.assertListEqual(Stream([]).prefetch(4).collect(ToList()), [])
+
+
+if __name__ == '__main__':
+    main()
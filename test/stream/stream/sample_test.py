@@ -0,0 +1,51 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+
+
+class SampleTest(TestCase):
+    def test_1(self):
+        size = 10 ** 5
+
+        for fraction in (0.001, 0.01, 0.5, 0.9):
+            with self.subTest(fraction=fraction):
+                out = Stream(range(size)).sample(fraction, seed=1).collect(ToList())
+
+                expected = fraction * size
+                self.assertLessEqual(abs(len(out) - expected), 5 * (expected * (1 - fraction)) ** 0.5 + 1)
+                self.assertListEqual(out, sorted(set(out)))
+
+    def test_2(self):
+        self.assertListEqual(Stream(range(10)).sample(1).collect(ToList()), list(range(10)))
+        self.assertListEqual(Stream(range(10)).sample(0).collect(ToList()), [])
+
+        with self.assertRaises(ValueError):
+            Stream(range(10)).sample(1.5)
+
+    def test_3(self):
+        # same seed gives same sample; a random number generator can be given as seed.
+        out1 = Stream(range(1000)).sample(0.1, seed=random()).collect(ToList())
+        out2 = Stream(range(1000)).sample(0.1, seed=random()).collect(ToList())
+
+        self.assertListEqual(out1, out2)
+
+        # every position is equally likely.
+        counts = [0] * 10
+
+        for seed in range(2000):
+            for e in Stream(range(10)).sample(0.3, seed=seed):
+                counts[e] += 1
+
+        for c in counts:
+            self.assertLessEqual(abs(c - 600), 100)
+
+
+if __name__ == '__main__':
+    main()
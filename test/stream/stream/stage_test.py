@@ -0,0 +1,121 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from threading import Event, Lock, current_thread, main_thread
+from time import sleep
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import ToList
+from streamAPI.testHelper import random
+
+
+def double(x): return 2 * x
+
+
+def increment(x): return x + 1
+
+
+class StageTest(TestCase):
+    def setUp(self):
+        self.data = random().int_range(0, 1000, size=1000)
+
+    def test_1(self):
+        for workers, batch, queue_size in ((1, 1, None), (4, 1, 2), (3, 17, None), (8, 1000, 1)):
+            out = (Stream(self.data)
+                   .stage(double, workers=workers, batch=batch, queue_size=queue_size)
+                   .stage(increment, double, workers=2)
+                   .collect(ToList()))
+
+            self.assertListEqual(out, [2 * (2 * e + 1) for e in self.data])
+
+    def test_2(self):
+        rnd = random()
+
+        def jitter(x):
+            sleep(rnd.random() / 1000)
+            return x
+
+        out = Stream(self.data).stage(jitter, workers=8, ordered=False).collect(ToList())
+
+        self.assertListEqual(sorted(out), sorted(self.data))
+
+    def test_3(self):
+        out = (Stream(self.data)
+               .stage(double, increment, workers=2, multiprocessing=True, batch=50)
+               .collect(ToList()))
+
+        self.assertListEqual(out, [2 * e + 1 for e in self.data])
+
+    def test_4(self):
+        threads, lock = set(), Lock()
+
+        def record(x):
+            with lock:
+                threads.add(current_thread())
+
+            return x
+
+        Stream(self.data).stage(record, workers=3).stage(record, workers=2).done()
+
+        self.assertNotIn(main_thread(), threads)
+        self.assertLessEqual(len(threads), 5)
+
+    def test_5(self):
+        def fail(x):
+            if x == 500:
+                raise ValueError(x)
+
+            return x
+
+        for ordered in (True, False):
+            with self.assertRaises(ValueError):
+                Stream(range(1000)).stage(fail, workers=4, ordered=ordered).collect(ToList())
+
+            with self.assertRaises(ValueError):
+                Stream(range(1000)).map(fail).stage(double, ordered=ordered).collect(ToList())
+
+    def test_6(self):
+        closed = Event()
+
+        def source():
+            try:
+                i = 0
+
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                closed.set()
+
+        for ordered in (True, False):
+            closed.clear()
+
+            out = Stream(source()).stage(double, workers=2, ordered=ordered).limit(5).collect(ToList())
+
+            self.assertEqual(len(out), 5)
+            self.assertTrue(closed.wait(5))
+
+        calls = []
+
+        def slow(x):
+            calls.append(x)
+            sleep(0.05)
+            return x
+
+        out = Stream(range(100)).stage(slow, ordered=False, queue_size=8).limit(1).collect(ToList())
+        sleep(0.6)
+
+        # jobs submitted but not yet started are cancelled.
+        self.assertEqual(len(out), 1)
+        self.assertLess(len(calls), 4)
+
+    def test_7(self):
+        self.assertListEqual(Stream([]).stage(double).collect(ToList()), [])
+        self.assertListEqual(Stream([]).stage(double, ordered=False).collect(ToList()), [])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from threading import Thread
+from unittest import TestCase, main
+
+from streamAPI.stream import Stream
+from streamAPI.stream.TO import Counting, ToList
+from streamAPI.testHelper import random
+
+
+class TeeTest(TestCase):
+    def test_1(self):
+        a, b = Stream(range(10)).tee()
+
+        self.assertListEqual(a.filter(lambda x: x % 2 == 0).collect(ToList()), [0, 2, 4, 6, 8])
+        self.assertListEqual(b.map(lambda x: x ** 2).collect(ToList()), [x ** 2 for x in range(10)])
+
+    def test_2(self):
+        calls = []
+
+        a, b, c = Stream(range(5)).peek(calls.append).tee(3)
+
+        self.assertListEqual(list(a), list(range(5)))
+        self.assertListEqual(list(b), list(range(5)))
+        self.assertListEqual(list(c), list(range(5)))
+
+        # upstream is evaluated only once.
+        self.assertListEqual(calls, list(range(5)))
+
+    def test_3(self):
+        stream = Stream(range(5))
+        stream.tee()
+
+        self.assertTrue(stream.closed)
+
+    def test_4(self):
+        rnd = random()
+        data = rnd.int_range(0, 100, size=1000)
+
+        a, b = Stream(data).tee(buffer=10, spill=True)
+
+        # "a" is consumed completely before "b", so elements are spilled to disk.
+        self.assertListEqual(a.collect(ToList()), data)
+        self.assertListEqual(b.collect(ToList()), data)
+
+    def test_5(self):
+        data = range(100)
+
+        a, b = Stream(data).tee(buffer=7, spill=True)
+
+        a, b = iter(a), iter(b)
+        out_a, out_b = [], []
+
+        # interleaving consumption, so that spilling starts and stops repeatedly.
+        for i in range(len(data)):
+            out_a.append(next(a))
+
+            if i % 13 == 0:
+                out_b.extend(next(b) for _ in range(len(out_a) - len(out_b)))
+
+        out_b.extend(b)
+
+        self.assertListEqual(out_a, list(data))
+        self.assertListEqual(out_b, list(data))
+
+    def test_6(self):
+        size = 10000
+        a, b = Stream(range(size)).tee(buffer=5)
+
+        out = []
+        t = Thread(target=a.for_each, args=(out.append,))
+        t.start()
+
+        self.assertEqual(b.collect(Counting()), size)
+        t.join()
+
+        self.assertListEqual(out, list(range(size)))
+
+    def test_7(self):
+        a, b = Stream(range(10)).tee(buffer=3, timeout=0.01)
+
+        # "b" is never consumed, so "a" can not run ahead more than buffer.
+        with self.assertRaises(TimeoutError):
+            a.collect(ToList())
+
+    def test_8(self):
+        a, b = Stream(range(10)).tee(buffer=3)
+
+        self.assertEqual(a.find_first().get(), 0)
+        del a  # released branch no longer holds back the buffer.
+
+        self.assertListEqual(b.collect(ToList()), list(range(10)))
+
+    def test_8_1(self):
+        a, b = Stream(range(10)).tee(buffer=3, timeout=5)
+        del b  # dropped before it is read.
+
+        # otherwise "a" would wait for "b" and raise TimeoutError.
+        self.assertListEqual(a.collect(ToList()), list(range(10)))
+
+    def test_9(self):
+        def gen():
+            yield 1
+            raise ValueError()
+
+        a, b = Stream(gen()).tee()
+
+        with self.assertRaises(ValueError):
+            a.collect(ToList())
+
+        with self.assertRaises(ValueError):
+            b.collect(ToList())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from unittest import TestCase, main
+
+from streamAPI.testHelper import random
+from streamAPI.utility.intset import Bitmap
+
+
+class BitmapTest(TestCase):
+    def test_1(self):
+        rnd = random()
+
+        for size in (10, 5000, 50000):
+            es = [rnd.randrange(-300000, 300000) for _ in range(size)]
+            b, expected = Bitmap(es), set(es)
+
+            with self.subTest(size=size):
+                self.assertListEqual(list(b), sorted(expected))
+                self.assertEqual(len(b), len(expected))
+
+                for e in range(-1000, 1000):
+                    self.assertEqual(e in b, e in expected)
+
+    def test_2(self):
+        rnd = random()
+
+        for size_a, size_b in ((10, 10), (10, 50000), (5000, 5000), (50000, 50000)):
+            a = [rnd.randrange(200000) for _ in range(size_a)]
+            b = [rnd.randrange(200000) for _ in range(size_b)]
+
+            with self.subTest(sizes=(size_a, size_b)):
+                self.assertListEqual(list(Bitmap(a) | Bitmap(b)), sorted(set(a) | set(b)))
+                self.assertListEqual(list(Bitmap(a) & Bitmap(b)), sorted(set(a) & set(b)))
+
+    def test_3(self):
+        a, b = Bitmap(range(10)), Bitmap(range(5, 15))
+
+        c = a | b
+        c.add(100)
+
+        self.assertNotIn(100, a)
+        self.assertNotIn(100, b)
+
+        a |= b
+        a.add(200)
+
+        self.assertNotIn(200, b)
+        self.assertEqual(a, Bitmap(list(range(15)) + [200]))
+
+    def test_4(self):
+        b = Bitmap(range(10 ** 6))
+
+        self.assertEqual(len(b), 10 ** 6)
+        self.assertLessEqual(b.nbytes(), 10 ** 6 // 8 + 8192)
+
+        self.assertNotIn('a', b)
+        self.assertNotIn(1.5, b)
+        self.assertIn(2 ** 100, Bitmap([2 ** 100]))
+
+
+if __name__ == '__main__':
+    main()
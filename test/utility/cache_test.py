@@ -0,0 +1,169 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import os
+import pickle
+import sqlite3
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from streamAPI.utility.cache import CacheSpec, CacheStats, DiskCache, LRUCache, fingerprint
+from streamAPI.utility.utils import NIL
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTest(TestCase):
+    def test_1(self):
+        cache = LRUCache(maxsize=2)
+
+        cache.put('a', 1)
+        cache.put('b', 2)
+
+        self.assertEqual(cache.get('a'), 1)
+
+        cache.put('c', 3)  # 'b' is least recently used.
+
+        self.assertIs(cache.get('b'), NIL)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats(), CacheStats(hits=2, misses=1, evictions=1, size=2))
+
+    def test_2(self):
+        clock = Clock()
+        cache = LRUCache(ttl=10, timer=clock)
+
+        cache.put('a', 1)
+        clock.now = 5
+        cache.put('b', 2)
+
+        self.assertEqual(cache.get('a'), 1)
+
+        clock.now = 12
+
+        self.assertNotIn('a', cache)
+        self.assertIs(cache.get('a'), NIL)
+        self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(cache.stats(), CacheStats(hits=2, misses=1, evictions=1, size=1))
+
+    def test_3(self):
+        cache = LRUCache()
+
+        for i in range(1000):
+            cache.put(i, i)
+
+        self.assertEqual(len(cache), 1000)
+        self.assertEqual(cache.stats().evictions, 0)
+        self.assertEqual(cache.stats().hit_rate, 0.0)
+
+
+class CacheSpecTest(TestCase):
+    def test_1(self):
+        memo = CacheSpec(maxsize=10, key=abs).memoize(str)
+
+        out = [memo(e) for e in (1, -1, 2, 1)]
+
+        # key of -1 is same as that of 1
+        self.assertListEqual(out, ['1', '1', '2', '1'])
+        self.assertEqual(memo.stats(), CacheStats(hits=2, misses=2, evictions=0, size=2))
+        self.assertEqual(memo.stats().hit_rate, 0.5)
+
+    def test_2(self):
+        memo = CacheSpec(maxsize=10).memoize(abs)
+        memo(-1)
+
+        copied = pickle.loads(pickle.dumps(memo))
+
+        self.assertEqual(copied(-1), 1)
+        self.assertEqual(copied.stats(), CacheStats(hits=1, misses=1, evictions=0, size=1))
+        self.assertEqual(memo.stats(), CacheStats(hits=0, misses=1, evictions=0, size=1))
+
+
+class DiskCacheTest(TestCase):
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'cache.db')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_1(self):
+        cache = DiskCache(self.path, version='v1', batch=3)
+
+        for i in range(10):
+            cache.put(i, {'value': i})
+
+        self.assertEqual(cache.get(4), {'value': 4})
+        self.assertIs(cache.get(10), NIL)
+        self.assertIn(9, cache)  # still buffered
+        cache.close()
+
+        # results survive reopening; other versions do not see them.
+        cache = DiskCache(self.path, version='v1')
+
+        self.assertEqual(len(cache), 10)
+        self.assertEqual(cache.get(9), {'value': 9})
+        self.assertEqual(cache.stats(), CacheStats(hits=1, misses=0, evictions=0, size=10))
+        cache.close()
+
+        cache = DiskCache(self.path, version='v2')
+
+        self.assertIs(cache.get(9), NIL)
+
+        cache.compact()
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.nbytes, 0)
+        cache.close()
+
+    def test_2(self):
+        cache = DiskCache(self.path, max_bytes=1000, batch=1)
+
+        for i in range(100):
+            cache.put(i, 'x' * 90)
+
+        self.assertLessEqual(cache.nbytes, 1000)
+        self.assertEqual(len(cache) + cache.stats().evictions, 100)
+
+        # least recently used entries are evicted.
+        self.assertIs(cache.get(0), NIL)
+        self.assertEqual(cache.get(99), 'x' * 90)
+        cache.close()
+
+    def test_2_1(self):
+        cache = DiskCache(self.path, batch=4)
+
+        for i in range(10):
+            cache.put(i, i)
+
+        cache.flush()
+
+        # access times of hits are written once "batch" of them are buffered.
+        for _ in range(3):
+            for i in range(10):
+                self.assertEqual(cache.get(i), i)
+                self.assertLess(len(cache._used), 4)
+
+        cache.close()
+
+        # opening a directory fails; object is left partly initialised.
+        with self.assertRaises(sqlite3.OperationalError):
+            DiskCache(self.dir.name)
+
+        DiskCache.__new__(DiskCache).__del__()  # does not raise
+
+    def test_3(self):
+        self.assertEqual(fingerprint(('a', 1)), fingerprint(('a', 1)))
+        self.assertNotEqual(fingerprint(('a', 1)), fingerprint(('a', 2)))
+        self.assertEqual(len(fingerprint('a')), 16)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from array import array
+from unittest import TestCase, main
+
+from streamAPI.testHelper import random
+from streamAPI.utility.index import CompositeIndex, HashIndex, SortedIndex
+
+
+class HashIndexTest(TestCase):
+    def test_1(self):
+        index = HashIndex([(1, 'a'), (2, 'b'), (1, 'c')])
+
+        self.assertTupleEqual(index[1], ('a', 'c'))
+        self.assertTupleEqual(index.get(3), ())
+        self.assertEqual(index.count(1), 2)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.rows, 3)
+        self.assertNotIn(3, index)
+
+        with self.assertRaises(KeyError):
+            index[3]
+
+
+class SortedIndexTest(TestCase):
+    def test_1(self):
+        rnd = random()
+        pairs = [(rnd.randrange(100), i) for i in range(1000)]
+
+        index = SortedIndex(pairs)
+
+        self.assertIsInstance(index.keys(), array)
+
+        for lo, hi in ((10, 20), (0, 100), (50, 50), (-5, 3)):
+            for inclusive in ((True, False), (True, True), (False, True), (False, False)):
+                expected = tuple(v for k, v in sorted(pairs, key=lambda p: p[0])
+                                 if (lo <= k if inclusive[0] else lo < k) and (k <= hi if inclusive[1] else k < hi))
+
+                self.assertTupleEqual(index.range(lo, hi, inclusive), expected)
+
+        self.assertTupleEqual(index.get(7), tuple(v for k, v in pairs if k == 7))
+        self.assertEqual(len(index.range()), 1000)
+        self.assertTupleEqual(index.get('a'), ())
+
+    def test_2(self):
+        index = SortedIndex([('b', {}), ('a', {}), ('b', [])])
+
+        self.assertTupleEqual(index.get('b'), ({}, []))
+        self.assertTupleEqual(index.range(hi='b'), ({},))
+
+
+class CompositeIndexTest(TestCase):
+    def test_1(self):
+        index = CompositeIndex([(('IN', 'Pune'), 2), (('IN', 'Delhi'), 1), (('US', 'NY'), 3),
+                                (('IN', 'Pune'), 4)])
+
+        self.assertTupleEqual(index.get(('IN', 'Pune')), (2, 4))
+        self.assertTupleEqual(index.prefix('IN'), (1, 2, 4))
+        self.assertTupleEqual(index.prefix('US', 'NY'), (3,))
+        self.assertTupleEqual(index.prefix('UK'), ())
+        self.assertTupleEqual(index.prefix(), (1, 2, 4, 3))
+        self.assertTupleEqual(index.range(('IN', 'Pune'), ('US',)), (2, 4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from array import array
+from unittest import TestCase, main
+
+from streamAPI.testHelper import random
+from streamAPI.utility.intset import SortedIntSet
+from streamAPI.utility.sketch import BloomFilter, HyperLogLog, ScalableBloomFilter, hash64
+
+
+class BloomFilterTest(TestCase):
+    def test_1(self):
+        bf = BloomFilter(capacity=1000, fp_rate=0.01)
+        bf.update(range(1000))
+
+        self.assertTrue(all(e in bf for e in range(1000)))
+
+        false_positives = sum(e in bf for e in range(1000, 11000))
+        self.assertLess(false_positives, 300)
+
+    def test_2(self):
+        bf = BloomFilter(capacity=100)
+        bf.update(['a', 'b', ('c', 1)])
+
+        self.assertIn('a', bf)
+        self.assertIn(('c', 1), bf)
+
+    def test_3(self):
+        a, b = BloomFilter(100), BloomFilter(100)
+        a.update(range(50))
+        b.update(range(50, 100))
+
+        a.union(b)
+
+        self.assertTrue(all(e in a for e in range(100)))
+
+        with self.assertRaises(ValueError):
+            a.union(BloomFilter(1000))
+
+    def test_4(self):
+        bf = ScalableBloomFilter(fp_rate=0.01, initial_capacity=16)
+        bf.update(range(10000))
+
+        self.assertEqual(len(bf), 10000)
+        self.assertTrue(all(e in bf for e in range(10000)))
+
+        false_positives = sum(e in bf for e in range(10000, 20000))
+        self.assertLess(false_positives, 300)
+
+    def test_5(self):
+        self.assertEqual(hash64('abc'), hash64('abc'))
+        self.assertNotEqual(hash64('abc'), hash64('abc', seed=1))
+        self.assertNotEqual(hash64(1), hash64(2))
+        self.assertLess(hash64(-1), 1 << 64)
+
+
+class HyperLogLogTest(TestCase):
+    def test_1(self):
+        a, b, c = HyperLogLog(), HyperLogLog(), HyperLogLog()
+
+        a.update(range(30000))
+        b.update(range(20000, 60000))
+        c.update(range(60000))
+
+        self.assertEqual(a.merge(b).estimate(), c.estimate())
+        self.assertLessEqual(abs(len(c) - 60000), 0.08 * 60000)
+
+    def test_2(self):
+        hll = HyperLogLog()
+
+        self.assertEqual(len(hll), 0)
+
+        hll.update([1, 1, 1])
+        self.assertEqual(len(hll), 1)
+        self.assertEqual(hll.nbytes(), 4096)
+
+
+class SortedIntSetTest(TestCase):
+    def test_1(self):
+        rnd = random()
+        es = [rnd.randrange(-10 ** 6, 10 ** 6) for _ in range(1000)]
+
+        s = SortedIntSet(es)
+
+        self.assertListEqual(list(s), sorted(set(es)))
+        self.assertEqual(len(s), len(set(es)))
+
+        for e in range(-1000, 1000):
+            self.assertEqual(e in s, e in set(es))
+
+    def test_2(self):
+        s = SortedIntSet([3, 1])
+
+        self.assertNotIn('a', s)
+        self.assertNotIn(None, s)
+        self.assertNotIn(2, SortedIntSet())
+
+    def test_3(self):
+        # sorting without numpy: runs are sorted and merged.
+        rnd = random()
+        es = [rnd.randrange(-50, 50) for _ in range(1000)]
+
+        for run in (1, 7, 1000, 5000):
+            out = SortedIntSet._unique(SortedIntSet._merge_sorted_runs(array('q', es), run))
+            self.assertListEqual(list(out), sorted(set(es)))
+
+        with self.assertRaises(TypeError):
+            SortedIntSet([1, 2.5])
+
+        with self.assertRaises(OverflowError):
+            SortedIntSet([2 ** 63])
+
+
+if __name__ == '__main__':
+    main()
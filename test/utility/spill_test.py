@@ -0,0 +1,50 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+from unittest import TestCase, main
+
+from streamAPI.utility.spill import SpillFile
+
+
+class SpillFileTest(TestCase):
+    def test_1(self):
+        spill = SpillFile()
+        spill.extend(range(5))
+        spill.append('a')
+
+        self.assertEqual(len(spill), 6)
+        self.assertListEqual(list(spill), [0, 1, 2, 3, 4, 'a'])
+
+    def test_2(self):
+        spill = SpillFile()
+        spill.extend(['a', ('b',), {'c': 1}])
+
+        offset, out = 0, []
+
+        while offset < spill.end:
+            e, offset = spill.read_at(offset)
+            out.append(e)
+
+        self.assertListEqual(out, ['a', ('b',), {'c': 1}])
+
+        with self.assertRaises(EOFError):
+            spill.read_at(offset)
+
+    def test_3(self):
+        spill = SpillFile()
+        spill.extend(range(5))
+        spill.clear()
+
+        self.assertEqual(len(spill), 0)
+        self.assertListEqual(list(spill), [])
+
+        spill.append(1)
+        self.assertListEqual(list(spill), [1])
+
+        spill.close()
+
+
+if __name__ == '__main__':
+    main()
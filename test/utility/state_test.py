@@ -0,0 +1,130 @@
+"""
+author: Shiv
+email: shivkj001@gmail.com
+"""
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from streamAPI.utility.state import StateStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StateStoreTest(TestCase):
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'state.db')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_1(self):
+        clock = Clock()
+        store = StateStore(ttl=10, timer=clock)
+
+        store.put('a', 1)
+        clock.now = 5
+        store.put('b', 2)
+        clock.now = 12
+
+        # 'a' was last accessed at 0
+        self.assertIsNone(store.get('a'))
+        self.assertEqual(store.get('b'), 2)
+
+        clock.now = 21
+
+        # 'b' was accessed at 12
+        self.assertIn('b', store)
+        store.put('c', 3)
+        clock.now = 40
+        store.put('d', 4)
+
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.expirations, 3)
+
+    def test_2(self):
+        store = StateStore(max_keys=100)
+
+        for i in range(1000):
+            store.put(i, i)
+
+        self.assertEqual(len(store), 100)
+        self.assertEqual(store.evictions, 900)
+        self.assertIsNone(store.get(0))
+        self.assertEqual(store.get(999), 999)
+
+    def test_3(self):
+        store = StateStore(max_keys=10, path=self.path)
+
+        for i in range(100):
+            store.put(i, [i])
+
+        self.assertEqual(len(store), 10)
+        self.assertEqual(store.spilled(), 90)
+
+        # spilled state is loaded back.
+        self.assertListEqual(store.get(5), [5])
+        self.assertEqual(len(store), 10)
+
+        store.delete(7)
+        self.assertNotIn(7, store)
+        store.close()
+
+        # states survive reopening.
+        store = StateStore(max_keys=10, path=self.path)
+
+        self.assertListEqual(store.get(5), [5])
+        self.assertListEqual(store.get(99), [99])
+        self.assertIsNone(store.get(7))
+        self.assertEqual(store.spilled(), 97)
+        store.close()
+
+    def test_3_1(self):
+        store = StateStore(max_keys=1, path=self.path)
+
+        store.put('a', 1)
+        store.put('b', 2)  # 'a' is spilled
+        store.delete('a')
+        store.delete('c')  # never spilled
+
+        self.assertIsNone(store.get('a'))
+        self.assertEqual(store.spilled(), 0)
+        store.close()
+
+        # file already has states, so deleting any key removes it from file.
+        store = StateStore(max_keys=1, path=self.path)
+        store.delete('b')
+
+        self.assertIsNone(store.get('b'))
+        store.close()
+
+    def test_4(self):
+        clock = Clock()
+        store = StateStore(ttl=10, max_keys=2, path=self.path, timer=clock)
+
+        for i in range(5):
+            store.put(i, i)
+
+        clock.now = 20
+        store.put('x', 0)
+        store.close()
+
+        store = StateStore(ttl=10, path=self.path, timer=clock)
+
+        # expired states are not persisted.
+        self.assertEqual(store.spilled(), 1)
+        self.assertIsNone(store.get(0))
+        self.assertEqual(store.get('x'), 0)
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
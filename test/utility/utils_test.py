@@ -31,6 +31,12 @@ class UtilityTest(unittest.TestCase):
                               (date(2017, 1, 1), date(2017, 1, 3), date(2017, 1, 5),
                                date(2017, 1, 7), date(2017, 1, 9)))
 
+    def test_optional_import(self):
+        import json
+
+        self.assertIs(utility.optional_import('json'), json)
+        self.assertIsNone(utility.optional_import('a_module_which_does_not_exist'))
+
 
 if __name__ == '__main__':
     unittest.main()